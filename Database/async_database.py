@@ -0,0 +1,123 @@
+"""
+Asynchronous Database Access Module
+
+Runs ProfileDatabase operations on a dedicated thread pool so async MCP handlers never block the event loop
+"""
+
+import asyncio
+import atexit
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .database import ProfileDatabase, close_database, get_database
+
+T = TypeVar('T')
+
+
+class AsyncProfileDatabase:
+    """Asynchronous mirror of ProfileDatabase"""
+
+    def __init__(self, database: Optional[ProfileDatabase] = None, max_workers: Optional[int] = None):
+        """
+        Initialize asynchronous database access
+
+        Args:
+            database: Wrapped database, the global instance is used if None
+            max_workers: Executor thread count, read from config.json if None
+        """
+        if max_workers is None:
+            try:
+                from config_manager import get_config_manager
+                max_workers = get_config_manager().get_database_pool_config()['executor_workers']
+            except ImportError:
+                max_workers = 5
+
+        self._database = database
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="userbank-db")
+
+    @property
+    def db(self) -> ProfileDatabase:
+        """Wrapped synchronous database"""
+        if self._database is None:
+            self._database = get_database()
+        return self._database
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a blocking callable on the database executor
+
+        The caller's context variables are propagated to the worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def insert_record(self, table_name: str, **kwargs) -> int:
+        """Insert record into specified table"""
+        return await self.run(self.db.insert_record, table_name, **kwargs)
+
+    async def update_record(self, table_name: str, record_id: int, **kwargs) -> bool:
+        """Update specified record"""
+        return await self.run(self.db.update_record, table_name, record_id, **kwargs)
+
+    async def delete_record(self, table_name: str, record_id: int) -> bool:
+        """Delete specified record"""
+        return await self.run(self.db.delete_record, table_name, record_id)
+
+    async def get_record(self, table_name: str, record_id: int) -> Optional[Dict[str, Any]]:
+        """Get specified record"""
+        return await self.run(self.db.get_record, table_name, record_id)
+
+    async def query_records(self, table_name: str, filter_conditions: Dict[str, Any] = None,
+                            sort_by: str = 'created_time', sort_order: str = 'desc',
+                            limit: int = 20, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Query records (supports complex filtering conditions)"""
+        return await self.run(self.db.query_records, table_name, filter_conditions,
+                              sort_by, sort_order, limit, offset)
+
+    async def query_page(self, table_name: str, filter_conditions: Dict[str, Any] = None,
+                         sort_by: str = 'created_time', sort_order: str = 'desc',
+                         limit: int = 20, offset: int = 0, cursor: str = None,
+                         count_mode: str = 'exact', max_chars: int = None,
+                         record_size: Callable[[Dict[str, Any]], int] = None,
+                         fields: List[str] = None) -> Dict[str, Any]:
+        """Query one page of records (supports keyset cursors, size budgets and field projection)"""
+        return await self.run(self.db.query_page, table_name, filter_conditions,
+                              sort_by, sort_order, limit, offset, cursor, count_mode,
+                              max_chars=max_chars, record_size=record_size, fields=fields)
+
+    async def get_persona(self) -> Optional[Dict[str, Any]]:
+        """Get user profile (ID fixed as 1)"""
+        return await self.run(self.db.get_persona)
+
+    async def execute_custom_sql(self, sql: str, params: List[Any] = None,
+                                 fetch_results: bool = True) -> Dict[str, Any]:
+        """Execute custom SQL statement"""
+        return await self.run(self.db.execute_custom_sql, sql, params, fetch_results)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the executor"""
+        self._executor.shutdown(wait=wait)
+
+    def close(self):
+        """Let in-flight operations finish, then close the database so deferred writes are committed"""
+        self.shutdown(wait=True)
+        if self._database is not None:
+            self._database.close()
+        close_database()
+
+
+# Global asynchronous database instance
+_async_database_instance = None
+
+def get_async_database() -> AsyncProfileDatabase:
+    """Get asynchronous database instance (singleton pattern)"""
+    global _async_database_instance
+    if _async_database_instance is None:
+        _async_database_instance = AsyncProfileDatabase()
+        # Server processes exit after uvicorn / the stdio transport stopped taking requests
+        atexit.register(_async_database_instance.close)
+    return _async_database_instance
@@ -0,0 +1,265 @@
+"""
+Backup Module
+
+Online hot backups of the profile database through the SQLite backup API
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .database import ProfileDatabase, get_open_database, on_database_open
+
+BACKUP_PREFIX = "userbank-"
+BACKUP_SUFFIX = ".db"
+
+
+class BackupManager:
+    """
+    Hot backup manager with optional periodic snapshots
+
+    Pages are copied in steps of pages_per_step with a short pause in between, so a backup
+    never holds a lock for long. The source connection keeps one read transaction open for
+    the whole copy: in WAL mode writers continue concurrently, the backup never restarts,
+    and the snapshot is the point-in-time state at the moment the backup started.
+
+    The copy reads the database file directly and never opens a ProfileDatabase, so the
+    multi-worker server's supervisor process can run the scheduler without one.
+    """
+
+    def __init__(self, database: Optional[ProfileDatabase] = None, directory: Optional[str] = None,
+                 retention: int = 7, interval_minutes: float = 0, pages_per_step: int = 256,
+                 step_sleep_ms: int = 5):
+        """
+        Initialize backup manager
+
+        Args:
+            database: Database to back up, the global instance (or the configured file) if None
+            directory: Backup directory, <database dir>/backups if empty
+            retention: Number of snapshots to keep, 0 keeps all
+            interval_minutes: Scheduler interval, 0 disables scheduled backups
+            pages_per_step: Database pages copied per backup step
+            step_sleep_ms: Pause between backup steps
+        """
+        self._database = database
+        self._directory = directory
+        self.retention = max(0, int(retention))
+        self.interval_minutes = max(0.0, float(interval_minutes))
+        self.pages_per_step = max(1, int(pages_per_step))
+        self.step_sleep = max(0, step_sleep_ms) / 1000.0
+
+        self._backup_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.last_backup: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def db(self) -> Optional[ProfileDatabase]:
+        """Database being backed up, None when it is not open in this process"""
+        return self._database or get_open_database()
+
+    @property
+    def db_path(self) -> str:
+        """Path of the database file being backed up"""
+        database = self.db
+        if database is not None:
+            return database.db_path
+        try:
+            from config_manager import get_config_manager
+            return get_config_manager().get_database_path()
+        except ImportError:
+            return str(Path(__file__).parent.parent / "profile_data.db")
+
+    @property
+    def directory(self) -> Path:
+        """Directory holding the snapshots"""
+        if self._directory:
+            return Path(self._directory)
+        return Path(self.db_path).parent / 'backups'
+
+    def create_backup(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create a snapshot of the database
+
+        Args:
+            label: Optional suffix for the snapshot file name
+
+        Returns:
+            Dictionary with snapshot path, size, page count and duration
+        """
+        db_path = self.db_path
+        if db_path == ':memory:' or db_path.startswith('file::memory:'):
+            raise ValueError("In-memory databases cannot be backed up")
+
+        suffix = ''
+        if label:
+            suffix = '-' + ''.join(c if c.isalnum() or c in '-_' else '_' for c in label)
+
+        with self._backup_lock:
+            directory = self.directory
+            directory.mkdir(parents=True, exist_ok=True)
+            name = f"{BACKUP_PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}{suffix}{BACKUP_SUFFIX}"
+            target_path = directory / name
+            partial_path = directory / (name + '.partial')
+
+            # Include writes still waiting in the write-behind queue (other processes commit their own)
+            database = self.db
+            if database is not None:
+                database.flush()
+
+            start = time.perf_counter()
+            steps = 0
+
+            def progress(status, remaining, total):
+                nonlocal steps
+                steps += 1
+
+            source = sqlite3.connect(db_path, isolation_level=None)
+            target = sqlite3.connect(str(partial_path))
+            try:
+                source.execute("PRAGMA query_only = ON")
+                # Pin one read snapshot for the whole copy
+                source.execute("BEGIN")
+                source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+                source.backup(target, pages=self.pages_per_step, progress=progress, sleep=self.step_sleep)
+                source.execute("COMMIT")
+                page_count = target.execute("PRAGMA page_count").fetchone()[0]
+                target.close()
+                os.replace(partial_path, target_path)
+            except Exception as e:
+                target.close()
+                partial_path.unlink(missing_ok=True)
+                self.last_error = str(e)
+                raise
+            finally:
+                source.close()
+
+            result = {
+                "path": str(target_path),
+                "name": name,
+                "size_bytes": target_path.stat().st_size,
+                "pages": page_count,
+                "steps": steps,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "created_time": datetime.now().isoformat()
+            }
+            result["removed"] = self._prune()
+            self.last_backup = result
+            self.last_error = None
+            return result
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """List snapshots, newest first"""
+        directory = self.directory
+        if not directory.exists():
+            return []
+
+        backups = []
+        for path in directory.glob(f"{BACKUP_PREFIX}*{BACKUP_SUFFIX}"):
+            stat = path.stat()
+            backups.append({
+                "path": str(path),
+                "name": path.name,
+                "size_bytes": stat.st_size,
+                "modified_time": datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
+        # Names start with a sortable timestamp
+        backups.sort(key=lambda backup: backup["name"], reverse=True)
+        return backups
+
+    def _prune(self) -> List[str]:
+        """Delete snapshots beyond the retention count (caller holds the backup lock)"""
+        if self.retention == 0:
+            return []
+        removed = []
+        for backup in self.list_backups()[self.retention:]:
+            try:
+                Path(backup["path"]).unlink()
+                removed.append(backup["name"])
+            except OSError as e:
+                print(f"Failed to remove old backup {backup['name']}: {e}", file=sys.stderr)
+        return removed
+
+    def start_scheduler(self) -> bool:
+        """Start periodic backups in a background thread, returns False when scheduling is disabled"""
+        if self.interval_minutes <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="userbank-backup", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        """Background loop creating a snapshot every interval_minutes"""
+        while not self._stop_event.wait(self.interval_minutes * 60):
+            try:
+                self.create_backup()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Scheduled backup failed: {e}", file=sys.stderr)
+
+    def stop_scheduler(self):
+        """Stop the background scheduler"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get backup settings and last result"""
+        return {
+            "directory": str(self.directory),
+            "retention": self.retention,
+            "interval_minutes": self.interval_minutes,
+            "scheduler_running": self._thread is not None and self._thread.is_alive(),
+            "pages_per_step": self.pages_per_step,
+            "last_backup": self.last_backup,
+            "last_error": self.last_error
+        }
+
+
+# Global backup manager instance
+_backup_manager = None
+_scheduled_on_open = False
+
+def get_backup_manager() -> BackupManager:
+    """Get backup manager instance configured from config.json (singleton pattern)"""
+    global _backup_manager
+    if _backup_manager is None:
+        backup_config = {}
+        try:
+            from config_manager import get_config_manager
+            backup_config = get_config_manager().get_backup_config()
+        except ImportError:
+            pass
+        _backup_manager = BackupManager(
+            directory=backup_config.get('directory') or None,
+            retention=backup_config.get('retention', 7),
+            interval_minutes=backup_config.get('interval_minutes', 0) if backup_config.get('enabled') else 0,
+            pages_per_step=backup_config.get('pages_per_step', 256),
+            step_sleep_ms=backup_config.get('step_sleep_ms', 5)
+        )
+    return _backup_manager
+
+
+def schedule_backups_on_open():
+    """
+    Start scheduled snapshots when the global database is first opened
+
+    Keeps server startup free of backup work: nothing happens until the first tool call
+    opens the database, and the scheduler only starts when database.backup.enabled is set.
+    """
+    global _scheduled_on_open
+    if _scheduled_on_open:
+        return
+    _scheduled_on_open = True
+
+    on_database_open(lambda db: get_backup_manager().start_scheduler())
@@ -0,0 +1,105 @@
+"""
+Cache Module
+
+Bounded in-memory caches used by ProfileDatabase
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """Roughly estimate the memory footprint of plain data (dicts, lists, strings, numbers) in bytes"""
+    if isinstance(value, dict):
+        return 64 + sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return 56 + sum(estimate_size(item) for item in value)
+    if isinstance(value, str):
+        return 49 + len(value.encode('utf-8'))
+    if isinstance(value, bytes):
+        return 33 + len(value)
+    return 28
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache
+
+    Every entry is stamped with a version. A lookup only hits when the caller's current
+    version matches the stamp, so bumping a version invalidates entries without scanning.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 0):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum number of entries, 0 disables the cache
+            max_bytes: Maximum estimated size of all values, 0 means no size limit
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[Hashable, tuple[Any, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[Any]:
+        """Get cached value, None on a miss or when the entry has another version"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, version: Any = None):
+        """Store value, evicting the least recently used entries over the limits"""
+        if self.max_entries == 0:
+            return
+        size = estimate_size(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            # Never cache a value that alone exceeds the size limit
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        """Remove an entry (caller holds the lock)"""
+        self._bytes -= self._entries.pop(key)[2]
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,438 @@
+"""
+Connection Pool Module
+
+Provides one serialized writer connection and a bounded pool of WAL-mode reader connections
+"""
+
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .group_commit import GroupCommitter
+
+try:
+    from metrics import track
+except ImportError:
+    # Tool metrics live next to the servers; without them database time is simply not tracked
+    @contextmanager
+    def track(phase: str) -> Iterator[None]:
+        yield
+
+# Named SQLite performance profiles (database.performance.preset in config.json).
+# durable: fsync on every commit; balanced: WAL with fsync at checkpoints, safe against
+# application crashes; throughput: no fsync at all, recent commits can be lost on power failure.
+PERFORMANCE_PRESETS = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'wal_autocheckpoint': 1000
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -32000,
+        'mmap_size': 67108864,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000
+    },
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 4000
+    }
+}
+
+# Allowed values of the non-numeric pragmas (numeric ones must be integers)
+PRAGMA_CHOICES = {
+    'journal_mode': ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF'),
+    'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+    'temp_store': ('DEFAULT', 'FILE', 'MEMORY')
+}
+NUMERIC_PRAGMAS = ('cache_size', 'mmap_size', 'busy_timeout', 'wal_autocheckpoint')
+
+# Write lock acquisitions slower than this are counted as lock waits
+LOCK_WAIT_THRESHOLD_MS = 1.0
+
+
+def is_busy_error(error: BaseException) -> bool:
+    """Check whether an error means another connection holds a conflicting lock"""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    error_code = getattr(error, 'sqlite_errorcode', None)
+    if error_code is not None:
+        # Extended result codes (e.g. SQLITE_BUSY_SNAPSHOT) keep the primary code in the low byte
+        return (error_code & 0xFF) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(error).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+def resolve_performance_profile(performance: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Resolve a performance config section into concrete pragma values
+
+    Args:
+        performance: {"preset": name} plus optional pragma overrides, e.g. {"preset": "balanced", "cache_size": -64000}
+
+    Returns:
+        Pragma name to value mapping (busy_timeout only when overridden)
+    """
+    performance = dict(performance or {})
+    preset = performance.pop('preset', 'balanced')
+    if preset not in PERFORMANCE_PRESETS:
+        raise ValueError(f"Invalid performance preset: {preset}, supported presets: {list(PERFORMANCE_PRESETS)}")
+
+    pragmas = dict(PERFORMANCE_PRESETS[preset])
+    for name, value in performance.items():
+        if name in PRAGMA_CHOICES:
+            value = str(value).upper()
+            if value not in PRAGMA_CHOICES[name]:
+                raise ValueError(f"Invalid {name}: {value}, supported values: {list(PRAGMA_CHOICES[name])}")
+        elif name in NUMERIC_PRAGMAS:
+            value = int(value)
+        else:
+            raise ValueError(f"Unknown performance setting: {name}")
+        pragmas[name] = value
+    return pragmas
+
+
+class ConnectionManager:
+    """SQLite connection manager with a single writer and pooled readers"""
+
+    def __init__(self, db_path: str, reader_pool_size: int = 4, pool_timeout: float = 5.0,
+                 write_behind: Optional[Dict[str, Any]] = None, on_commit: Optional[Callable[[], None]] = None,
+                 pragmas: Optional[Dict[str, Any]] = None, write_retry: Optional[Dict[str, Any]] = None):
+        """
+        Initialize connection manager
+
+        Args:
+            db_path: Database file path
+            reader_pool_size: Maximum number of reader connections, 0 routes reads through the writer
+            pool_timeout: Seconds to wait for a free reader connection
+            write_behind: Group commit settings (enabled, flush_interval_ms, max_batch_rows, ack_mode)
+            on_commit: Called after every group commit, so caches can drop data read before it
+            pragmas: Performance pragmas applied to every connection, see resolve_performance_profile
+            write_retry: Retries of a write transaction start blocked by another process
+                         (max_retries, base_delay_ms, max_delay_ms)
+        """
+        self.db_path = db_path
+        self.pool_timeout = pool_timeout
+        self.pragmas = dict(pragmas) if pragmas is not None else resolve_performance_profile()
+        # Lock waits default to the pool timeout unless configured explicitly
+        self.pragmas.setdefault('busy_timeout', int(pool_timeout * 1000))
+
+        # In-memory databases are private to one connection, so readers cannot be pooled
+        in_memory = db_path == ':memory:' or db_path.startswith('file::memory:')
+        if in_memory:
+            reader_pool_size = 0
+        self.reader_pool_size = max(0, int(reader_pool_size))
+
+        self._write_lock = threading.RLock()
+        self._pool_lock = threading.Lock()
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=self.reader_pool_size or 1)
+        self._all_readers = []
+        self._write_depth = 0
+        self._closed = False
+
+        write_retry = write_retry or {}
+        self.max_retries = max(0, int(write_retry.get('max_retries', 3)))
+        self.retry_base_delay = max(0, write_retry.get('base_delay_ms', 25)) / 1000.0
+        self.retry_max_delay = max(self.retry_base_delay, write_retry.get('max_delay_ms', 500) / 1000.0)
+
+        # Contention statistics (updated under the write lock)
+        self.write_transactions = 0
+        self.lock_waits = 0
+        self.lock_wait_ms_total = 0.0
+        self.lock_wait_ms_max = 0.0
+        self.busy_errors = 0
+        self.busy_retries = 0
+        self.busy_failures = 0
+
+        self.writer = self._open_connection()
+        # The journal mode is persistent in the database file, setting it once on the writer is enough
+        self.journal_mode = self.writer.execute(f"PRAGMA journal_mode = {self.pragmas['journal_mode']}").fetchone()[0]
+
+        # Commits of other processes are detected through PRAGMA data_version on a connection
+        # of its own, so polling never waits for the write lock (in-memory databases have no
+        # other processes)
+        self._monitor_lock = threading.Lock()
+        self._monitor: Optional[sqlite3.Connection] = None
+        self.external_commits = 0
+        if not in_memory:
+            self._monitor = self._open_connection(read_only=True)
+            self._monitor_version = self._monitor.execute("PRAGMA data_version").fetchone()[0]
+            self._writer_version = self.writer.execute("PRAGMA data_version").fetchone()[0]
+
+        self.on_commit = on_commit
+        self.group_committer: Optional[GroupCommitter] = None
+        if write_behind and write_behind.get('enabled'):
+            self.group_committer = GroupCommitter(
+                self.writer, self._write_lock,
+                flush_interval_ms=write_behind.get('flush_interval_ms', 50),
+                max_batch_rows=write_behind.get('max_batch_rows', 200),
+                ack_mode=write_behind.get('ack_mode', 'commit'),
+                on_commit=self._on_group_commit
+            )
+
+    def _open_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open and configure a connection"""
+        # isolation_level=None: transactions are managed explicitly with BEGIN/COMMIT
+        connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        connection.row_factory = sqlite3.Row  # Enable dictionary-style access
+        connection.execute("PRAGMA foreign_keys = ON")
+        # Rows deleted by INSERT OR REPLACE fire the DELETE triggers that keep the full-text
+        # and keyword indexes in sync only with recursive triggers enabled
+        connection.execute("PRAGMA recursive_triggers = ON")
+        for name in ('synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout', 'wal_autocheckpoint'):
+            connection.execute(f"PRAGMA {name} = {self.pragmas[name]}")
+        if read_only:
+            connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Take a reader connection from the pool, opening a new one while under the limit"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if len(self._all_readers) < self.reader_pool_size:
+                connection = self._open_connection(read_only=True)
+                self._all_readers.append(connection)
+                return connection
+
+        try:
+            return self._readers.get(timeout=self.pool_timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Timed out after {self.pool_timeout}s waiting for a database reader connection")
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Borrow a cursor for a read operation
+
+        Each operation gets its own cursor, so concurrent callers never share a result set.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+
+        with track('db'):
+            if self.reader_pool_size == 0:
+                with self._write_lock:
+                    cursor = self.writer.cursor()
+                    try:
+                        yield cursor
+                    finally:
+                        cursor.close()
+                return
+
+            connection = self._acquire_reader()
+            cursor = connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+                self._readers.put(connection)
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Run a write transaction on the serialized writer connection
+
+        Commits when the block exits normally and rolls back on any exception.
+        A nested call joins the transaction that is already open.
+
+        With write-behind enabled the block runs in a savepoint of a shared transaction that
+        the group committer commits later; in 'commit' ack mode this call returns only after
+        that commit.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+
+        with track('db'):
+            commit_generation = None
+            wait_start = time.perf_counter()
+            with self._write_lock:
+                cursor = self.writer.cursor()
+                if self._write_depth > 0:
+                    try:
+                        yield cursor
+                    finally:
+                        cursor.close()
+                    return
+
+                self._write_depth += 1
+                try:
+                    if self.group_committer is not None:
+                        if not self.writer.in_transaction:
+                            self._begin_immediate(cursor, wait_start)
+                        cursor.execute("SAVEPOINT write_operation")
+                        try:
+                            yield cursor
+                            cursor.execute("RELEASE write_operation")
+                        except BaseException as e:
+                            if self.writer.in_transaction:
+                                cursor.execute("ROLLBACK TO write_operation")
+                                cursor.execute("RELEASE write_operation")
+                            else:
+                                # SQLite rolled back the whole shared transaction
+                                self.group_committer.abort(e)
+                            raise
+                        commit_generation = self.group_committer.record_write()
+                    else:
+                        self._begin_immediate(cursor, wait_start)
+                        try:
+                            yield cursor
+                            self.writer.commit()
+                        except BaseException:
+                            self.writer.rollback()
+                            raise
+                        self._sync_data_version()
+                finally:
+                    self._write_depth -= 1
+                    cursor.close()
+
+            if commit_generation is not None and self.group_committer.ack_mode == 'commit':
+                self.group_committer.wait_for(commit_generation)
+
+    def _begin_immediate(self, cursor: sqlite3.Cursor, wait_start: float):
+        """
+        Start a write transaction that holds the database write lock from the first statement
+
+        BEGIN IMMEDIATE waits for other processes through busy_timeout. If the lock is still
+        taken after that, the attempt is retried up to max_retries times with jittered
+        exponential backoff. A deferred BEGIN could instead fail halfway through the
+        transaction with SQLITE_BUSY, when upgrading its read snapshot to a write.
+        """
+        attempt = 0
+        while True:
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                break
+            except sqlite3.OperationalError as e:
+                if not is_busy_error(e):
+                    raise
+                self.busy_errors += 1
+                if attempt >= self.max_retries:
+                    self.busy_failures += 1
+                    raise
+                attempt += 1
+                self.busy_retries += 1
+                delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempt - 1)))
+                # Full jitter keeps competing processes from retrying in lockstep
+                time.sleep(random.uniform(0, delay))
+
+        waited_ms = (time.perf_counter() - wait_start) * 1000
+        self.write_transactions += 1
+        self.lock_wait_ms_total += waited_ms
+        self.lock_wait_ms_max = max(self.lock_wait_ms_max, waited_ms)
+        if waited_ms >= LOCK_WAIT_THRESHOLD_MS:
+            self.lock_waits += 1
+
+    def _on_group_commit(self):
+        """Group committer callback (runs under the write lock)"""
+        self._sync_data_version()
+        if self.on_commit is not None:
+            self.on_commit()
+
+    def _sync_data_version(self):
+        """
+        Accept the monitor's data_version after a commit of the writer (caller holds the write lock)
+
+        The monitor sees the writer's own commits as changes, so its value is re-read here.
+        Commits of other processes that landed before that read are caught by the writer's
+        data_version, which only moves for other connections; the monitor is read first so
+        none slip in between.
+        """
+        if self._monitor is None:
+            return
+        with self._monitor_lock:
+            self._monitor_version = self._monitor.execute("PRAGMA data_version").fetchone()[0]
+            writer_version = self.writer.execute("PRAGMA data_version").fetchone()[0]
+            if writer_version != self._writer_version:
+                self._writer_version = writer_version
+                self.external_commits += 1
+
+    def external_change_count(self) -> int:
+        """
+        Get the number of detected commit batches of other processes
+
+        Polls PRAGMA data_version on the monitor connection. Only the small monitor lock is
+        taken, so callers never wait for an open write transaction or a commit.
+        """
+        if self._monitor is None:
+            return 0
+        with self._monitor_lock:
+            version = self._monitor.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._monitor_version:
+                self._monitor_version = version
+                self.external_commits += 1
+            return self.external_commits
+
+    def flush(self):
+        """Commit writes deferred by the group committer"""
+        if self.group_committer is not None:
+            self.group_committer.flush()
+
+    def close(self):
+        """Close all connections (pending group-commit writes are flushed first)"""
+        if self.group_committer is not None and not self._closed:
+            self.group_committer.close()
+        with self._write_lock:
+            self._closed = True
+            with self._pool_lock:
+                for connection in self._all_readers:
+                    connection.close()
+                self._all_readers = []
+            with self._monitor_lock:
+                if self._monitor is not None:
+                    self._monitor.close()
+                    self._monitor = None
+            self.writer.close()
+
+    def get_effective_pragmas(self) -> Dict[str, Any]:
+        """Read back the pragma values SQLite actually uses on the writer connection"""
+        with self._write_lock:
+            pragmas = {"journal_mode": self.writer.execute("PRAGMA journal_mode").fetchone()[0]}
+            for name in ('synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout', 'wal_autocheckpoint'):
+                row = self.writer.execute(f"PRAGMA {name}").fetchone()
+                # mmap_size reads back nothing when memory mapping is unavailable
+                value = row[0] if row is not None else None
+                if name in PRAGMA_CHOICES and isinstance(value, int) and value < len(PRAGMA_CHOICES[name]):
+                    # synchronous and temp_store read back as their index in the choices
+                    value = PRAGMA_CHOICES[name][value]
+                pragmas[name] = value
+        return pragmas
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics"""
+        return {
+            "journal_mode": self.journal_mode,
+            "pragmas": self.get_effective_pragmas(),
+            "reader_pool_size": self.reader_pool_size,
+            "open_readers": len(self._all_readers),
+            "idle_readers": self._readers.qsize(),
+            "pool_timeout": self.pool_timeout,
+            "contention": {
+                "write_transactions": self.write_transactions,
+                "lock_waits": self.lock_waits,
+                "lock_wait_ms_total": round(self.lock_wait_ms_total, 2),
+                "lock_wait_ms_max": round(self.lock_wait_ms_max, 2),
+                "busy_errors": self.busy_errors,
+                "busy_retries": self.busy_retries,
+                "busy_failures": self.busy_failures,
+                "max_retries": self.max_retries
+            },
+            "external_commits": self.external_commits,
+            "write_behind": self.group_committer.get_stats() if self.group_committer else None
+        }
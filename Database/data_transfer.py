@@ -0,0 +1,246 @@
+"""
+Data Transfer Module
+
+Streaming NDJSON export and import of the whole data bank.
+
+File format: the first line is a header object ({"format": "userbank-ndjson", ...}), every
+following line is {"table": <table name>, "record": <row>} with column values exactly as
+stored in SQLite. Paths ending in .gz are read and written gzip-compressed.
+
+Usage:
+    python -m Database.data_transfer export [--output PATH] [--tables memory,goal] [--db PATH]
+    python -m Database.data_transfer import PATH [--on-conflict update|skip] [--db PATH]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional
+
+from .database import ProfileDatabase, get_database
+
+EXPORT_FORMAT = "userbank-ndjson"
+EXPORT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _open_file(path: Path, mode: str) -> IO[str]:
+    """Open a text file, gzip-compressed if the name ends in .gz"""
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def exports_directory(db: ProfileDatabase) -> Path:
+    """Get the exports directory next to the database"""
+    return Path(db.db_path).parent / 'exports'
+
+
+def default_export_path(db: ProfileDatabase) -> Path:
+    """Get a timestamped export file path next to the database"""
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    return exports_directory(db) / f"userbank-{timestamp}.ndjson"
+
+
+def resolve_export_file(db: ProfileDatabase, file_name: str) -> Path:
+    """
+    Resolve a bare file name inside the exports directory
+
+    Used for file names supplied by MCP clients, which must not reach the rest of the file
+    system: path separators, '..', absolute paths, drive letters and symlinks leading out
+    of the directory are rejected.
+
+    Args:
+        db: Database whose exports directory is used
+        file_name: File name without any directory part
+
+    Returns:
+        Path of the file inside the exports directory
+    """
+    if (not file_name or file_name in ('.', '..') or '/' in file_name or '\\' in file_name
+            or ':' in file_name or '\0' in file_name or Path(file_name).is_absolute()):
+        raise ValueError(f"Invalid file name: {file_name!r}, expected a bare file name inside the exports directory")
+
+    directory = exports_directory(db)
+    path = directory / file_name
+    if path.resolve().parent != directory.resolve():
+        raise ValueError(f"Invalid file name: {file_name!r}, it leads out of the exports directory")
+    return path
+
+
+def export_data(db: ProfileDatabase = None, output_path: str = None, tables: List[str] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Export tables as NDJSON
+
+    Rows are streamed from one read snapshot in chunks of chunk_size, so memory use does not
+    grow with the database and the export is consistent across tables.
+
+    Args:
+        db: Database to export, the global instance if None
+        output_path: Target file, a timestamped file in <database dir>/exports if None
+        tables: Tables to export, all tables of ProfileDatabase.tables if None
+        chunk_size: Rows fetched and written per step
+
+    Returns:
+        Dictionary with output path and exported row count per table
+    """
+    db = db or get_database()
+    tables = list(tables) if tables else list(db.tables)
+    unknown = [table for table in tables if table not in db.tables]
+    if unknown:
+        raise ValueError(f"Unknown table names: {unknown}")
+
+    path = Path(output_path) if output_path else default_export_path(db)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    counts: Dict[str, int] = {}
+
+    with _open_file(path, 'w') as output, db.read_snapshot() as cursor:
+        header = {
+            "format": EXPORT_FORMAT,
+            "version": EXPORT_VERSION,
+            "exported_at": datetime.now().isoformat(),
+            "tables": tables
+        }
+        output.write(json.dumps(header, ensure_ascii=False) + '\n')
+
+        for table_name in tables:
+            counts[table_name] = 0
+            cursor.execute(f"SELECT * FROM {table_name} ORDER BY id")
+            columns = [description[0] for description in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                output.write(''.join(
+                    json.dumps({"table": table_name, "record": dict(zip(columns, row))}, ensure_ascii=False) + '\n'
+                    for row in rows
+                ))
+                counts[table_name] += len(rows)
+
+    return {
+        "success": True,
+        "operation": "export",
+        "path": str(path),
+        "tables": counts,
+        "total_records": sum(counts.values())
+    }
+
+
+def import_data(db: ProfileDatabase = None, input_path: str = None, on_conflict: str = 'update',
+                batch_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Import an NDJSON export
+
+    The file is read line by line and written in batches of batch_size rows, each batch in
+    its own transaction. Record ids are preserved.
+
+    Args:
+        db: Target database, the global instance if None
+        input_path: NDJSON file produced by export_data
+        on_conflict: 'update' overwrites records whose id already exists, 'skip' keeps them
+        batch_size: Rows written per transaction
+
+    Returns:
+        Dictionary with processed row count per table (rows skipped on conflict included)
+    """
+    if not input_path:
+        raise ValueError("import_data requires input_path")
+    if on_conflict not in ('update', 'skip'):
+        raise ValueError(f"Invalid on_conflict: {on_conflict}, supported: 'update', 'skip'")
+
+    db = db or get_database()
+    path = Path(input_path)
+    counts: Dict[str, int] = {}
+    batch_table: Optional[str] = None
+    batch: List[Dict[str, Any]] = []
+
+    def flush_batch():
+        if batch:
+            db.insert_records(batch_table, batch, on_conflict=on_conflict)
+            counts[batch_table] = counts.get(batch_table, 0) + len(batch)
+            batch.clear()
+
+    with _open_file(path, 'r') as source:
+        for line_number, line in enumerate(source, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_number}: invalid JSON ({e})")
+
+            if 'format' in entry:
+                if entry['format'] != EXPORT_FORMAT or entry.get('version', 0) > EXPORT_VERSION:
+                    raise ValueError(f"Line {line_number}: unsupported export format "
+                                     f"{entry['format']} version {entry.get('version')}")
+                continue
+
+            table_name = entry.get('table')
+            record = entry.get('record')
+            if table_name not in db.tables or not isinstance(record, dict):
+                raise ValueError(f"Line {line_number}: expected a record of a known table, got table {table_name!r}")
+
+            if table_name != batch_table or len(batch) >= batch_size:
+                try:
+                    flush_batch()
+                except Exception as e:
+                    raise ValueError(f"Batch ending before line {line_number}: {e}")
+                batch_table = table_name
+            batch.append(record)
+
+        try:
+            flush_batch()
+        except Exception as e:
+            raise ValueError(f"Final batch: {e}")
+
+    return {
+        "success": True,
+        "operation": "import",
+        "path": str(path),
+        "tables": counts,
+        "total_records": sum(counts.values())
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Export or import the UserBank data bank as NDJSON")
+    parser.add_argument('--db', help="Database file, read from config.json if omitted")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help="Export tables to an NDJSON file")
+    export_parser.add_argument('--output', help="Output file (.ndjson or .ndjson.gz)")
+    export_parser.add_argument('--tables', help="Comma-separated table names, all tables if omitted")
+    export_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    import_parser = commands.add_parser('import', help="Import an NDJSON export")
+    import_parser.add_argument('path', help="NDJSON file produced by export")
+    import_parser.add_argument('--on-conflict', choices=['update', 'skip'], default='update')
+    import_parser.add_argument('--batch-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    args = parser.parse_args(argv)
+    db = ProfileDatabase(args.db) if args.db else get_database()
+
+    try:
+        if args.command == 'export':
+            tables = [table.strip() for table in args.tables.split(',')] if args.tables else None
+            result = export_data(db, args.output, tables, args.chunk_size)
+        else:
+            result = import_data(db, args.path, args.on_conflict, args.batch_size)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,11 +6,16 @@ Responsible for creating and managing SQLite database for personal profile data
 
 import sqlite3
 import json
+import base64
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable
 from pathlib import Path
 import os
 import sys
+import threading
+import time
+import copy
+from contextlib import contextmanager
 
 # Add parent directory to path for importing config_manager
 sys.path.append(str(Path(__file__).parent.parent))
@@ -19,18 +24,163 @@ import sys
 # Add parent directory to path for importing config_manager
 sys.path.append(str(Path(__file__).parent.parent))
 from config_manager import get_config_manager
+from .connection_pool import ConnectionManager, resolve_performance_profile
+from .cache import LRUCache
+from .migrations import apply_migrations
+from .slow_query import SlowQueryLog
+
+# Text columns covered by each table's FTS5 full-text index ({table}_fts).
+# The index uses the trigram tokenizer, so matching works on substrings of any script
+# (including CJK text, which has no spaces between words).
+FTS_COLUMNS = {
+    'viewpoint': ['content', 'source_people', 'related_event'],
+    'insight': ['content', 'source_people'],
+    'focus': ['content', 'context'],
+    'goal': ['content'],
+    'preference': ['content', 'context'],
+    'methodology': ['content', 'type', 'use_cases'],
+    'prediction': ['content', 'timeframe', 'basis'],
+    'memory': ['content', 'related_people', 'location']
+}
+
+# Tables whose JSON "keywords" list is mirrored into the record_keyword index
+KEYWORD_TABLES = list(FTS_COLUMNS)
+
+# Supported count modes of query_page
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+# Filtered 'estimate' counts stop scanning after this many matching rows
+ESTIMATE_COUNT_CAP = 1000
+
+# Trigram indexes can only look up substrings of at least this many characters
+TRIGRAM_MIN_LENGTH = 3
+
+# Appended to every indexed value (char(31)), so every occurrence of a two-character term,
+# including one at the end of a value, begins an indexed trigram
+FTS_END_MARKER = '\x1f'
+
+# Two-character terms that begin more indexed trigrams than this are matched with LIKE
+MAX_SHORT_TERM_EXPANSIONS = 500
+
+def split_match_terms(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Split free text into (index-searchable terms, terms too short for the trigram index)
+    """
+    terms = [term for term in str(text).split() if term]
+    indexed_terms = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    short_terms = [term for term in terms if len(term) < TRIGRAM_MIN_LENGTH]
+    return indexed_terms, short_terms
+
+def build_match_query(terms: List[str]) -> str:
+    """
+    Turn terms into a safe FTS5 MATCH expression
+    
+    Every term is quoted, so punctuation in user input can never be parsed as FTS5
+    query syntax. Terms are combined with implicit AND.
+    """
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+def build_any_match_query(tokens: List[str]) -> str:
+    """Turn indexed tokens into a safe FTS5 MATCH expression matching any of them"""
+    return '(' + ' OR '.join('"' + token.replace('"', '""') + '"' for token in tokens) + ')'
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Encode a keyset position as an opaque pagination cursor"""
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a pagination cursor produced by encode_cursor"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(data.decode('utf-8'))
+        if not isinstance(payload, dict) or 'id' not in payload or 'sort' not in payload:
+            raise ValueError
+        return payload
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+def json_size(record: Dict[str, Any]) -> int:
+    """Size of a record serialized as JSON, in characters"""
+    return len(json.dumps(record, ensure_ascii=False, default=str))
+
+def truncate_record(record: Dict[str, Any], record_size: Callable[[Dict[str, Any]], int],
+                    max_size: int) -> Optional[Dict[str, Any]]:
+    """
+    Shorten the content field of a record (ending it with an ellipsis) until record_size fits max_size
+    
+    Returns None when the record does not fit even with a single character of content left.
+    """
+    if record_size(record) <= max_size:
+        return record
+    content = record.get('content')
+    if not isinstance(content, str) or len(content) < 2:
+        return None
+    record['content'] = content[:1] + '…'
+    if record_size(record) > max_size:
+        record['content'] = content
+        return None
+    # Longest prefix that fits; sizes grow with the prefix length
+    low, high = 1, len(content) - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        record['content'] = content[:middle] + '…'
+        if record_size(record) <= max_size:
+            low = middle
+        else:
+            high = middle - 1
+    record['content'] = content[:low] + '…'
+    return record
+
+def build_keyset_condition(sort_key: str, id_key: str, sort_order: str,
+                           last_value: Any, last_id: int) -> Tuple[str, List[Any]]:
+    """
+    Build the WHERE condition selecting rows after (last_value, last_id) in ORDER BY sort_key, id_key
+    
+    SQLite sorts NULL first in ascending and last in descending order.
+    """
+    op = '<' if sort_order == 'desc' else '>'
+    if last_value is None:
+        if sort_order == 'desc':
+            return f"({sort_key} IS NULL AND {id_key} < ?)", [last_id]
+        return f"(({sort_key} IS NULL AND {id_key} > ?) OR {sort_key} IS NOT NULL)", [last_id]
+    
+    null_tail = f" OR {sort_key} IS NULL" if sort_order == 'desc' else ""
+    condition = f"({sort_key} {op} ? OR ({sort_key} = ? AND {id_key} {op} ?){null_tail})"
+    return condition, [last_value, last_value, last_id]
 
 class ProfileDatabase:
     """Personal profile database management class"""
     
-    def __init__(self, db_path: str = None, timezone_offset: int = None):
+    def __init__(self, db_path: str = None, timezone_offset: int = None,
+                 reader_pool_size: int = None, pool_timeout: float = None,
+                 write_behind: Dict[str, Any] = None, record_cache_size: int = None,
+                 query_cache_entries: int = None, query_cache_max_bytes: int = None,
+                 performance: Dict[str, Any] = None, write_retry: Dict[str, Any] = None,
+                 slow_query: Dict[str, Any] = None):
         """
         Initialize database connection
         
         Args:
             db_path: Database file path, read from config.json if None
             timezone_offset: Timezone offset (hours), read from config.json if None
+            reader_pool_size: Number of pooled reader connections, read from config.json if None
+            pool_timeout: Seconds to wait for a reader connection, read from config.json if None
+            write_behind: Group commit settings, read from config.json if None
+            record_cache_size: Number of records kept in the get_record cache, read from config.json if None
+            query_cache_entries: Number of query_page results kept in the result cache, read from config.json if None
+            query_cache_max_bytes: Estimated memory limit of the result cache, read from config.json if None
+            performance: SQLite performance profile ({"preset": ..., pragma overrides}), read from config.json if None
+            write_retry: Retry settings for writes blocked by another process, read from config.json if None
+            slow_query: Slow query log settings (enabled, threshold_ms, max_entries, log_file, explain), read from config.json if None
         """
+        pool_config = {"reader_pool_size": 4, "pool_timeout": 5.0}
+        write_behind_config = {"enabled": False}
+        cache_config = {"record_cache_size": 1000, "query_cache_entries": 256, "query_cache_max_bytes": 8388608}
+        performance_config = {"preset": "balanced"}
+        write_retry_config = {"max_retries": 3, "base_delay_ms": 25, "max_delay_ms": 500}
+        slow_query_config = {"enabled": True, "threshold_ms": 100, "max_entries": 200, "log_file": "", "explain": True}
+        
         # Import configuration manager
         try:
             from config_manager import get_config_manager
@@ -43,6 +193,13 @@ class ProfileDatabase:
                 
             if timezone_offset is None:
                 timezone_offset = config_manager.get_timezone_offset()
+            
+            pool_config = config_manager.get_database_pool_config()
+            write_behind_config = config_manager.get_write_behind_config()
+            cache_config = config_manager.get_cache_config()
+            performance_config = config_manager.get_performance_config()
+            write_retry_config = config_manager.get_write_retry_config()
+            slow_query_config = config_manager.get_slow_query_config()
                 
         except ImportError:
             # Use default values if unable to import configuration manager
@@ -55,8 +212,47 @@ class ProfileDatabase:
             if timezone_offset is None:
                 timezone_offset = 8
         
+        if reader_pool_size is None:
+            reader_pool_size = pool_config['reader_pool_size']
+        if pool_timeout is None:
+            pool_timeout = pool_config['pool_timeout']
+        self.reader_pool_size = reader_pool_size
+        self.pool_timeout = pool_timeout
+        self.write_behind = write_behind if write_behind is not None else write_behind_config
+        self.performance = dict(performance if performance is not None else performance_config)
+        self.pragmas = resolve_performance_profile(self.performance)
+        self.write_retry = write_retry if write_retry is not None else write_retry_config
+        if slow_query is not None:
+            slow_query_config = {**slow_query_config, **slow_query}
+        self.slow_queries = SlowQueryLog(
+            threshold_ms=slow_query_config.get('threshold_ms', 100),
+            max_entries=slow_query_config.get('max_entries', 200),
+            log_file=slow_query_config.get('log_file') or None,
+            explain=slow_query_config.get('explain', True),
+            enabled=slow_query_config.get('enabled', True)
+        )
+        
+        self._connections: Optional[ConnectionManager] = None
+        self.schema_version = 0
         self.connection = None
-        self.cursor = None
+        self._table_columns: Dict[str, List[str]] = {}
+        
+        # Write-invalidated caches: per-table version counters and unfiltered row counts
+        self._cache_lock = threading.Lock()
+        self._table_versions: Dict[str, int] = {}
+        self._row_counts: Dict[str, int] = {}
+        self._uncommitted_tables = set()
+        self._external_commits_seen = 0
+        self.external_invalidations = 0
+        self._local = threading.local()
+        if record_cache_size is None:
+            record_cache_size = cache_config['record_cache_size']
+        self._record_cache = LRUCache(record_cache_size)
+        if query_cache_entries is None:
+            query_cache_entries = cache_config['query_cache_entries']
+        if query_cache_max_bytes is None:
+            query_cache_max_bytes = cache_config['query_cache_max_bytes']
+        self._query_cache = LRUCache(query_cache_entries, query_cache_max_bytes)
         
         # Set timezone
         self.timezone = timezone(timedelta(hours=timezone_offset))
@@ -81,16 +277,10 @@ class ProfileDatabase:
         }
         
         try:
-            # Check if database file exists
-            db_exists = Path(self.db_path).exists()
-            
             self._connect()
             
-            # Create tables only if database file doesn't exist or tables don't exist
-            if not db_exists or not self._check_tables_exist():
-                self._create_tables()
-                self._create_indexes()
-                self._init_default_data()
+            # A database at the current schema version costs a single PRAGMA read here
+            self.schema_version = apply_migrations(self)
             
         except Exception as e:
             raise
@@ -100,360 +290,595 @@ class ProfileDatabase:
         return datetime.now(self.timezone).isoformat()
     
     def _connect(self):
-        """Establish database connection"""
+        """Establish database connections (one writer plus a pool of WAL readers)"""
         try:
-            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row  # Enable dictionary-style access
-            self.cursor = self.connection.cursor()
-            # Enable foreign key constraints
-            self.cursor.execute("PRAGMA foreign_keys = ON")
+            self._connections = ConnectionManager(self.db_path, self.reader_pool_size, self.pool_timeout,
+                                                  write_behind=self.write_behind,
+                                                  on_commit=self._on_group_commit,
+                                                  pragmas=self.pragmas,
+                                                  write_retry=self.write_retry)
+            # Writer connection, kept for callers that need direct access
+            self.connection = self._connections.writer
         except Exception as e:
             raise
     
-    def _check_tables_exist(self) -> bool:
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """Create all data tables"""
+        # 1. Persona (Personal Profile Table) - System Core
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS persona (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                gender TEXT,
+                personality TEXT,
+                avatar_url TEXT,
+                bio TEXT,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP
+            )
+        """)
+        
+        # 2. Category (Classification System Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS category (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                first_level TEXT NOT NULL,
+                second_level TEXT NOT NULL,
+                description TEXT,
+                is_active BOOLEAN DEFAULT true,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP
+            )
+        """)
+        
+        # 3. Relations (General Association Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS relations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_table TEXT NOT NULL,
+                source_id INTEGER NOT NULL,
+                target_table TEXT NOT NULL,
+                target_id INTEGER NOT NULL,
+                relation_type TEXT NOT NULL,
+                strength TEXT CHECK(strength IN ('strong', 'medium', 'weak')),
+                note TEXT,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP
+            )
+        """)
+        
+        # 4. Viewpoint (Viewpoint Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS viewpoint (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                source_people TEXT,
+                keywords TEXT,
+                source_app TEXT DEFAULT 'unknown',
+                related_event TEXT,
+                reference_urls TEXT,
+                category_id INTEGER,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES category(id)
+            )
+        """)
+        
+        # 5. Insight (Insight Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS insight (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                source_people TEXT,
+                keywords TEXT,
+                source_app TEXT DEFAULT 'unknown',
+                category_id INTEGER,
+                reference_urls TEXT,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES category(id)
+            )
+        """)
+        
+        # 6. Focus (Focus Point Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS focus (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                priority INTEGER CHECK(priority >= 1 AND priority <= 10),
+                status TEXT CHECK(status IN ('active', 'paused', 'completed')),
+                context TEXT,
+                keywords TEXT,
+                source_app TEXT DEFAULT 'unknown',
+                category_id INTEGER,
+                deadline DATE,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES category(id)
+            )
+        """)
+        
+        # 7. Goal (Goal Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS goal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                type TEXT CHECK(type IN ('long_term', 'short_term', 'plan', 'todo')),
+                deadline DATE,
+                status TEXT CHECK(status IN ('planning', 'in_progress', 'completed', 'abandoned')),
+                keywords TEXT,
+                source_app TEXT DEFAULT 'unknown',
+                category_id INTEGER,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES category(id)
+            )
+        """)
+        
+        # 8. Preference (Preference Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS preference (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                context TEXT,
+                keywords TEXT,
+                source_app TEXT DEFAULT 'unknown',
+                category_id INTEGER,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES category(id)
+            )
+        """)
+        
+        # 9. Methodology (Methodology Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS methodology (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                type TEXT,
+                effectiveness TEXT CHECK(effectiveness IN ('proven', 'experimental', 'theoretical')),
+                use_cases TEXT,
+                keywords TEXT,
+                source_app TEXT DEFAULT 'unknown',
+                reference_urls TEXT,
+                category_id INTEGER,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES category(id)
+            )
+        """)
+        
+        # 10. Prediction (Prediction Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS prediction (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                timeframe TEXT,
+                basis TEXT,
+                verification_status TEXT CHECK(verification_status IN ('pending', 'correct', 'incorrect', 'partial')),
+                keywords TEXT,
+                source_app TEXT DEFAULT 'unknown',
+                reference_urls TEXT,
+                category_id INTEGER,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES category(id)
+            )
+        """)
+        
+        # 11. Memory (Memory Table)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS memory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content TEXT NOT NULL,
+                memory_type TEXT CHECK(memory_type IN ('experience', 'event', 'learning', 'interaction', 'achievement', 'mistake')),
+                importance INTEGER CHECK(importance >= 1 AND importance <= 10),
+                related_people TEXT,
+                location TEXT,
+                memory_date DATE,
+                keywords TEXT,
+                source_app TEXT DEFAULT 'unknown',
+                reference_urls TEXT,
+                category_id INTEGER,
+                privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                created_time TIMESTAMP,
+                updated_time TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES category(id)
+            )
+        """)
+    
+    def _create_indexes(self, cursor: sqlite3.Cursor):
+        """Create indexes"""
+        # Persona table indexes
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_persona_id ON persona(id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_persona_privacy ON persona(privacy_level)")
+        
+        # Category table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_levels ON category(first_level, second_level)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_active ON category(is_active)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_privacy ON category(privacy_level)")
+        
+        # Relations table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_source ON relations(source_table, source_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_target ON relations(target_table, target_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_type ON relations(relation_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_privacy ON relations(privacy_level)")
+        
+        # Viewpoint table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_viewpoint_source_people ON viewpoint(source_people)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_viewpoint_source_app ON viewpoint(source_app)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_viewpoint_category ON viewpoint(category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_viewpoint_privacy ON viewpoint(privacy_level)")
+        
+        # Insight table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_source_people ON insight(source_people)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_source_app ON insight(source_app)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_category ON insight(category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_time ON insight(created_time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_privacy ON insight(privacy_level)")
+        
+        # Focus table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_priority ON focus(priority)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_status ON focus(status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_deadline ON focus(deadline)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_category ON focus(category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_privacy ON focus(privacy_level)")
+        
+        # Goal table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_type ON goal(type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_status ON goal(status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_deadline ON goal(deadline)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_category ON goal(category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_privacy ON goal(privacy_level)")
+        
+        # Preference table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_preference_category ON preference(category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_preference_privacy ON preference(privacy_level)")
+        
+        # Methodology table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_methodology_type ON methodology(type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_methodology_effectiveness ON methodology(effectiveness)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_methodology_category ON methodology(category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_methodology_privacy ON methodology(privacy_level)")
+        
+        # Prediction table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_timeframe ON prediction(timeframe)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_verification ON prediction(verification_status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_category ON prediction(category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_privacy ON prediction(privacy_level)")
+        
+        # Memory table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_type ON memory(memory_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_importance ON memory(importance)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_date ON memory(memory_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_category ON memory(category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_privacy ON memory(privacy_level)")
+    
+    def _create_fts_indexes(self, cursor: sqlite3.Cursor):
         """
-        Check if all required tables exist
+        Create missing FTS5 full-text indexes and the triggers that keep them in sync
         
-        Returns:
-            True if all tables exist, False otherwise
+        Each index reads its text through the {table}_fts_source view, which appends
+        FTS_END_MARKER to every value, and gets a {table}_fts_vocab table listing its trigrams,
+        used to look up two-character terms.
         """
-        try:
-            for table_name in self.tables.keys():
-                # Query if table exists
-                self.cursor.execute("""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name=?
-                """, (table_name,))
-                
-                if not self.cursor.fetchone():
-                    return False
-            
-            return True
-        except Exception as e:
-            return False
-    
-    def _create_tables(self):
-        """Create all data tables"""
-        try:
-            # 1. Persona (Personal Profile Table) - System Core
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS persona (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    gender TEXT,
-                    personality TEXT,
-                    avatar_url TEXT,
-                    bio TEXT,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP
-                )
-            """)
-            
-            # 2. Category (Classification System Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS category (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    first_level TEXT NOT NULL,
-                    second_level TEXT NOT NULL,
-                    description TEXT,
-                    is_active BOOLEAN DEFAULT true,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP
-                )
-            """)
-            
-            # 3. Relations (General Association Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS relations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source_table TEXT NOT NULL,
-                    source_id INTEGER NOT NULL,
-                    target_table TEXT NOT NULL,
-                    target_id INTEGER NOT NULL,
-                    relation_type TEXT NOT NULL,
-                    strength TEXT CHECK(strength IN ('strong', 'medium', 'weak')),
-                    note TEXT,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP
-                )
-            """)
-            
-            # 4. Viewpoint (Viewpoint Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS viewpoint (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    source_people TEXT,
-                    keywords TEXT,
-                    source_app TEXT DEFAULT 'unknown',
-                    related_event TEXT,
-                    reference_urls TEXT,
-                    category_id INTEGER,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES category(id)
-                )
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='table'")
+        existing = {row[0]: row[1] or '' for row in cursor.fetchall()}
+        
+        # Indexes built with another tokenizer or without the end marker are rebuilt
+        missing = [table for table in FTS_COLUMNS
+                   if 'trigram' not in existing.get(f"{table}_fts", '')
+                   or f"{table}_fts_source" not in existing.get(f"{table}_fts", '')]
+        for table_name in missing:
+            fts_table = f"{table_name}_fts"
+            columns = FTS_COLUMNS[table_name]
+            column_list = ', '.join(columns)
+            new_values = ', '.join(f"new.{column} || char(31)" for column in columns)
+            old_values = ', '.join(f"old.{column} || char(31)" for column in columns)
+            
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts_table}_vocab")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+            cursor.execute(f"DROP VIEW IF EXISTS {fts_table}_source")
+            
+            # External-content index: text is stored once, in the base table
+            cursor.execute(f"""
+                CREATE VIEW {fts_table}_source AS
+                SELECT id, {', '.join(f"{column} || char(31) AS {column}" for column in columns)}
+                FROM {table_name}
             """)
-            
-            # 5. Insight (Insight Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS insight (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    source_people TEXT,
-                    keywords TEXT,
-                    source_app TEXT DEFAULT 'unknown',
-                    category_id INTEGER,
-                    reference_urls TEXT,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES category(id)
-                )
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE {fts_table}
+                USING fts5({column_list}, content='{fts_table}_source', content_rowid='id', tokenize='trigram')
             """)
-            
-            # 6. Focus (Focus Point Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS focus (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    priority INTEGER CHECK(priority >= 1 AND priority <= 10),
-                    status TEXT CHECK(status IN ('active', 'paused', 'completed')),
-                    context TEXT,
-                    keywords TEXT,
-                    source_app TEXT DEFAULT 'unknown',
-                    category_id INTEGER,
-                    deadline DATE,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES category(id)
-                )
+            cursor.execute(f"CREATE VIRTUAL TABLE {fts_table}_vocab USING fts5vocab({fts_table}, 'row')")
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table_name} BEGIN
+                    INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                END
             """)
-            
-            # 7. Goal (Goal Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS goal (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    type TEXT CHECK(type IN ('long_term', 'short_term', 'plan', 'todo')),
-                    deadline DATE,
-                    status TEXT CHECK(status IN ('planning', 'in_progress', 'completed', 'abandoned')),
-                    keywords TEXT,
-                    source_app TEXT DEFAULT 'unknown',
-                    category_id INTEGER,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES category(id)
-                )
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table_name} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                END
             """)
-            
-            # 8. Preference (Preference Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS preference (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    context TEXT,
-                    keywords TEXT,
-                    source_app TEXT DEFAULT 'unknown',
-                    category_id INTEGER,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES category(id)
-                )
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {table_name} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                END
             """)
-            
-            # 9. Methodology (Methodology Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS methodology (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    type TEXT,
-                    effectiveness TEXT CHECK(effectiveness IN ('proven', 'experimental', 'theoretical')),
-                    use_cases TEXT,
-                    keywords TEXT,
-                    source_app TEXT DEFAULT 'unknown',
-                    reference_urls TEXT,
-                    category_id INTEGER,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES category(id)
-                )
+            # Index rows that existed before the index was created
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    
+    def _create_keyword_index(self, cursor: sqlite3.Cursor):
+        """Create the record_keyword inverted index and the triggers that keep it in sync"""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='record_keyword'")
+        index_exists = cursor.fetchone() is not None
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS record_keyword (
+                table_name TEXT NOT NULL,
+                record_id INTEGER NOT NULL,
+                keyword TEXT NOT NULL,
+                PRIMARY KEY (table_name, keyword, record_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_record_keyword_record ON record_keyword(table_name, record_id)")
+        
+        for table_name in KEYWORD_TABLES:
+            # Keywords are stored normalized (trimmed, lower case); malformed JSON is ignored
+            def select_keywords(alias: str, source: str = '') -> str:
+                return f"""
+                    SELECT '{table_name}', {alias}.id, lower(trim(kw.value))
+                    FROM {source}json_each(CASE WHEN json_valid({alias}.keywords) THEN {alias}.keywords ELSE '[]' END) AS kw
+                    WHERE kw.type = 'text' AND trim(kw.value) != ''
+                """
+            
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table_name}_keyword_ai AFTER INSERT ON {table_name} BEGIN
+                    INSERT OR IGNORE INTO record_keyword(table_name, record_id, keyword) {select_keywords('new')};
+                END
             """)
-            
-            # 10. Prediction (Prediction Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS prediction (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    timeframe TEXT,
-                    basis TEXT,
-                    verification_status TEXT CHECK(verification_status IN ('pending', 'correct', 'incorrect', 'partial')),
-                    keywords TEXT,
-                    source_app TEXT DEFAULT 'unknown',
-                    reference_urls TEXT,
-                    category_id INTEGER,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES category(id)
-                )
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table_name}_keyword_ad AFTER DELETE ON {table_name} BEGIN
+                    DELETE FROM record_keyword WHERE table_name = '{table_name}' AND record_id = old.id;
+                END
             """)
-            
-            # 11. Memory (Memory Table)
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS memory (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    memory_type TEXT CHECK(memory_type IN ('experience', 'event', 'learning', 'interaction', 'achievement', 'mistake')),
-                    importance INTEGER CHECK(importance >= 1 AND importance <= 10),
-                    related_people TEXT,
-                    location TEXT,
-                    memory_date DATE,
-                    keywords TEXT,
-                    source_app TEXT DEFAULT 'unknown',
-                    reference_urls TEXT,
-                    category_id INTEGER,
-                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
-                    created_time TIMESTAMP,
-                    updated_time TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES category(id)
-                )
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table_name}_keyword_au AFTER UPDATE OF keywords ON {table_name} BEGIN
+                    DELETE FROM record_keyword WHERE table_name = '{table_name}' AND record_id = old.id;
+                    INSERT OR IGNORE INTO record_keyword(table_name, record_id, keyword) {select_keywords('new')};
+                END
             """)
             
-            self.connection.commit()
-            
-        except Exception as e:
-            self.connection.rollback()
-            raise
-    
-    def _create_indexes(self):
-        """Create indexes"""
-        try:
-            # Persona table indexes
-            self.cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_persona_id ON persona(id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_persona_privacy ON persona(privacy_level)")
-            
-            # Category table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_levels ON category(first_level, second_level)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_active ON category(is_active)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_category_privacy ON category(privacy_level)")
-            
-            # Relations table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_source ON relations(source_table, source_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_target ON relations(target_table, target_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_type ON relations(relation_type)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_privacy ON relations(privacy_level)")
-            
-            # Viewpoint table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_viewpoint_source_people ON viewpoint(source_people)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_viewpoint_source_app ON viewpoint(source_app)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_viewpoint_category ON viewpoint(category_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_viewpoint_privacy ON viewpoint(privacy_level)")
-            
-            # Insight table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_source_people ON insight(source_people)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_source_app ON insight(source_app)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_category ON insight(category_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_time ON insight(created_time)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_insight_privacy ON insight(privacy_level)")
-            
-            # Focus table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_priority ON focus(priority)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_status ON focus(status)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_deadline ON focus(deadline)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_category ON focus(category_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_focus_privacy ON focus(privacy_level)")
-            
-            # Goal table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_type ON goal(type)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_status ON goal(status)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_deadline ON goal(deadline)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_category ON goal(category_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_goal_privacy ON goal(privacy_level)")
-            
-            # Preference table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_preference_category ON preference(category_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_preference_privacy ON preference(privacy_level)")
-            
-            # Methodology table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_methodology_type ON methodology(type)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_methodology_effectiveness ON methodology(effectiveness)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_methodology_category ON methodology(category_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_methodology_privacy ON methodology(privacy_level)")
-            
-            # Prediction table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_timeframe ON prediction(timeframe)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_verification ON prediction(verification_status)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_category ON prediction(category_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_privacy ON prediction(privacy_level)")
-            
-            # Memory table indexes
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_type ON memory(memory_type)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_importance ON memory(importance)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_date ON memory(memory_date)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_category ON memory(category_id)")
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_privacy ON memory(privacy_level)")
-            
-            self.connection.commit()
-            
-        except Exception as e:
-            self.connection.rollback()
-            raise
+            if not index_exists:
+                # Index keywords of rows that existed before the index was created
+                cursor.execute(f"""
+                    INSERT OR IGNORE INTO record_keyword(table_name, record_id, keyword)
+                    {select_keywords(table_name, f'{table_name}, ')}
+                """)
     
-    def _init_default_data(self):
+    def _init_default_data(self, cursor: sqlite3.Cursor):
         """Initialize default data"""
-        try:
-            # Check if persona records already exist
-            self.cursor.execute("SELECT COUNT(*) FROM persona")
-            count = self.cursor.fetchone()[0]
-            
-            if count == 0:
-                # Insert default persona record (ID fixed as 1)
+        # Check if persona records already exist
+        cursor.execute("SELECT COUNT(*) FROM persona")
+        count = cursor.fetchone()[0]
+        
+        if count == 0:
+            # Insert default persona record (ID fixed as 1)
+            current_time = self._get_local_time()
+            cursor.execute("""
+                INSERT INTO persona (id, name, gender, personality, bio, privacy_level, created_time, updated_time)
+                VALUES (1, 'User', 'Not Set', 'To be improved', 'Personal profile to be improved', 'private', ?, ?)
+            """, (current_time, current_time))
+        
+        # Insert some default categories
+        default_categories = [
+            ('Technology', 'Programming Development', 'Software development related technologies'),
+            ('Technology', 'System Architecture', 'System design and architecture'),
+            ('Life', 'Interpersonal Relations', 'Interpersonal communication and relationship management'),
+            ('Life', 'Health Management', 'Physical and mental health'),
+            ('Business', 'Investment Finance', 'Investment and financial management'),
+            ('Business', 'Entrepreneurship Management', 'Entrepreneurship and enterprise management'),
+            ('Learning', 'Knowledge Management', 'Knowledge acquisition and management'),
+            ('Learning', 'Skill Development', 'Personal skill development')
+        ]
+        
+        for first_level, second_level, description in default_categories:
+            # Check if already exists
+            cursor.execute("""
+                SELECT COUNT(*) FROM category 
+                WHERE first_level = ? AND second_level = ?
+            """, (first_level, second_level))
+            
+            if cursor.fetchone()[0] == 0:
                 current_time = self._get_local_time()
-                self.cursor.execute("""
-                    INSERT INTO persona (id, name, gender, personality, bio, privacy_level, created_time, updated_time)
-                    VALUES (1, 'User', 'Not Set', 'To be improved', 'Personal profile to be improved', 'private', ?, ?)
-                """, (current_time, current_time))
-            
-            # Insert some default categories
-            default_categories = [
-                ('Technology', 'Programming Development', 'Software development related technologies'),
-                ('Technology', 'System Architecture', 'System design and architecture'),
-                ('Life', 'Interpersonal Relations', 'Interpersonal communication and relationship management'),
-                ('Life', 'Health Management', 'Physical and mental health'),
-                ('Business', 'Investment Finance', 'Investment and financial management'),
-                ('Business', 'Entrepreneurship Management', 'Entrepreneurship and enterprise management'),
-                ('Learning', 'Knowledge Management', 'Knowledge acquisition and management'),
-                ('Learning', 'Skill Development', 'Personal skill development')
-            ]
-            
-            for first_level, second_level, description in default_categories:
-                # Check if already exists
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM category 
-                    WHERE first_level = ? AND second_level = ?
-                """, (first_level, second_level))
-                
-                if self.cursor.fetchone()[0] == 0:
-                    current_time = self._get_local_time()
-                    self.cursor.execute("""
-                        INSERT INTO category (first_level, second_level, description, created_time, updated_time)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (first_level, second_level, description, current_time, current_time))
-            
-            self.connection.commit()
+                cursor.execute("""
+                    INSERT INTO category (first_level, second_level, description, created_time, updated_time)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (first_level, second_level, description, current_time, current_time))
+    
+    def _get_table_columns(self, table_name: str) -> List[str]:
+        """Get column names of a table (cached after first lookup)"""
+        if table_name not in self._table_columns:
+            with self._connections.read() as cursor:
+                cursor.execute(f"PRAGMA table_info({table_name})")
+                columns = [col[1] for col in cursor.fetchall()]
+            if not columns:
+                return columns
+            self._table_columns[table_name] = columns
+        return self._table_columns[table_name]
+    
+    def _prepare_fields(self, fields: Dict[str, Any], is_insert: bool) -> Dict[str, Any]:
+        """
+        Serialize JSON fields and fill timestamps before writing
+        
+        Args:
+            fields: Field values
+            is_insert: Whether fields belong to a new record
             
-        except Exception as e:
-            self.connection.rollback()
-            raise
+        Returns:
+            New dictionary ready to be bound to SQL parameters
+        """
+        fields = dict(fields)
+        
+        # Handle JSON fields
+        if 'keywords' in fields and isinstance(fields['keywords'], list):
+            fields['keywords'] = json.dumps(fields['keywords'], ensure_ascii=False)
+        if 'reference_urls' in fields and isinstance(fields['reference_urls'], list):
+            fields['reference_urls'] = json.dumps(fields['reference_urls'], ensure_ascii=False)
+        
+        current_time = self._get_local_time()
+        if is_insert:
+            # Automatically add creation time and update time (using local timezone)
+            if 'created_time' not in fields:
+                fields['created_time'] = current_time
+            if 'updated_time' not in fields:
+                fields['updated_time'] = current_time
+        else:
+            # Add update time (using local timezone)
+            fields['updated_time'] = current_time
+        
+        return fields
+    
+    def _validate_columns(self, table_name: str, fields: List[str]):
+        """Raise ValueError if any field is not a column of the table"""
+        columns = self._get_table_columns(table_name)
+        unknown = [field for field in fields if field not in columns]
+        if unknown:
+            raise ValueError(f"Unknown fields for table {table_name}: {unknown}")
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group several write operations into one transaction
+        
+        Writes issued inside the block (including insert_records/update_records) join it
+        and are committed together, or rolled back together on error.
+        """
+        outermost = getattr(self._local, 'changed_tables', None) is None
+        if outermost:
+            self._local.changed_tables = set()
+        try:
+            with self._connections.write() as cursor:
+                yield cursor
+        finally:
+            if outermost:
+                changed_tables = self._local.changed_tables
+                self._local.changed_tables = None
+                # Cached data is dropped once the transaction is over (committed or rolled back)
+                self._after_write(changed_tables)
+    
+    @contextmanager
+    def read_snapshot(self):
+        """
+        Borrow a reader cursor inside a read transaction
+        
+        All queries run in the block see the same point-in-time state of the database,
+        even while other connections keep writing.
+        """
+        with self._connections.read() as cursor:
+            started = not cursor.connection.in_transaction
+            if started:
+                cursor.execute("BEGIN")
+            try:
+                yield cursor
+            finally:
+                if started:
+                    cursor.execute("COMMIT")
+    
+    def _after_write(self, tables: Optional[List[str]] = None):
+        """
+        Invalidate cached data of tables changed by a write
+        
+        Args:
+            tables: Changed table names, None means any table may have changed
+        """
+        changed_tables = getattr(self._local, 'changed_tables', None)
+        if changed_tables is not None:
+            # Inside transaction(): readers cannot see the changes before it ends
+            changed_tables.update(self.tables if tables is None else tables)
+            return
+        
+        tables = list(self.tables) if tables is None else list(tables)
+        self._invalidate_tables(tables)
+        if self._connections.group_committer is not None:
+            # Readers may cache pre-write data until the deferred commit, drop it again then
+            with self._cache_lock:
+                self._uncommitted_tables.update(tables)
+    
+    def _invalidate_tables(self, tables):
+        """Bump table versions and drop their cached row counts"""
+        with self._cache_lock:
+            for table_name in tables:
+                self._table_versions[table_name] = self._table_versions.get(table_name, 0) + 1
+                self._row_counts.pop(table_name, None)
+    
+    def _check_external_changes(self):
+        """Drop all cached data when another process committed since the last check"""
+        external_commits = self._connections.external_change_count()
+        with self._cache_lock:
+            if external_commits == self._external_commits_seen:
+                return
+            self._external_commits_seen = external_commits
+            self.external_invalidations += 1
+        self._invalidate_tables(self.tables)
+    
+    def _get_table_version(self, table_name: str) -> int:
+        """Get the write version of a table (after picking up commits of other processes)"""
+        self._check_external_changes()
+        with self._cache_lock:
+            return self._table_versions.get(table_name, 0)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "record_cache": self._record_cache.get_stats(),
+            "query_cache": self._query_cache.get_stats(),
+            "external_invalidations": self.external_invalidations
+        }
+    
+    def _on_group_commit(self):
+        """Invalidate tables written since the previous group commit"""
+        with self._cache_lock:
+            tables = self._uncommitted_tables
+            self._uncommitted_tables = set()
+        self._invalidate_tables(tables)
+    
+    def _log_statement(self, cursor: sqlite3.Cursor, sql: str, params: Optional[List[Any]],
+                       seconds: float, rows: int):
+        """Pass a finished statement and the seconds it took to the slow query log"""
+        self.slow_queries.record(cursor.connection, sql, params, seconds * 1000, rows)
+    
+    def get_row_count(self, table_name: str) -> int:
+        """Get the number of rows in a table (cached until the table is written)"""
+        self._check_external_changes()
+        with self._cache_lock:
+            version = self._table_versions.get(table_name, 0)
+            if table_name in self._row_counts:
+                return self._row_counts[table_name]
+        
+        with self._connections.read() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            count = cursor.fetchone()[0]
+        
+        with self._cache_lock:
+            # Skip caching if a write happened while counting
+            if self._table_versions.get(table_name, 0) == version:
+                self._row_counts[table_name] = count
+        return count
     
     def insert_record(self, table_name: str, **kwargs) -> int:
         """
@@ -470,18 +895,7 @@ class ProfileDatabase:
             if table_name not in self.tables:
                 raise ValueError(f"Unknown table name: {table_name}")
             
-            # Handle JSON fields
-            if 'keywords' in kwargs and isinstance(kwargs['keywords'], list):
-                kwargs['keywords'] = json.dumps(kwargs['keywords'], ensure_ascii=False)
-            if 'reference_urls' in kwargs and isinstance(kwargs['reference_urls'], list):
-                kwargs['reference_urls'] = json.dumps(kwargs['reference_urls'], ensure_ascii=False)
-            
-            # Automatically add creation time and update time (using local timezone)
-            current_time = self._get_local_time()
-            if 'created_time' not in kwargs:
-                kwargs['created_time'] = current_time
-            if 'updated_time' not in kwargs:
-                kwargs['updated_time'] = current_time
+            kwargs = self._prepare_fields(kwargs, is_insert=True)
             
             # Build SQL statement
             fields = list(kwargs.keys())
@@ -493,13 +907,14 @@ class ProfileDatabase:
                 VALUES ({', '.join(placeholders)})
             """
             
-            self.cursor.execute(sql, values)
-            self.connection.commit()
+            with self._connections.write() as cursor:
+                cursor.execute(sql, values)
+                record_id = cursor.lastrowid
             
-            return self.cursor.lastrowid
+            self._after_write([table_name])
+            return record_id
             
         except Exception as e:
-            self.connection.rollback()
             raise
     
     def update_record(self, table_name: str, record_id: int, **kwargs) -> bool:
@@ -521,14 +936,7 @@ class ProfileDatabase:
             if not kwargs:
                 return True
             
-            # Handle JSON fields
-            if 'keywords' in kwargs and isinstance(kwargs['keywords'], list):
-                kwargs['keywords'] = json.dumps(kwargs['keywords'], ensure_ascii=False)
-            if 'reference_urls' in kwargs and isinstance(kwargs['reference_urls'], list):
-                kwargs['reference_urls'] = json.dumps(kwargs['reference_urls'], ensure_ascii=False)
-            
-            # Add update time (using local timezone)
-            kwargs['updated_time'] = self._get_local_time()
+            kwargs = self._prepare_fields(kwargs, is_insert=False)
             
             # Build SQL statement
             set_clauses = [f"{field} = ?" for field in kwargs.keys()]
@@ -540,13 +948,140 @@ class ProfileDatabase:
                 WHERE id = ?
             """
             
-            self.cursor.execute(sql, values)
-            self.connection.commit()
+            with self._connections.write() as cursor:
+                cursor.execute(sql, values)
+                updated = cursor.rowcount > 0
+            
+            self._after_write([table_name])
+            return updated
+            
+        except Exception as e:
+            raise
+    
+    def insert_records(self, table_name: str, rows: List[Dict[str, Any]], on_conflict: str = None) -> List[int]:
+        """
+        Insert multiple records in a single transaction
+        
+        Rows are grouped by their column set and each group is written with one executemany.
+        
+        Args:
+            table_name: Table name
+            rows: List of field value dictionaries
+            on_conflict: For rows with an existing id: None raises, 'update' overwrites the
+                         stored record, 'skip' keeps it
+            
+        Returns:
+            IDs of inserted records, in the same order as rows
+        """
+        try:
+            if table_name not in self.tables:
+                raise ValueError(f"Unknown table name: {table_name}")
+            
+            if on_conflict not in (None, 'update', 'skip'):
+                raise ValueError(f"Invalid on_conflict: {on_conflict}, supported: 'update', 'skip'")
+            
+            if not rows:
+                return []
+            
+            prepared_rows = [self._prepare_fields(row, is_insert=True) for row in rows]
+            
+            # Group row positions by column set
+            groups: Dict[Tuple[str, ...], List[int]] = {}
+            for index, row in enumerate(prepared_rows):
+                groups.setdefault(tuple(row.keys()), []).append(index)
+            
+            for fields in groups:
+                self._validate_columns(table_name, list(fields))
+            
+            record_ids: List[int] = [0] * len(prepared_rows)
+            with self._connections.write() as cursor:
+                for fields, indexes in groups.items():
+                    # Upserts update in place, so the FTS/keyword UPDATE triggers keep the indexes in sync
+                    conflict_sql = ""
+                    if 'id' in fields and on_conflict == 'update':
+                        updates = ', '.join(f"{field} = excluded.{field}" for field in fields if field != 'id')
+                        conflict_sql = f"ON CONFLICT(id) DO UPDATE SET {updates}" if updates else "ON CONFLICT(id) DO NOTHING"
+                    elif 'id' in fields and on_conflict == 'skip':
+                        conflict_sql = "ON CONFLICT(id) DO NOTHING"
+                    
+                    sql = f"""
+                        INSERT INTO {table_name} ({', '.join(fields)})
+                        VALUES ({', '.join(['?' for _ in fields])})
+                        {conflict_sql}
+                    """
+                    cursor.executemany(sql, [[prepared_rows[index][field] for field in fields] for index in indexes])
+                    
+                    if 'id' in fields:
+                        for index in indexes:
+                            record_ids[index] = prepared_rows[index]['id']
+                    else:
+                        # The writer holds the write lock, so rowids of one executemany are consecutive
+                        cursor.execute("SELECT last_insert_rowid()")
+                        last_id = cursor.fetchone()[0]
+                        first_id = last_id - len(indexes) + 1
+                        for position, index in enumerate(indexes):
+                            record_ids[index] = first_id + position
+            
+            self._after_write([table_name])
+            return record_ids
+            
+        except Exception as e:
+            raise
+    
+    def update_records(self, table_name: str, updates: List[Tuple[int, Dict[str, Any]]]) -> List[bool]:
+        """
+        Update multiple records in a single transaction
+        
+        Updates are grouped by their column set and each group is written with one executemany.
+        
+        Args:
+            table_name: Table name
+            updates: List of (record ID, field values to update) tuples
+            
+        Returns:
+            Whether each record existed and was updated, in the same order as updates
+        """
+        try:
+            if table_name not in self.tables:
+                raise ValueError(f"Unknown table name: {table_name}")
+            
+            if not updates:
+                return []
+            
+            prepared_updates = [(record_id, self._prepare_fields(fields, is_insert=False))
+                                for record_id, fields in updates]
             
-            return self.cursor.rowcount > 0
+            groups: Dict[Tuple[str, ...], List[int]] = {}
+            for index, (_, fields) in enumerate(prepared_updates):
+                groups.setdefault(tuple(fields.keys()), []).append(index)
+            
+            for fields in groups:
+                self._validate_columns(table_name, list(fields))
+            
+            record_ids = [record_id for record_id, _ in prepared_updates]
+            with self._connections.write() as cursor:
+                # Check existence in chunks to stay under SQLite's bound-parameter limit
+                existing_ids = set()
+                for start in range(0, len(record_ids), 500):
+                    chunk = record_ids[start:start + 500]
+                    cursor.execute(f"SELECT id FROM {table_name} WHERE id IN ({','.join(['?' for _ in chunk])})", chunk)
+                    existing_ids.update(row[0] for row in cursor.fetchall())
+                
+                for fields, indexes in groups.items():
+                    sql = f"""
+                        UPDATE {table_name}
+                        SET {', '.join(f"{field} = ?" for field in fields)}
+                        WHERE id = ?
+                    """
+                    cursor.executemany(sql, [
+                        [prepared_updates[index][1][field] for field in fields] + [prepared_updates[index][0]]
+                        for index in indexes
+                    ])
+            
+            self._after_write([table_name])
+            return [record_id in existing_ids for record_id in record_ids]
             
         except Exception as e:
-            self.connection.rollback()
             raise
     
     def delete_record(self, table_name: str, record_id: int) -> bool:
@@ -564,15 +1099,31 @@ class ProfileDatabase:
             if table_name not in self.tables:
                 raise ValueError(f"Unknown table name: {table_name}")
             
-            self.cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (record_id,))
-            self.connection.commit()
+            with self._connections.write() as cursor:
+                cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (record_id,))
+                deleted = cursor.rowcount > 0
             
-            return self.cursor.rowcount > 0
+            self._after_write([table_name])
+            return deleted
             
         except Exception as e:
-            self.connection.rollback()
             raise
     
+    def _decode_record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a row to a dictionary, parsing JSON fields"""
+        record = dict(row)
+        if 'keywords' in record and record['keywords']:
+            try:
+                record['keywords'] = json.loads(record['keywords'])
+            except:
+                record['keywords'] = []
+        if 'reference_urls' in record and record['reference_urls']:
+            try:
+                record['reference_urls'] = json.loads(record['reference_urls'])
+            except:
+                record['reference_urls'] = []
+        return record
+    
     def get_record(self, table_name: str, record_id: int) -> Optional[Dict[str, Any]]:
         """
         Get specified record
@@ -588,22 +1139,20 @@ class ProfileDatabase:
             if table_name not in self.tables:
                 raise ValueError(f"Unknown table name: {table_name}")
             
-            self.cursor.execute(f"SELECT * FROM {table_name} WHERE id = ?", (record_id,))
-            row = self.cursor.fetchone()
+            # Cached records are stamped with the table version, so any write to the table invalidates them
+            cache_key = (table_name, record_id)
+            version = self._get_table_version(table_name)
+            cached = self._record_cache.get(cache_key, version)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            
+            with self._connections.read() as cursor:
+                cursor.execute(f"SELECT * FROM {table_name} WHERE id = ?", (record_id,))
+                row = cursor.fetchone()
             
             if row:
-                result = dict(row)
-                # Parse JSON fields
-                if 'keywords' in result and result['keywords']:
-                    try:
-                        result['keywords'] = json.loads(result['keywords'])
-                    except:
-                        result['keywords'] = []
-                if 'reference_urls' in result and result['reference_urls']:
-                    try:
-                        result['reference_urls'] = json.loads(result['reference_urls'])
-                    except:
-                        result['reference_urls'] = []
+                result = self._decode_record(row)
+                self._record_cache.put(cache_key, copy.deepcopy(result), version)
                 return result
             
             return None
@@ -628,20 +1177,155 @@ class ProfileDatabase:
         Returns:
             (Record list, total record count) tuple
         """
+        page = self.query_page(table_name, filter_conditions, sort_by, sort_order, limit, offset)
+        return page['records'], page['total_count']
+    
+    def _expand_short_term(self, table_name: str, term: str) -> Optional[List[str]]:
+        """
+        Indexed trigrams starting with a two-character term
+        
+        Every occurrence of the term begins a trigram (values end with FTS_END_MARKER), so
+        matching any of them finds the same rows as LIKE '%term%'. Returns None when the index
+        cannot serve the term: it is not two characters long or begins more than
+        MAX_SHORT_TERM_EXPANSIONS trigrams.
+        """
+        if len(term) != TRIGRAM_MIN_LENGTH - 1:
+            return None
+        # The trigram tokenizer folds case
+        prefix = term.lower()
+        with self._connections.read() as cursor:
+            cursor.execute(
+                f"SELECT term FROM {table_name}_fts_vocab WHERE term >= ? AND term < ? LIMIT ?",
+                (prefix, prefix + '\U0010ffff', MAX_SHORT_TERM_EXPANSIONS + 1))
+            tokens = [row[0] for row in cursor.fetchall()]
+        if len(tokens) > MAX_SHORT_TERM_EXPANSIONS:
+            return None
+        return tokens
+    
+    def query_page(self, table_name: str, filter_conditions: Dict[str, Any] = None,
+                   sort_by: str = 'created_time', sort_order: str = 'desc',
+                   limit: int = 20, offset: int = 0, cursor: str = None,
+                   count_mode: str = 'exact', max_chars: int = None,
+                   record_size: Callable[[Dict[str, Any]], int] = None,
+                   fields: List[str] = None) -> Dict[str, Any]:
+        """
+        Query one page of records
+        
+        Args:
+            table_name: Table name
+            filter_conditions: Filter conditions dictionary
+            sort_by: Sort field
+            sort_order: Sort order ('asc' or 'desc')
+            limit: Limit of returned records
+            offset: Offset, ignored when cursor is given
+            cursor: next_cursor of the previous page; continues after its last record
+                    without scanning the skipped rows
+            count_mode: 'exact' counts all matching rows, 'estimate' stops counting filtered
+                        rows at ESTIMATE_COUNT_CAP, 'none' skips counting (total_count is None)
+            max_chars: Size budget of the page; records stop once their sizes add up to more,
+                       and next_cursor continues after the last returned record
+            record_size: Size of a decoded record in the unit of max_chars, JSON length in
+                         characters if None
+            fields: Columns to return (id is always included), all columns if None
+            
+        Filters ending in _match (e.g. content_match) and text_match (all indexed text
+        fields) use the FTS5 index; with such a filter, sort_by='relevance' orders by BM25.
+        Single-character terms are matched with LIKE and have no score.
+            
+        Returns:
+            Dictionary with records, total_count, total_count_exact (False when total_count
+            is a lower bound or unknown), next_cursor (None on the last page), truncated
+            (True when the only record did not fit max_chars and its content was shortened),
+            budget_too_small (True when not even a shortened first record fits max_chars; no
+            records are returned and next_cursor is the given cursor) and relevance_fallback (True when sort_by='relevance' had no indexed term to
+            score and records are ordered by created_time instead)
+        """
         try:
             if table_name not in self.tables:
                 raise ValueError(f"Unknown table name: {table_name}")
+            if count_mode not in COUNT_MODES:
+                raise ValueError(f"Invalid count mode: {count_mode}, supported modes: {list(COUNT_MODES)}")
+            
+            # sort_by and sort_order are interpolated into SQL, so only known values pass
+            sort_order = (sort_order or 'desc').lower()
+            if sort_order not in ('asc', 'desc'):
+                raise ValueError(f"Invalid sort order: {sort_order}, supported: 'asc', 'desc'")
+            if sort_by != 'relevance' and sort_by not in self._get_table_columns(table_name):
+                raise ValueError(f"Invalid sort field {sort_by} for table {table_name}")
+            requested_sort = [sort_by, sort_order]
+            
+            # Projection: only the requested columns are read and decoded
+            selected_fields = None
+            if fields:
+                self._validate_columns(table_name, list(fields))
+                selected_fields = ['id'] + [field for field in dict.fromkeys(fields) if field != 'id']
+            
+            # Repeated queries are answered from the result cache until the table is written
+            normalized_filters = json.dumps(
+                {key: value for key, value in (filter_conditions or {}).items() if value is not None},
+                sort_keys=True, ensure_ascii=False, default=str)
+            # Budgeted pages depend on the caller's size function and are not cached
+            cache_key = None
+            version = self._get_table_version(table_name)
+            if max_chars is None:
+                cache_key = (table_name, normalized_filters, sort_by, sort_order, int(limit), int(offset),
+                             cursor, count_mode, tuple(selected_fields) if selected_fields else None)
+                cached_page = self._query_cache.get(cache_key, version)
+                if cached_page is not None:
+                    return copy.deepcopy(cached_page)
+            else:
+                max_chars = int(max_chars)
+                if record_size is None:
+                    record_size = json_size
+            
+            position = None
+            if cursor:
+                position = decode_cursor(cursor)
+                if position['sort'] != requested_sort:
+                    raise ValueError("Pagination cursor was created for a different sort order")
             
             # Build WHERE clause
             where_clauses = []
             params = []
+            match_expressions = []
             
             if filter_conditions:
                 for key, value in filter_conditions.items():
                     if value is None:
                         continue
                         
-                    if key == 'ids':
+                    if key == 'text_match' or key.endswith('_match'):
+                        # Full-text search through the FTS5 index
+                        if table_name not in FTS_COLUMNS:
+                            raise ValueError(f"Table {table_name} has no full-text index")
+                        if key == 'text_match':
+                            match_columns = FTS_COLUMNS[table_name]
+                        else:
+                            match_columns = [key[:-len('_match')]]
+                            if match_columns[0] not in FTS_COLUMNS[table_name]:
+                                raise ValueError(f"Field {match_columns[0]} of table {table_name} is not full-text indexed")
+                        
+                        indexed_terms, short_terms = split_match_terms(value)
+                        if indexed_terms:
+                            terms = build_match_query(indexed_terms)
+                            if key == 'text_match':
+                                match_expressions.append(f"({terms})")
+                            else:
+                                match_expressions.append(f"{match_columns[0]} : ({terms})")
+                        for term in short_terms:
+                            tokens = self._expand_short_term(table_name, term)
+                            if tokens is None:
+                                # Single characters and very common pairs cannot use the index
+                                where_clauses.append(f"({' OR '.join(f'{field} LIKE ?' for field in match_columns)})")
+                                params.extend([f"%{term}%"] * len(match_columns))
+                            elif not tokens:
+                                # The term occurs in no indexed value
+                                where_clauses.append("0")
+                            elif key == 'text_match':
+                                match_expressions.append(build_any_match_query(tokens))
+                            else:
+                                match_expressions.append(f"{match_columns[0]} : {build_any_match_query(tokens)}")
+                    elif key == 'ids':
                         # ID list filtering
                         placeholders = ','.join(['?' for _ in value])
                         where_clauses.append(f"id IN ({placeholders})")
@@ -649,8 +1333,24 @@ class ProfileDatabase:
                     elif key.endswith('_contains'):
                         # Text contains filtering
                         field = key.replace('_contains', '')
-                        where_clauses.append(f"{field} LIKE ?")
-                        params.append(f"%{value}%")
+                        tokens = None
+                        if field in FTS_COLUMNS.get(table_name, []):
+                            tokens = self._expand_short_term(table_name, str(value))
+                        if field in FTS_COLUMNS.get(table_name, []) and len(str(value)) >= TRIGRAM_MIN_LENGTH:
+                            # Substring lookup served by the trigram index
+                            where_clauses.append(f"id IN (SELECT rowid FROM {table_name}_fts WHERE {field} LIKE ?)")
+                            params.append(f"%{value}%")
+                        elif tokens:
+                            # Two-character substring: rows with a trigram starting with it
+                            where_clauses.append(
+                                f"id IN (SELECT rowid FROM {table_name}_fts WHERE {table_name}_fts MATCH ?)")
+                            params.append(f"{field} : {build_any_match_query(tokens)}")
+                        elif tokens is not None:
+                            # The substring occurs in no indexed value
+                            where_clauses.append("0")
+                        else:
+                            where_clauses.append(f"{field} LIKE ?")
+                            params.append(f"%{value}%")
                     elif key.endswith('_in'):
                         # List filtering
                         field = key.replace('_in', '')
@@ -683,54 +1383,169 @@ class ProfileDatabase:
                         where_clauses.append(f"{field} <= ?")
                         params.append(value)
                     elif key == 'keywords_contain_any':
-                        # Keywords contain any one
-                        keyword_conditions = []
-                        for keyword in value:
-                            keyword_conditions.append("keywords LIKE ?")
-                            params.append(f'%"{keyword}"%')
-                        where_clauses.append(f"({' OR '.join(keyword_conditions)})")
+                        # Keywords contain any one (lookup in the record_keyword index)
+                        if not value:
+                            continue
+                        placeholders = ', '.join('lower(trim(?))' for _ in value)
+                        where_clauses.append(
+                            f"id IN (SELECT record_id FROM record_keyword WHERE table_name = ? AND keyword IN ({placeholders}))")
+                        params.append(table_name)
+                        params.extend(str(keyword) for keyword in value)
                     elif key == 'keywords_contain_all':
-                        # Keywords contain all
+                        # Keywords contain all (one index lookup per keyword)
                         for keyword in value:
-                            where_clauses.append("keywords LIKE ?")
-                            params.append(f'%"{keyword}"%')
+                            where_clauses.append(
+                                "id IN (SELECT record_id FROM record_keyword WHERE table_name = ? AND keyword = lower(trim(?)))")
+                            params.extend([table_name, str(keyword)])
+            
+            # Full-text matches join the FTS index, exposing its BM25 score as "relevance"
+            from_sql = table_name
+            if match_expressions:
+                fts_table = f"{table_name}_fts"
+                from_sql = f"""{table_name} JOIN (
+                    SELECT rowid AS fts_id, bm25({fts_table}) AS relevance
+                    FROM {fts_table} WHERE {fts_table} MATCH ?
+                ) AS fts ON fts.fts_id = {table_name}.id"""
+                params.insert(0, ' AND '.join(match_expressions))
+            
+            sort_key = f"{table_name}.{sort_by}"
+            relevance_fallback = False
+            if sort_by == 'relevance':
+                if not any(key == 'text_match' or key.endswith('_match') for key in (filter_conditions or {})):
+                    raise ValueError("sort_by='relevance' requires a full-text (_match) filter")
+                if match_expressions:
+                    # BM25 scores are lower for better matches
+                    sort_key = "fts.relevance"
+                    sort_order = 'asc' if sort_order == 'desc' else 'desc'
+                else:
+                    # Only unindexed terms were given, there is no score to rank by
+                    sort_key = f"{table_name}.created_time"
+                    relevance_fallback = True
+            id_key = f"{table_name}.id"
             
             # Build complete SQL
             where_sql = ""
             if where_clauses:
                 where_sql = f"WHERE {' AND '.join(where_clauses)}"
             
-            # Get total record count
-            count_sql = f"SELECT COUNT(*) FROM {table_name} {where_sql}"
-            self.cursor.execute(count_sql, params)
-            total_count = self.cursor.fetchone()[0]
-            
-            # Get records
-            order_sql = f"ORDER BY {sort_by} {sort_order.upper()}"
-            limit_sql = f"LIMIT {limit} OFFSET {offset}"
+            # Keyset pagination: continue after the (sort value, id) of the previous page
+            page_where_sql = where_sql
+            page_params = list(params)
+            if position is not None:
+                condition, condition_params = build_keyset_condition(
+                    sort_key, id_key, sort_order, position.get('value'), position['id'])
+                page_where_sql = f"WHERE {' AND '.join(where_clauses + [condition])}"
+                page_params.extend(condition_params)
+                offset = 0
+            
+            # id breaks ties so every row has a unique position for the next cursor
+            order_sql = f"ORDER BY {sort_key} {sort_order.upper()}, {id_key} {sort_order.upper()}"
+            limit = int(limit)
+            limit_sql = f"LIMIT {limit + 1 if limit >= 0 else -1} OFFSET {int(offset)}"
+            if selected_fields:
+                select_sql = ', '.join(f"{table_name}.{field}" for field in selected_fields)
+            else:
+                select_sql = f"{table_name}.*"
+            query_sql = (f"SELECT {select_sql}, {sort_key} AS _sort_value FROM {from_sql} "
+                         f"{page_where_sql} {order_sql} {limit_sql}")
             
-            query_sql = f"SELECT * FROM {table_name} {where_sql} {order_sql} {limit_sql}"
-            self.cursor.execute(query_sql, params)
+            filtered = bool(where_clauses or match_expressions)
+            total_count = None
+            total_count_exact = count_mode != 'none'
             
-            rows = self.cursor.fetchall()
             records = []
-            
-            for row in rows:
-                record = dict(row)
-                # Parse JSON fields
-                if 'keywords' in record and record['keywords']:
-                    try:
-                        record['keywords'] = json.loads(record['keywords'])
-                    except:
-                        record['keywords'] = []
-                if 'reference_urls' in record and record['reference_urls']:
-                    try:
-                        record['reference_urls'] = json.loads(record['reference_urls'])
-                    except:
-                        record['reference_urls'] = []
-                records.append(record)
-            
-            return records, total_count
+            last_sort_value = None
+            has_more = False
+            truncated = False
+            budget_too_small = False
+            used_chars = 0
+            
+            with self._connections.read() as db_cursor:
+                # Rows are decoded while they stream in, so a character budget ends the scan early.
+                # The query fetches one extra row, which tells whether another page exists.
+                # Only execute and fetch count towards the slow query log, not decoding the rows.
+                started = time.perf_counter()
+                db_cursor.execute(query_sql, page_params)
+                sql_seconds = time.perf_counter() - started
+                while True:
+                    started = time.perf_counter()
+                    row = db_cursor.fetchone()
+                    sql_seconds += time.perf_counter() - started
+                    if row is None:
+                        break
+                    if limit >= 0 and len(records) >= limit:
+                        has_more = True
+                        break
+                    
+                    record = self._decode_record(row)
+                    sort_value = record.pop('_sort_value')
+                    
+                    if max_chars is not None:
+                        size = record_size(record)
+                        if used_chars + size > max_chars:
+                            if records:
+                                has_more = True
+                                break
+                            # A single record larger than the whole budget is returned shortened
+                            record = truncate_record(record, record_size, max_chars)
+                            if record is None:
+                                # Not even the start of its content fits; the page stays before it
+                                budget_too_small = True
+                                has_more = True
+                                break
+                            truncated = True
+                            records.append(record)
+                            last_sort_value = sort_value
+                            has_more = db_cursor.fetchone() is not None
+                            break
+                        used_chars += size
+                    
+                    records.append(record)
+                    last_sort_value = sort_value
+                self._log_statement(db_cursor, query_sql, page_params, sql_seconds, len(records))
+                
+                # Get total record count (unfiltered counts come from the row count cache below)
+                if filtered and count_mode == 'exact':
+                    count_sql = f"SELECT COUNT(*) FROM {from_sql} {where_sql}"
+                    started = time.perf_counter()
+                    db_cursor.execute(count_sql, params)
+                    total_count = db_cursor.fetchone()[0]
+                    self._log_statement(db_cursor, count_sql, params, time.perf_counter() - started, 1)
+                elif filtered and count_mode == 'estimate':
+                    if position is None and not has_more and (records or not offset):
+                        # The whole result fits in this page
+                        total_count = int(offset) + len(records)
+                    else:
+                        count_sql = f"SELECT COUNT(*) FROM (SELECT 1 FROM {from_sql} {where_sql} LIMIT {ESTIMATE_COUNT_CAP})"
+                        started = time.perf_counter()
+                        db_cursor.execute(count_sql, params)
+                        total_count = db_cursor.fetchone()[0]
+                        self._log_statement(db_cursor, count_sql, params, time.perf_counter() - started, 1)
+                        total_count_exact = total_count < ESTIMATE_COUNT_CAP
+            
+            if not filtered and count_mode != 'none':
+                total_count = self.get_row_count(table_name)
+            
+            next_cursor = cursor if budget_too_small else None
+            if has_more and records:
+                next_cursor = encode_cursor({
+                    "sort": requested_sort,
+                    "value": last_sort_value,
+                    "id": records[-1]['id']
+                })
+            
+            page = {
+                "records": records,
+                "total_count": total_count,
+                "total_count_exact": total_count_exact,
+                "next_cursor": next_cursor,
+                "truncated": truncated,
+                "budget_too_small": budget_too_small,
+                "relevance_fallback": relevance_fallback
+            }
+            if cache_key is not None:
+                self._query_cache.put(cache_key, copy.deepcopy(page), version)
+            return page
             
         except Exception as e:
             raise
@@ -746,12 +1561,13 @@ class ProfileDatabase:
     def get_categories(self, first_level: str = None) -> List[Dict[str, Any]]:
         """Get category list"""
         try:
-            if first_level:
-                self.cursor.execute("SELECT * FROM category WHERE first_level = ? AND is_active = 1", (first_level,))
-            else:
-                self.cursor.execute("SELECT * FROM category WHERE is_active = 1")
-            
-            return [dict(row) for row in self.cursor.fetchall()]
+            with self._connections.read() as cursor:
+                if first_level:
+                    cursor.execute("SELECT * FROM category WHERE first_level = ? AND is_active = 1", (first_level,))
+                else:
+                    cursor.execute("SELECT * FROM category WHERE is_active = 1")
+                
+                return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             raise
     
@@ -775,19 +1591,20 @@ class ProfileDatabase:
                      relation_type: str = None) -> List[Dict[str, Any]]:
         """Get relationships"""
         try:
-            if relation_type:
-                self.cursor.execute("""
-                    SELECT * FROM relations 
-                    WHERE (source_table = ? AND source_id = ?) OR (target_table = ? AND target_id = ?)
-                    AND relation_type = ?
-                """, (table_name, record_id, table_name, record_id, relation_type))
-            else:
-                self.cursor.execute("""
-                    SELECT * FROM relations 
-                    WHERE (source_table = ? AND source_id = ?) OR (target_table = ? AND target_id = ?)
-                """, (table_name, record_id, table_name, record_id))
-            
-            return [dict(row) for row in self.cursor.fetchall()]
+            with self._connections.read() as cursor:
+                if relation_type:
+                    cursor.execute("""
+                        SELECT * FROM relations 
+                        WHERE (source_table = ? AND source_id = ?) OR (target_table = ? AND target_id = ?)
+                        AND relation_type = ?
+                    """, (table_name, record_id, table_name, record_id, relation_type))
+                else:
+                    cursor.execute("""
+                        SELECT * FROM relations 
+                        WHERE (source_table = ? AND source_id = ?) OR (target_table = ? AND target_id = ?)
+                    """, (table_name, record_id, table_name, record_id))
+                
+                return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             raise
     
@@ -830,39 +1647,38 @@ class ProfileDatabase:
                 if re.search(pattern, sql_upper):
                     raise ValueError(f"Prohibited potentially dangerous SQL operation: matching pattern {pattern}")
             
-            # Debug: print SQL statement (temporary)
-            print(f"DEBUG: SQL statement passed security check: {sql_upper[:100]}...")
-            
-            # Temporary: check for other issues
-            if 'UNION ALL' in sql_upper and len(sql_upper) > 500:
-                print(f"DEBUG: Detected long UNION query, length: {len(sql_upper)}")
-                # Allow to pass temporarily
-                pass
-            
-            self.cursor.execute(sql, params)
-            
-            result = {
-                "success": True,
-                "rowcount": self.cursor.rowcount,
-                "lastrowid": self.cursor.lastrowid,
-                "data": None
-            }
+            # Modification operations run in a write transaction, SELECT uses a pooled reader
+            is_write = sql_upper.startswith(('INSERT', 'UPDATE', 'DELETE'))
+            if is_write:
+                connection_context = self._connections.write()
+            else:
+                connection_context = self._connections.read()
             
-            if fetch_results and sql_upper.startswith('SELECT'):
-                rows = self.cursor.fetchall()
-                result["data"] = [dict(row) for row in rows]
-                result["count"] = len(result["data"])
+            with connection_context as cursor:
+                started = time.perf_counter()
+                cursor.execute(sql, params)
+                
+                result = {
+                    "success": True,
+                    "rowcount": cursor.rowcount,
+                    "lastrowid": cursor.lastrowid,
+                    "data": None
+                }
+                
+                if fetch_results and sql_upper.startswith('SELECT'):
+                    rows = cursor.fetchall()
+                    result["data"] = [dict(row) for row in rows]
+                    result["count"] = len(result["data"])
+                
+                self._log_statement(cursor, sql, params, time.perf_counter() - started, result.get("count", max(cursor.rowcount, 0)))
             
-            # If it's a modification operation, commit transaction
-            if sql_upper.startswith(('INSERT', 'UPDATE', 'DELETE')):
-                self.connection.commit()
+            if is_write:
+                # Custom SQL may touch any table
+                self._after_write()
             
             return result
             
         except Exception as e:
-            if sql.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
-                self.connection.rollback()
-            
             return {
                 "success": False,
                 "error": str(e),
@@ -887,8 +1703,9 @@ class ProfileDatabase:
                     raise ValueError(f"Unknown table name: {table_name}")
                 
                 # Get structure of specified table
-                self.cursor.execute(f"PRAGMA table_info({table_name})")
-                columns = self.cursor.fetchall()
+                with self._connections.read() as cursor:
+                    cursor.execute(f"PRAGMA table_info({table_name})")
+                    columns = cursor.fetchall()
                 
                 return {
                     "table_name": table_name,
@@ -908,8 +1725,9 @@ class ProfileDatabase:
                 # Get structure of all tables
                 schemas = {}
                 for table_name, description in self.tables.items():
-                    self.cursor.execute(f"PRAGMA table_info({table_name})")
-                    columns = self.cursor.fetchall()
+                    with self._connections.read() as cursor:
+                        cursor.execute(f"PRAGMA table_info({table_name})")
+                        columns = cursor.fetchall()
                     
                     schemas[table_name] = {
                         "description": description,
@@ -933,12 +1751,28 @@ class ProfileDatabase:
         except Exception as e:
             raise
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool and cache statistics"""
+        return {
+            "db_path": self.db_path,
+            "schema_version": self.schema_version,
+            "performance_preset": self.performance.get('preset', 'balanced'),
+            "connections": self._connections.get_stats() if self._connections else None,
+            "caches": self.get_cache_stats(),
+            "slow_queries": self.slow_queries.get_stats()
+        }
+    
+    def flush(self):
+        """Commit writes still pending in the write-behind queue"""
+        if self._connections:
+            self._connections.flush()
+    
     def close(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Close database connections (pending write-behind writes are committed first)"""
+        if self._connections:
+            self._connections.close()
+            self._connections = None
+            self.connection = None
     
     def __enter__(self):
         """Context manager entry"""
@@ -950,10 +1784,36 @@ class ProfileDatabase:
 
 # Global database instance
 _database_instance = None
+_database_lock = threading.Lock()
+_open_callbacks: List[Callable[[ProfileDatabase], None]] = []
+
+def on_database_open(callback: Callable[[ProfileDatabase], None]):
+    """Register a callback run once when the global database instance is opened"""
+    _open_callbacks.append(callback)
 
 def get_database() -> ProfileDatabase:
-    """Get database instance (singleton pattern)"""
+    """Get database instance (singleton pattern, created on first call)"""
     global _database_instance
     if _database_instance is None:
-        _database_instance = ProfileDatabase()
-    return _database_instance
\ No newline at end of file
+        opened = False
+        # The first tool calls may arrive concurrently on executor threads
+        with _database_lock:
+            if _database_instance is None:
+                _database_instance = ProfileDatabase()
+                opened = True
+        if opened:
+            for callback in _open_callbacks:
+                callback(_database_instance)
+    return _database_instance
+
+def get_open_database() -> Optional[ProfileDatabase]:
+    """Get the global database instance if it was already opened, without opening it"""
+    return _database_instance
+
+def close_database():
+    """Close the global database instance if it was opened (pending write-behind writes are committed)"""
+    global _database_instance
+    with _database_lock:
+        if _database_instance is not None:
+            _database_instance.close()
+            _database_instance = None
\ No newline at end of file
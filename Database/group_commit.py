@@ -0,0 +1,185 @@
+"""
+Group Commit Module
+
+Write-behind committer that lets bursts of writes share one COMMIT (and one fsync)
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+ACK_MODES = ('enqueue', 'commit')
+
+
+class GroupCommitter:
+    """
+    Background committer for the writer connection
+
+    Each write statement runs immediately inside a savepoint of a long-lived transaction,
+    so callers get real row IDs right away. The transaction is committed by a background
+    thread every flush_interval_ms, or as soon as max_batch_rows writes are pending.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, write_lock: threading.RLock,
+                 flush_interval_ms: int = 50, max_batch_rows: int = 200, ack_mode: str = 'commit',
+                 on_commit: Optional[Callable[[], None]] = None):
+        """
+        Initialize group committer
+
+        Args:
+            connection: Writer connection (isolation_level=None)
+            write_lock: Lock serializing access to the writer connection
+            flush_interval_ms: Maximum time a write stays uncommitted
+            max_batch_rows: Number of pending writes that forces an immediate commit
+            ack_mode: 'enqueue' returns once the statement ran, 'commit' waits until it is durable
+            on_commit: Called (under the write lock) after each commit or failed commit
+        """
+        if ack_mode not in ACK_MODES:
+            raise ValueError(f"Invalid ack_mode: {ack_mode}, supported modes: {list(ACK_MODES)}")
+
+        self.connection = connection
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_batch_rows = max(1, int(max_batch_rows))
+        self.ack_mode = ack_mode
+        self.on_commit = on_commit
+
+        self._write_lock = write_lock
+        self._state = threading.Condition(threading.Lock())
+        self._pending = 0
+        self._first_pending_at: Optional[float] = None
+        self._generation = 0  # Number of completed commits
+        self._failed: Dict[int, BaseException] = {}
+        self._stopped = False
+
+        # Statistics
+        self.commits = 0
+        self.committed_writes = 0
+
+        self._thread = threading.Thread(target=self._run, name="userbank-group-commit", daemon=True)
+        self._thread.start()
+
+    def record_write(self) -> int:
+        """
+        Register a write that just ran on the writer connection (caller holds the write lock)
+
+        Returns:
+            Commit generation that will make the write durable
+        
+        Raises:
+            sqlite3.ProgrammingError: The committer was closed, the write will not be committed
+        """
+        with self._state:
+            if self._stopped:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            self._pending += 1
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+            target_generation = self._generation + 1
+            batch_full = self._pending >= self.max_batch_rows
+            self._state.notify_all()
+
+        if batch_full:
+            self.flush()
+        return target_generation
+
+    def wait_for(self, generation: int, timeout: Optional[float] = None):
+        """Block until the given commit generation completed, re-raising its commit error"""
+        with self._state:
+            if not self._state.wait_for(lambda: self._generation >= generation or self._stopped, timeout):
+                raise TimeoutError(f"Timed out waiting for group commit {generation}")
+            if self._generation < generation:
+                raise sqlite3.ProgrammingError("Database was closed before the write was committed")
+            error = self._failed.get(generation)
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """Commit all pending writes now"""
+        with self._write_lock:
+            with self._state:
+                pending = self._pending
+            if pending == 0:
+                return
+
+            error = None
+            try:
+                if self.connection.in_transaction:
+                    self.connection.commit()
+            except BaseException as e:
+                error = e
+                print(f"Group commit of {pending} writes failed: {e}", file=sys.stderr)
+                try:
+                    self.connection.rollback()
+                except sqlite3.Error:
+                    pass
+
+            with self._state:
+                self._generation += 1
+                if error is not None:
+                    self._failed[self._generation] = error
+                    # Keep only recent failures for waiters that have not checked yet
+                    for generation in [g for g in self._failed if g < self._generation - 100]:
+                        del self._failed[generation]
+                else:
+                    self.commits += 1
+                    self.committed_writes += pending
+                self._pending = 0
+                self._first_pending_at = None
+                self._state.notify_all()
+
+            if self.on_commit is not None:
+                self.on_commit()
+
+    def abort(self, error: BaseException):
+        """Fail all pending writes after SQLite rolled back the shared transaction"""
+        with self._state:
+            if self._pending == 0:
+                return
+            self._generation += 1
+            self._failed[self._generation] = error
+            self._pending = 0
+            self._first_pending_at = None
+            self._state.notify_all()
+
+    def _run(self):
+        """Background loop committing pending writes once they are flush_interval old"""
+        while True:
+            with self._state:
+                self._state.wait_for(lambda: self._pending > 0 or self._stopped)
+                if self._stopped:
+                    return
+                delay = self._first_pending_at + self.flush_interval - time.monotonic()
+                if delay > 0:
+                    # Wakes early on close() and on new writes, then re-checks what is due
+                    self._state.wait(delay)
+                    continue
+
+            try:
+                self.flush()
+            except sqlite3.ProgrammingError:
+                # Connection was closed underneath us
+                return
+
+    def close(self):
+        """Flush pending writes and stop the background thread"""
+        # Under the write lock no write can be recorded between the last flush and the stop
+        with self._write_lock:
+            self.flush()
+            with self._state:
+                self._stopped = True
+                self._state.notify_all()
+        self._thread.join(timeout=max(1.0, self.flush_interval * 2))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get group commit statistics"""
+        with self._state:
+            return {
+                "ack_mode": self.ack_mode,
+                "flush_interval_ms": int(self.flush_interval * 1000),
+                "max_batch_rows": self.max_batch_rows,
+                "pending_writes": self._pending,
+                "commits": self.commits,
+                "committed_writes": self.committed_writes
+            }
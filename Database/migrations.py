@@ -0,0 +1,94 @@
+"""
+Schema Migration Module
+
+Versions the database schema with PRAGMA user_version. Each migration upgrades the schema
+by one version; all pending migrations run in a single write transaction together with the
+user_version update, so a database is never left half migrated.
+
+Migrations must be idempotent: databases created before schema versioning start at
+user_version 0 and replay every step against tables that may already exist.
+"""
+
+import sqlite3
+import sys
+from typing import TYPE_CHECKING, Callable, List, NamedTuple
+
+if TYPE_CHECKING:
+    from .database import ProfileDatabase
+
+
+class Migration(NamedTuple):
+    """One schema upgrade step"""
+    version: int
+    description: str
+    apply: Callable[['ProfileDatabase', sqlite3.Cursor], None]
+
+
+def _base_schema(db: 'ProfileDatabase', cursor: sqlite3.Cursor):
+    """Tables, indexes and default data"""
+    db._create_tables(cursor)
+    db._create_indexes(cursor)
+    db._init_default_data(cursor)
+
+
+def _fts_indexes(db: 'ProfileDatabase', cursor: sqlite3.Cursor):
+    """Trigram FTS5 indexes"""
+    db._create_fts_indexes(cursor)
+
+
+def _keyword_index(db: 'ProfileDatabase', cursor: sqlite3.Cursor):
+    """record_keyword inverted index"""
+    db._create_keyword_index(cursor)
+
+
+def _created_time_indexes(db: 'ProfileDatabase', cursor: sqlite3.Cursor):
+    """Indexes for the default created_time sort order (id is implied as the rowid tiebreaker)"""
+    for table_name in ('viewpoint', 'focus', 'goal', 'preference', 'methodology', 'prediction', 'memory'):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_created ON {table_name}(created_time)")
+
+
+# Ordered list of all migrations; append new steps with the next version number
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Create tables, indexes and default data", _base_schema),
+    Migration(2, "Create trigram full-text indexes", _fts_indexes),
+    Migration(3, "Create keyword inverted index", _keyword_index),
+    Migration(4, "Index created_time of main data tables", _created_time_indexes),
+    Migration(5, "Rebuild full-text indexes with end markers for two-character terms", _fts_indexes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(cursor: sqlite3.Cursor) -> int:
+    """Get the schema version stored in the database header"""
+    return cursor.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(db: 'ProfileDatabase') -> int:
+    """
+    Bring the database schema up to SCHEMA_VERSION
+
+    Args:
+        db: Database whose connections are open
+
+    Returns:
+        Schema version after migration
+    """
+    with db._connections.read() as cursor:
+        version = get_schema_version(cursor)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    with db._connections.write() as cursor:
+        # Another process may have migrated between the check and the write lock
+        version = get_schema_version(cursor)
+        for migration in MIGRATIONS:
+            if migration.version > version:
+                migration.apply(db, cursor)
+                print(f"Applied schema migration {migration.version}: {migration.description}", file=sys.stderr)
+        if version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # Schema changes must be visible to reader connections right away
+    db._connections.flush()
+    return max(version, SCHEMA_VERSION)
@@ -0,0 +1,123 @@
+"""
+Slow Query Log Module
+
+Records statements slower than a threshold together with their parameters, duration,
+row count and EXPLAIN QUERY PLAN output, in a ring buffer and optionally a JSON-lines file
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Longer string parameters are shortened in log entries
+MAX_PARAM_LENGTH = 200
+
+
+def is_full_scan(plan: Sequence[str]) -> bool:
+    """Check whether a query plan scans a whole table without an index"""
+    return any(step.startswith('SCAN ') and ' USING ' not in step and 'VIRTUAL TABLE' not in step
+               for step in plan)
+
+
+class SlowQueryLog:
+    """Thread-safe slow statement log"""
+
+    def __init__(self, threshold_ms: float = 100, max_entries: int = 200, log_file: Optional[str] = None,
+                 explain: bool = True, enabled: bool = True):
+        """
+        Initialize slow query log
+
+        Args:
+            threshold_ms: Statements taking at least this long are recorded
+            max_entries: Size of the in-memory ring buffer
+            log_file: JSON-lines file every entry is appended to, None keeps entries in memory only
+            explain: Capture EXPLAIN QUERY PLAN output for recorded statements
+            enabled: Record slow statements at all
+        """
+        self.threshold_ms = float(threshold_ms)
+        self.log_file = Path(log_file) if log_file else None
+        self.explain = explain
+        self.enabled = enabled
+        self._entries: "deque[Dict[str, Any]]" = deque(maxlen=max(1, int(max_entries)))
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.recorded = 0
+
+    def record(self, connection: sqlite3.Connection, sql: str, params: Optional[Sequence[Any]],
+               duration_ms: float, rows: int):
+        """
+        Record a statement if it was slow
+
+        Called right after the statement finished, on the connection that ran it, so the
+        captured plan matches the one SQLite used.
+        """
+        if not self.enabled or duration_ms < self.threshold_ms:
+            return
+
+        plan = None
+        plan_error = None
+        if self.explain:
+            try:
+                # Plan rows are (id, parent, notused, detail); nesting is shown by indentation
+                depth = {0: -1}
+                plan = []
+                for plan_id, parent, _, detail in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params or []):
+                    depth[plan_id] = depth.get(parent, -1) + 1
+                    plan.append('  ' * depth[plan_id] + detail)
+            except sqlite3.Error as e:
+                plan, plan_error = None, str(e)
+
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "rows": rows,
+            "sql": ' '.join(sql.split()),
+            "params": [value[:MAX_PARAM_LENGTH] + '…' if isinstance(value, str) and len(value) > MAX_PARAM_LENGTH
+                       else value for value in (params or [])],
+            "plan": plan,
+            "full_scan": is_full_scan([step.strip() for step in plan]) if plan else None
+        }
+        if plan_error:
+            entry["plan_error"] = plan_error
+
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+            if self.log_file is not None:
+                try:
+                    self.log_file.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.log_file, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+                except OSError as e:
+                    print(f"Failed to write slow query log: {e}", file=sys.stderr)
+
+    def get_entries(self, limit: Optional[int] = None, full_scan_only: bool = False) -> List[Dict[str, Any]]:
+        """Get recorded statements, newest first"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        if full_scan_only:
+            entries = [entry for entry in entries if entry["full_scan"]]
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        """Remove all entries from the ring buffer (the log file is kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get slow query log settings and counters"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "threshold_ms": self.threshold_ms,
+                "recorded": self.recorded,
+                "buffered": len(self._entries),
+                "max_entries": self._entries.maxlen,
+                "log_file": str(self.log_file) if self.log_file else None
+            }
@@ -0,0 +1,120 @@
+"""
+Server Cold-Start Benchmark
+
+Spawns the stdio MCP server the way a client does and measures:
+- import: time to import the tools package in a fresh interpreter
+- initialize: time until the server answers the MCP initialize request
+- list_tools: time until the first tools/list response (time-to-first-list_tools)
+- first_call: time until the first tool call returns (includes opening the database)
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--server main.py] [--command "path/to/userbank"]
+
+--command benchmarks a PyInstaller build (or any other stdio server executable) instead of
+running the server script with the current interpreter.
+"""
+
+import argparse
+import json
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+PROTOCOL_VERSION = "2024-11-05"
+
+
+def measure_import() -> float:
+    """Seconds a fresh interpreter needs to import the tools package"""
+    code = "import time; start = time.perf_counter(); import tools; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def send(process: subprocess.Popen, message: dict):
+    """Write one JSON-RPC message to the server"""
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+
+
+def wait_for(process: subprocess.Popen, request_id: int) -> dict:
+    """Read server output until the response with the given id arrives"""
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Server exited before answering request {request_id}: {process.stderr.read()[-2000:]}")
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            # Startup banners printed by the server
+            continue
+        if isinstance(message, dict) and message.get("id") == request_id:
+            return message
+
+
+def measure_session(command: list) -> dict:
+    """Run one client session against a freshly started server, returning timings in seconds"""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True, bufsize=1)
+    try:
+        send(process, {
+            "jsonrpc": "2.0", "id": 1, "method": "initialize",
+            "params": {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "1.0"}
+            }
+        })
+        wait_for(process, 1)
+        initialize = time.perf_counter() - start
+
+        send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = wait_for(process, 2)
+        list_tools = time.perf_counter() - start
+
+        send(process, {
+            "jsonrpc": "2.0", "id": 3, "method": "tools/call",
+            "params": {"name": "get_database_stats", "arguments": {}}
+        })
+        wait_for(process, 3)
+        first_call = time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+
+    return {
+        "initialize": initialize,
+        "list_tools": list_tools,
+        "first_call": first_call,
+        "tool_count": len(tools.get("result", {}).get("tools", []))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure MCP server cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--server", default="main.py", help="Server script, relative to the repository root")
+    parser.add_argument("--command", help="Server command line, overrides --server")
+    args = parser.parse_args()
+
+    command = shlex.split(args.command) if args.command else [sys.executable, str(ROOT / args.server)]
+
+    imports = [measure_import() for _ in range(args.runs)]
+    sessions = [measure_session(command) for _ in range(args.runs)]
+
+    print(f"Server: {' '.join(command)} ({sessions[0]['tool_count']} tools), {args.runs} runs")
+    print(f"{'phase':>12} {'median ms':>10} {'min ms':>10}")
+    rows = [("import", imports)] + [(phase, [s[phase] for s in sessions])
+                                    for phase in ("initialize", "list_tools", "first_call")]
+    for phase, timings in rows:
+        print(f"{phase:>12} {statistics.median(timings) * 1000:>10.1f} {min(timings) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
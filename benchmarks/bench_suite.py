@@ -0,0 +1,287 @@
+"""
+Database and Tools Benchmark Suite
+
+Fills a scratch database with synthetic data (see synthetic_data.py) and times:
+- insert_record: single-row inserts into every main data table
+- query_records: every table with each filter family (unfiltered, _contains, text_match,
+  _in, keywords any/all, date ranges)
+- generate_prompt_content: rendering query results with a tool template
+- tools: PersonaTools.get_persona and every *Tools.query_* method
+
+Results are printed and written as JSON. Pass a previous result file with --compare to
+list cases that got slower or faster, e.g. between two versions:
+
+Usage:
+    python benchmarks/bench_suite.py [--scale 10k|100k|1m|<rows>] [--output results.json]
+                                     [--db scratch.db] [--repeat N] [--compare baseline.json]
+
+The record and query result caches are disabled so every call reaches SQLite; pass --cache
+to measure with the configured caches instead. Without --db the scratch database is created
+in a temporary directory and removed afterwards; an existing --db file is reused as is.
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_templates import MEMORY_TEMPLATE
+from synthetic_data import SCALES, MAIN_TABLES, SyntheticDataGenerator, populate
+
+from Database.database import ProfileDatabase
+from tools import (
+    FocusTools, GoalTools, InsightTools, MemoryTools, MethodologyTools, PersonaTools,
+    PredictionTools, PreferenceTools, ViewpointTools, generate_prompt_content
+)
+
+RESULT_FORMAT = "userbank-bench"
+RESULT_VERSION = 1
+
+# Filter families run against every table where the columns exist
+COMMON_FILTERS = {
+    'unfiltered': {},
+    'contains': {'content_contains': 'review'},
+    'contains_cjk': {'content_contains': '复盘'},
+    'text_match': {'text_match': 'database'},
+    'keywords_any': {'keywords_contain_any': ['python', '阅读']},
+    'keywords_all': {'keywords_contain_all': ['work', 'team']},
+    'created_range': {'created_time_from': '2024-01-01', 'created_time_to': '2024-03-31'}
+}
+
+# Table specific _in and date range filters
+TABLE_FILTERS = {
+    'memory': {
+        'in': {'memory_type_in': ['event', 'achievement']},
+        'date_range': {'memory_date_from': '2024-01-01', 'memory_date_to': '2024-03-31'}
+    },
+    'goal': {
+        'in': {'status_in': ['planning', 'in_progress']},
+        'date_range': {'deadline_from': '2025-01-01', 'deadline_to': '2025-03-31'}
+    },
+    'focus': {
+        'in': {'status_in': ['active', 'paused']},
+        'date_range': {'deadline_from': '2025-01-01', 'deadline_to': '2025-03-31'}
+    },
+    'methodology': {'in': {'effectiveness_in': ['proven', 'experimental']}},
+    'prediction': {'in': {'verification_status_in': ['pending', 'partial']}},
+    'viewpoint': {'in': {'source_app_in': ['claude', 'cursor']}},
+    'insight': {'in': {'source_app_in': ['claude', 'cursor']}},
+    'preference': {'in': {'context_in': ['work', '学习']}}
+}
+
+# Tool query methods with a filter accepted by each of them
+TOOL_QUERIES = [
+    (MemoryTools, 'query_memories', {'keywords_contain_any': ['python', '阅读'], 'importance_gte': 5}),
+    (ViewpointTools, 'query_viewpoints', {'keywords_contain_any': ['work']}),
+    (InsightTools, 'query_insights', {'content_contains': 'review'}),
+    (GoalTools, 'query_goals', {'status_in': ['planning', 'in_progress']}),
+    (PreferenceTools, 'query_preferences', {'context_contains': 'work'}),
+    (MethodologyTools, 'query_methodologies', {'effectiveness_is': 'proven'}),
+    (FocusTools, 'query_focuses', {'status_in': ['active'], 'priority_gte': 7}),
+    (PredictionTools, 'query_predictions', {'verification_status_is': 'pending'})
+]
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Median, minimum and 95th percentile of timings in milliseconds"""
+    timings = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "min_ms": round(timings[0], 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        "runs": len(timings)
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run func once to warm up, then time it repeat times"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+
+def git_commit() -> Optional[str]:
+    """Commit hash of the benchmarked tree, None outside a git checkout"""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent.parent,
+                                capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_inserts(db: ProfileDatabase, count: int, seed: int) -> List[Dict[str, Any]]:
+    """Time single-row insert_record calls per main data table"""
+    generator = SyntheticDataGenerator(seed + 1)
+    results = []
+    for table_name in MAIN_TABLES:
+        make_row = getattr(generator, table_name)
+        rows = [make_row() for _ in range(count)]
+        timings = []
+        for row in rows:
+            start = time.perf_counter()
+            db.insert_record(table_name, **row)
+            timings.append((time.perf_counter() - start) * 1000)
+        results.append({"group": "insert_record", "name": table_name, **summarize(timings)})
+    return results
+
+
+def bench_queries(db: ProfileDatabase, repeat: int) -> List[Dict[str, Any]]:
+    """Time query_records for every table and filter family"""
+    results = []
+    for table_name in db.tables:
+        columns = set(db._get_table_columns(table_name))
+        cases = {
+            family: conditions for family, conditions in COMMON_FILTERS.items()
+            if not conditions or ('content' in columns and 'keywords' in columns)
+        }
+        cases.update(TABLE_FILTERS.get(table_name, {}))
+        for family, conditions in cases.items():
+            _, total = db.query_records(table_name, dict(conditions), limit=20)
+            timing = measure(lambda: db.query_records(table_name, dict(conditions), limit=20), repeat)
+            results.append({"group": "query_records", "name": f"{table_name}.{family}", "matches": total, **timing})
+    return results
+
+
+def bench_rendering(db: ProfileDatabase, repeat: int) -> List[Dict[str, Any]]:
+    """Time generate_prompt_content on stored memory records"""
+    results = []
+    for count in (20, 100):
+        records, _ = db.query_records('memory', limit=count)
+        timing = measure(lambda: generate_prompt_content(MEMORY_TEMPLATE, records), repeat)
+        results.append({"group": "generate_prompt_content", "name": f"memory.{count}_records", **timing})
+    return results
+
+
+def bench_tools(db: ProfileDatabase, repeat: int) -> List[Dict[str, Any]]:
+    """Time PersonaTools.get_persona and every *Tools.query_* method"""
+    persona_tools = PersonaTools(database=db)
+    results = [{"group": "tools", "name": "get_persona", **measure(persona_tools.get_persona, repeat)}]
+    for tool_class, method_name, filter_dict in TOOL_QUERIES:
+        method = getattr(tool_class(database=db), method_name)
+        results.append({"group": "tools", "name": f"{method_name}.default", **measure(method, repeat)})
+        results.append({
+            "group": "tools",
+            "name": f"{method_name}.filtered",
+            **measure(lambda: method(filter=dict(filter_dict)), repeat)
+        })
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float):
+    """Print cases whose median changed by more than threshold (a fraction) against a baseline file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(entry["group"], entry["name"]): entry["median_ms"] for entry in baseline.get("results", [])}
+
+    changes = []
+    for entry in results:
+        before = previous.get((entry["group"], entry["name"]))
+        if before:
+            ratio = entry["median_ms"] / before
+            if abs(ratio - 1) > threshold:
+                changes.append((ratio, entry, before))
+
+    print(f"\nCompared with {baseline_path} ({baseline.get('git_commit') or 'unknown commit'}, "
+          f"scale {baseline.get('scale')}), changes above {threshold:.0%}:")
+    if not changes:
+        print("  none")
+    for ratio, entry, before in sorted(changes, key=lambda change: change[0], reverse=True):
+        label = "slower" if ratio > 1 else "faster"
+        print(f"  {entry['group']:>24} {entry['name']:<36} {before:>9.3f} -> {entry['median_ms']:>9.3f} ms "
+              f"({ratio:.2f}x {label})")
+
+
+def run(args, db_path: str) -> Dict[str, Any]:
+    """Populate (if needed) and benchmark the database at db_path"""
+    total_rows = SCALES.get(args.scale.lower()) or int(args.scale)
+    existing = Path(db_path).exists()
+
+    cache_settings = {} if args.cache else {"record_cache_size": 0, "query_cache_entries": 0}
+    db = ProfileDatabase(db_path=db_path, write_behind={"enabled": False},
+                         slow_query={"enabled": False}, **cache_settings)
+    try:
+        populate_seconds = None
+        if existing:
+            print(f"Reusing {db_path}", file=sys.stderr)
+        else:
+            print(f"Populating {db_path} with {total_rows} rows...", file=sys.stderr)
+            start = time.perf_counter()
+            populate(db, total_rows, seed=args.seed)
+            populate_seconds = round(time.perf_counter() - start, 3)
+        row_counts = {table_name: db.get_row_count(table_name) for table_name in db.tables}
+
+        results = []
+        results += bench_queries(db, args.repeat)
+        results += bench_rendering(db, args.repeat)
+        results += bench_tools(db, args.repeat)
+        results += bench_inserts(db, args.inserts, args.seed)
+    finally:
+        db.close()
+
+    return {
+        "format": RESULT_FORMAT,
+        "version": RESULT_VERSION,
+        "created_time": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "scale": None if existing else args.scale,
+        "seed": args.seed,
+        "settings": {"repeat": args.repeat, "inserts": args.inserts, "cache": args.cache},
+        "populate_seconds": populate_seconds,
+        "row_counts": row_counts,
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark database queries, inserts and tools on synthetic data")
+    parser.add_argument("--scale", default="10k", help="10k, 100k, 1m or a row count")
+    parser.add_argument("--db", help="Scratch database file, kept after the run (default: temporary file)")
+    parser.add_argument("--output", default="bench_results.json", help="JSON result file")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per read case")
+    parser.add_argument("--inserts", type=int, default=200, help="insert_record calls per table")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cache", action="store_true", help="Keep the record and query caches enabled")
+    parser.add_argument("--compare", help="Previous result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change reported by --compare")
+    args = parser.parse_args()
+
+    if args.db:
+        report = run(args, args.db)
+    else:
+        with tempfile.TemporaryDirectory(prefix="userbank-bench-") as directory:
+            report = run(args, str(Path(directory) / "bench.db"))
+
+    print(f"Scale {report['scale'] or 'existing database'}: {sum(report['row_counts'].values())} rows"
+          + (f", populated in {report['populate_seconds']} s" if report['populate_seconds'] else ""))
+    print(f"{'group':>24} {'case':<36} {'median ms':>10} {'p95 ms':>10}")
+    for entry in report["results"]:
+        print(f"{entry['group']:>24} {entry['name']:<36} {entry['median_ms']:>10.3f} {entry['p95_ms']:>10.3f}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(report["results"], args.compare, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Prompt Template Rendering Benchmark
+
+Compares the compiled template renderer with the previous str.replace based implementation.
+
+Usage:
+    python benchmarks/bench_templates.py [record counts...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.base import compile_template, generate_prompt_content
+
+MEMORY_TEMPLATE = """# User Memory Data
+
+The following are user memory records retrieved based on your query criteria:
+
+{{#each raw_data}}
+## Memory Record (ID: {{this.id}})
+- **Core Content (content)**: {{this.content}}
+- **Memory Type (memory_type)**: {{this.memory_type}}
+- **Importance Level (importance)**: {{this.importance}} (1-10, 10 is most important)
+- **Related People (related_people)**: {{this.related_people}}
+- **Location (location)**: {{this.location}}
+- **Memory Date (memory_date)**: {{this.memory_date}}
+- **Keywords (keywords)**: {{this.keywords}}
+- **Source App (source_app)**: {{this.source_app}}
+- **Reference URLs (reference_urls)**: {{this.reference_urls}}
+- **Privacy Level (privacy_level)**: {{this.privacy_level}}
+- **Created Time (created_time)**: {{this.created_time}}
+- **Updated Time (updated_time)**: {{this.updated_time}}
+---
+{{/each}}
+
+{{#if (eq raw_data.length 0)}}
+No memory records found matching the criteria.
+{{/if}}
+
+**Query Summary:**
+- Total {{total_count}} related records found.
+- Currently displaying {{raw_data.length}} records."""
+
+
+def legacy_generate_prompt_content(template, data):
+    """Previous implementation: one full-template str.replace per record field"""
+    content_parts = []
+    for item in data:
+        item_content = template
+        for key, value in item.items():
+            item_content = item_content.replace(f"{{{{this.{key}}}}}", str(value) if value is not None else "")
+        content_parts.append(item_content)
+
+    result = template.replace("{{#each raw_data}}", "").replace("{{/each}}", "\n".join(content_parts))
+    result = result.replace("{{#if (eq raw_data.length 0)}}", "").replace("{{/if}}", "")
+    result = result.replace("{{total_count}}", str(len(data)))
+    return result.replace("{{raw_data.length}}", str(len(data)))
+
+
+def make_records(count):
+    """Build synthetic memory records"""
+    return [
+        {
+            "id": i,
+            "content": f"Memory {i}: finished the quarterly review and planned the next milestones with the team",
+            "memory_type": "experience",
+            "importance": i % 10 + 1,
+            "related_people": "Alice, Bob",
+            "location": "Shanghai",
+            "memory_date": "2025-01-15",
+            "keywords": ["work", "planning", "review"],
+            "source_app": "benchmark",
+            "reference_urls": [],
+            "privacy_level": "public",
+            "created_time": "2025-01-15 10:00:00",
+            "updated_time": "2025-01-15 10:00:00"
+        }
+        for i in range(count)
+    ]
+
+
+def best_of(func, repeat=3):
+    """Best wall-clock time of several runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+
+    start = time.perf_counter()
+    compile_template(MEMORY_TEMPLATE)
+    print(f"Template compile: {(time.perf_counter() - start) * 1000:.3f} ms (once per template)")
+    print(f"{'records':>8} {'legacy ms':>12} {'compiled ms':>12} {'speedup':>8}")
+
+    for count in counts:
+        records = make_records(count)
+        legacy = best_of(lambda: legacy_generate_prompt_content(MEMORY_TEMPLATE, records))
+        compiled = best_of(lambda: generate_prompt_content(MEMORY_TEMPLATE, records))
+        print(f"{count:>8} {legacy * 1000:>12.2f} {compiled * 1000:>12.2f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
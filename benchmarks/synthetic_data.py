@@ -0,0 +1,349 @@
+"""
+Synthetic Data Generator
+
+Fills a scratch database with reproducible, realistic rows for every table in
+ProfileDatabase.tables: mixed English and Chinese content, keyword lists with a skewed
+(Zipf-like) distribution, dates spread over three years, categories and relations
+between records. The same seed and row count always produce the same data.
+
+Usage:
+    python benchmarks/synthetic_data.py --db scratch.db [--scale 10k|100k|1m|<rows>] [--seed N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from Database.database import ProfileDatabase
+
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Share of the requested row count per table; persona and category are sized separately
+TABLE_SHARES = {
+    'memory': 0.25,
+    'viewpoint': 0.10,
+    'insight': 0.10,
+    'goal': 0.08,
+    'preference': 0.08,
+    'focus': 0.06,
+    'methodology': 0.06,
+    'prediction': 0.07,
+    'relations': 0.20
+}
+
+# Tables relations point at, in insertion order
+MAIN_TABLES = ['memory', 'viewpoint', 'insight', 'goal', 'preference', 'focus', 'methodology', 'prediction']
+
+# Dates are spread over this many days before BASE_DATE
+BASE_DATE = datetime(2025, 6, 30, 18, 0, 0, tzinfo=timezone(timedelta(hours=8)))
+DATE_SPAN_DAYS = 3 * 365
+
+KEYWORDS = [
+    'work', 'python', 'sqlite', 'health', 'reading', 'travel', 'family', 'investment', 'startup',
+    'design', 'music', 'running', 'cooking', 'ai', 'product', 'team', 'writing', 'learning',
+    'meeting', 'review', 'architecture', 'performance', 'database', 'career', 'finance',
+    '工作', '学习', '健康', '旅行', '家庭', '投资', '创业', '阅读', '跑步', '设计', '产品', '团队',
+    '写作', '音乐', '数据库', '性能', '架构', '会议', '复盘', '职业', '理财', '人工智能', '效率'
+]
+# Keyword i is picked with weight 1 / (i + 1), so a few keywords are very common
+KEYWORD_WEIGHTS = [1 / (i + 1) for i in range(len(KEYWORDS))]
+
+SUBJECTS_EN = [
+    'the quarterly review', 'the database migration', 'a morning run', 'the product launch',
+    'a code review', 'the investment plan', 'a team retrospective', 'the reading list',
+    'the new search feature', 'a family trip', 'the hiring process', 'a performance regression'
+]
+ACTIONS_EN = [
+    'finished', 'planned', 'discussed', 'reconsidered', 'documented', 'improved', 'postponed',
+    'learned from', 'presented', 'simplified'
+]
+DETAILS_EN = [
+    'with the team', 'after a long week', 'before the deadline', 'using a new approach',
+    'and wrote down the lessons', 'while traveling', 'with clear metrics', 'in small steps'
+]
+SUBJECTS_ZH = [
+    '季度复盘', '数据库迁移', '晨跑计划', '产品发布', '代码评审', '投资组合', '团队回顾',
+    '阅读清单', '搜索功能', '家庭旅行', '招聘流程', '性能优化'
+]
+ACTIONS_ZH = ['完成了', '规划了', '讨论了', '重新思考了', '记录了', '改进了', '推迟了', '总结了']
+DETAILS_ZH = [
+    '并和团队同步了结论', '在周末整理了笔记', '赶在截止日期之前', '尝试了新的方法',
+    '写下了经验教训', '在出差途中', '设定了明确的指标', '一步一步推进'
+]
+PEOPLE = ['Alice', 'Bob', 'Carol', 'David', 'Eve', '张伟', '李娜', '王芳', '刘洋', '陈静']
+LOCATIONS = ['Shanghai', 'Beijing', 'Shenzhen', 'Hangzhou', 'Singapore', 'Berlin', '上海', '北京', '成都', '杭州']
+SOURCE_APPS = ['claude', 'chatgpt', 'cursor', 'notion', 'obsidian', 'unknown']
+URLS = ['https://example.com/notes', 'https://example.com/blog', 'https://example.org/paper', 'https://example.net/wiki']
+
+CATEGORY_LEVELS = {
+    'Technology': ['Programming Development', 'System Architecture', 'Databases', 'AI Tools', '前端开发', '运维部署'],
+    'Life': ['Interpersonal Relations', 'Health Management', 'Travel', 'Family', '饮食', '运动'],
+    'Business': ['Investment Finance', 'Entrepreneurship Management', 'Marketing', 'Product Management', '销售', '管理'],
+    'Learning': ['Knowledge Management', 'Skill Development', 'Languages', 'Reading', '写作', '课程']
+}
+
+
+class SyntheticDataGenerator:
+    """Deterministic row factory for all profile tables"""
+
+    def __init__(self, seed: int = 42, category_ids: Optional[List[int]] = None):
+        """
+        Initialize generator
+
+        Args:
+            seed: Random seed, the same seed produces the same rows
+            category_ids: Category IDs rows are assigned to, None leaves category_id empty
+        """
+        self.rng = random.Random(seed)
+        self.category_ids = category_ids or []
+
+    def sentence(self) -> str:
+        """One English or Chinese sentence (about a third of the content is Chinese)"""
+        rng = self.rng
+        if rng.random() < 0.35:
+            return f"{rng.choice(ACTIONS_ZH)}{rng.choice(SUBJECTS_ZH)}，{rng.choice(DETAILS_ZH)}。"
+        return f"{rng.choice(ACTIONS_EN).capitalize()} {rng.choice(SUBJECTS_EN)} {rng.choice(DETAILS_EN)}."
+
+    def content(self, min_sentences: int = 1, max_sentences: int = 4) -> str:
+        """Paragraph of mixed-language sentences"""
+        return ' '.join(self.sentence() for _ in range(self.rng.randint(min_sentences, max_sentences)))
+
+    def keywords(self) -> List[str]:
+        """Two to five distinct keywords"""
+        count = self.rng.randint(2, 5)
+        picked = []
+        while len(picked) < count:
+            keyword = self.rng.choices(KEYWORDS, weights=KEYWORD_WEIGHTS)[0]
+            if keyword not in picked:
+                picked.append(keyword)
+        return picked
+
+    def people(self) -> str:
+        """Comma separated names"""
+        return ', '.join(self.rng.sample(PEOPLE, self.rng.randint(1, 3)))
+
+    def timestamp(self) -> datetime:
+        """Random point in time within DATE_SPAN_DAYS before BASE_DATE"""
+        return BASE_DATE - timedelta(seconds=self.rng.randint(0, DATE_SPAN_DAYS * 86400))
+
+    def date(self, future_days: int = 0) -> str:
+        """Random date, shifted up to future_days past BASE_DATE"""
+        moment = self.timestamp() + timedelta(days=self.rng.randint(0, future_days)) if future_days else self.timestamp()
+        return moment.date().isoformat()
+
+    def common_fields(self) -> Dict[str, Any]:
+        """Fields shared by the main data tables"""
+        created = self.timestamp()
+        updated = created + timedelta(seconds=self.rng.randint(0, 30 * 86400))
+        fields = {
+            'content': self.content(),
+            'keywords': self.keywords(),
+            'source_app': self.rng.choice(SOURCE_APPS),
+            'privacy_level': 'private' if self.rng.random() < 0.2 else 'public',
+            'created_time': created.isoformat(),
+            'updated_time': min(updated, BASE_DATE).isoformat()
+        }
+        if self.category_ids:
+            fields['category_id'] = self.rng.choice(self.category_ids)
+        return fields
+
+    def urls(self) -> List[str]:
+        """Zero to two reference URLs"""
+        return self.rng.sample(URLS, self.rng.randint(0, 2))
+
+    def memory(self) -> Dict[str, Any]:
+        rng = self.rng
+        return {
+            **self.common_fields(),
+            'memory_type': rng.choice(['experience', 'event', 'learning', 'interaction', 'achievement', 'mistake']),
+            'importance': rng.randint(1, 10),
+            'related_people': self.people(),
+            'location': rng.choice(LOCATIONS),
+            'memory_date': self.date(),
+            'reference_urls': self.urls()
+        }
+
+    def viewpoint(self) -> Dict[str, Any]:
+        return {
+            **self.common_fields(),
+            'source_people': self.people(),
+            'related_event': self.sentence(),
+            'reference_urls': self.urls()
+        }
+
+    def insight(self) -> Dict[str, Any]:
+        return {
+            **self.common_fields(),
+            'source_people': self.people(),
+            'reference_urls': self.urls()
+        }
+
+    def goal(self) -> Dict[str, Any]:
+        rng = self.rng
+        return {
+            **self.common_fields(),
+            'type': rng.choice(['long_term', 'short_term', 'plan', 'todo']),
+            'deadline': self.date(future_days=365),
+            'status': rng.choice(['planning', 'in_progress', 'completed', 'abandoned'])
+        }
+
+    def preference(self) -> Dict[str, Any]:
+        return {
+            **self.common_fields(),
+            'context': self.rng.choice(['work', 'home', 'travel', 'reading', '学习', '饮食'])
+        }
+
+    def focus(self) -> Dict[str, Any]:
+        rng = self.rng
+        return {
+            **self.common_fields(),
+            'priority': rng.randint(1, 10),
+            'status': rng.choice(['active', 'paused', 'completed']),
+            'context': self.sentence(),
+            'deadline': self.date(future_days=180)
+        }
+
+    def methodology(self) -> Dict[str, Any]:
+        rng = self.rng
+        return {
+            **self.common_fields(),
+            'type': rng.choice(['productivity', 'learning', 'decision', 'engineering', '沟通']),
+            'effectiveness': rng.choice(['proven', 'experimental', 'theoretical']),
+            'use_cases': self.sentence(),
+            'reference_urls': self.urls()
+        }
+
+    def prediction(self) -> Dict[str, Any]:
+        rng = self.rng
+        return {
+            **self.common_fields(),
+            'timeframe': rng.choice(['1 month', '6 months', '1 year', '3 years', '半年', '五年']),
+            'basis': self.sentence(),
+            'verification_status': rng.choice(['pending', 'correct', 'incorrect', 'partial']),
+            'reference_urls': self.urls()
+        }
+
+    def relation(self, id_ranges: Dict[str, List[int]]) -> Dict[str, Any]:
+        """Relation between two existing records"""
+        rng = self.rng
+        source_table, target_table = rng.choice(MAIN_TABLES), rng.choice(MAIN_TABLES)
+        created = self.timestamp().isoformat()
+        return {
+            'source_table': source_table,
+            'source_id': rng.randint(*id_ranges[source_table]),
+            'target_table': target_table,
+            'target_id': rng.randint(*id_ranges[target_table]),
+            'relation_type': rng.choice(['related_to', 'caused_by', 'supports', 'contradicts', 'derived_from']),
+            'strength': rng.choice(['strong', 'medium', 'weak']),
+            'note': self.sentence() if rng.random() < 0.3 else None,
+            'created_time': created,
+            'updated_time': created
+        }
+
+
+def plan_rows(total_rows: int) -> Dict[str, int]:
+    """Split a total row count across the tables"""
+    return {table_name: max(1, int(total_rows * share)) for table_name, share in TABLE_SHARES.items()}
+
+
+def populate(db: ProfileDatabase, total_rows: int, seed: int = 42, batch_size: int = 5000,
+             progress: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, int]:
+    """
+    Fill a database with synthetic rows
+
+    Rows are written with insert_records in batches, so every batch is one transaction and
+    the FTS and keyword triggers run as they would for real data.
+
+    Args:
+        db: Target database (should be a scratch database)
+        total_rows: Approximate number of rows across all tables
+        seed: Random seed
+        batch_size: Rows per insert_records call
+        progress: Called as progress(table_name, inserted, planned) after every batch
+
+    Returns:
+        Number of rows inserted per table
+    """
+    counts: Dict[str, int] = {}
+
+    # Persona: the single default record gets realistic values
+    db.update_record('persona', 1, name='张三 (Alex Zhang)', gender='Not Set',
+                     personality='Curious, structured, 喜欢长期主义',
+                     bio='Engineer interested in databases, reading and running. 热爱学习与分享。')
+    counts['persona'] = 1
+
+    # Categories: second levels under the default first levels, one row each
+    categories = [
+        {'first_level': first_level, 'second_level': second_level,
+         'description': f"{first_level} / {second_level}"}
+        for first_level, second_levels in CATEGORY_LEVELS.items()
+        for second_level in second_levels
+    ]
+    existing, _ = db.query_records('category', limit=1000)
+    known = {(row['first_level'], row['second_level']) for row in existing}
+    new_categories = [row for row in categories if (row['first_level'], row['second_level']) not in known]
+    db.insert_records('category', new_categories)
+    counts['category'] = len(new_categories)
+    category_ids = [row['id'] for row in db.query_records('category', limit=1000)[0]]
+
+    generator = SyntheticDataGenerator(seed, category_ids)
+    planned = plan_rows(total_rows)
+    id_ranges: Dict[str, List[int]] = {}
+
+    for table_name in MAIN_TABLES + ['relations']:
+        if table_name == 'relations':
+            make_row = lambda: generator.relation(id_ranges)
+        else:
+            make_row = getattr(generator, table_name)
+        inserted = 0
+        first_id = last_id = None
+        while inserted < planned[table_name]:
+            rows = [make_row() for _ in range(min(batch_size, planned[table_name] - inserted))]
+            ids = db.insert_records(table_name, rows)
+            first_id = ids[0] if first_id is None else first_id
+            last_id = ids[-1]
+            inserted += len(rows)
+            if progress:
+                progress(table_name, inserted, planned[table_name])
+        id_ranges[table_name] = [first_id, last_id]
+        counts[table_name] = inserted
+
+    db.flush()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a scratch database with synthetic profile data")
+    parser.add_argument("--db", required=True, help="Database file to create or extend")
+    parser.add_argument("--scale", default="10k", help="10k, 100k, 1m or a row count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    total_rows = SCALES.get(args.scale.lower()) or int(args.scale)
+
+    def progress(table_name, inserted, planned):
+        print(f"\r{table_name:>12}: {inserted}/{planned}", end='', file=sys.stderr, flush=True)
+        if inserted == planned:
+            print(file=sys.stderr)
+
+    db = ProfileDatabase(db_path=args.db, write_behind={"enabled": False})
+    start = time.perf_counter()
+    counts = populate(db, total_rows, seed=args.seed, batch_size=args.batch_size, progress=progress)
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    rows = sum(counts.values())
+    print(f"Inserted {rows} rows into {args.db} in {elapsed:.1f} s ({rows / elapsed:.0f} rows/s)")
+    for table_name, count in counts.items():
+        print(f"{table_name:>12} {count:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ a = Analysis(
     datas=[
         ('tools', 'tools'),
         ('config_manager.py', '.'),
+        ('metrics.py', '.'),
         ('Database', 'Database'),
     ],
     hiddenimports=[
@@ -47,6 +48,7 @@ a = Analysis(
         'tools.database_tools',
         'tools.base',
         'config_manager',
+        'metrics',
     ],
     hookspath=[],
     hooksconfig={},
@@ -61,11 +61,56 @@ class ConfigManager:
         return {
             "database": {
                 "path": str(executable_dir),
-                "filename": "profile_data.db"
+                "filename": "profile_data.db",
+                "pool": {
+                    "reader_pool_size": 4,
+                    "pool_timeout": 5.0,
+                    "executor_workers": 5
+                },
+                "write_behind": {
+                    "enabled": False,
+                    "flush_interval_ms": 50,
+                    "max_batch_rows": 200,
+                    "ack_mode": "commit"
+                },
+                "cache": {
+                    "record_cache_size": 1000,
+                    "query_cache_entries": 256,
+                    "query_cache_max_bytes": 8388608
+                },
+                "performance": {
+                    "preset": "balanced"
+                },
+                "write_retry": {
+                    "max_retries": 3,
+                    "base_delay_ms": 25,
+                    "max_delay_ms": 500
+                },
+                "slow_query": {
+                    "enabled": True,
+                    "threshold_ms": 100,
+                    "max_entries": 200,
+                    "log_file": "",
+                    "explain": True
+                },
+                "backup": {
+                    "enabled": False,
+                    "directory": "",
+                    "interval_minutes": 1440,
+                    "retention": 7,
+                    "pages_per_step": 256,
+                    "step_sleep_ms": 5
+                }
             },
             "server": {
                 "port": 8088,
-                "host": "0.0.0.0"
+                "host": "0.0.0.0",
+                "workers": 1,
+                "graceful_shutdown_timeout": 30
+            },
+            "metrics": {
+                "enabled": True,
+                "serialization_sample_rate": 0.1
             },
             "system": {
                 "timezone_offset": 8,
@@ -96,6 +141,27 @@ class ConfigManager:
                     if 'filename' not in config['database']:
                         config['database']['filename'] = default_config['database']['filename']
                         updated = True
+                    if 'pool' not in config['database']:
+                        config['database']['pool'] = default_config['database']['pool']
+                        updated = True
+                    if 'write_behind' not in config['database']:
+                        config['database']['write_behind'] = default_config['database']['write_behind']
+                        updated = True
+                    if 'cache' not in config['database']:
+                        config['database']['cache'] = default_config['database']['cache']
+                        updated = True
+                    if 'performance' not in config['database']:
+                        config['database']['performance'] = default_config['database']['performance']
+                        updated = True
+                    if 'write_retry' not in config['database']:
+                        config['database']['write_retry'] = default_config['database']['write_retry']
+                        updated = True
+                    if 'slow_query' not in config['database']:
+                        config['database']['slow_query'] = default_config['database']['slow_query']
+                        updated = True
+                    if 'backup' not in config['database']:
+                        config['database']['backup'] = default_config['database']['backup']
+                        updated = True
                 
                 # Check server configuration
                 if 'server' not in config:
@@ -108,6 +174,17 @@ class ConfigManager:
                     if 'host' not in config['server']:
                         config['server']['host'] = default_config['server']['host']
                         updated = True
+                    if 'workers' not in config['server']:
+                        config['server']['workers'] = default_config['server']['workers']
+                        updated = True
+                    if 'graceful_shutdown_timeout' not in config['server']:
+                        config['server']['graceful_shutdown_timeout'] = default_config['server']['graceful_shutdown_timeout']
+                        updated = True
+                
+                # Check metrics configuration
+                if 'metrics' not in config:
+                    config['metrics'] = default_config['metrics']
+                    updated = True
                 
                 # Check system configuration
                 if 'system' not in config:
@@ -159,6 +236,48 @@ class ConfigManager:
         """Get database directory path"""
         return self.config['database']['path']
     
+    def get_database_pool_config(self) -> Dict[str, Any]:
+        """Get database connection pool configuration"""
+        pool_config = self._get_default_config()['database']['pool']
+        pool_config.update(self.config['database'].get('pool', {}))
+        return pool_config
+    
+    def get_write_behind_config(self) -> Dict[str, Any]:
+        """Get group commit (write-behind) configuration"""
+        write_behind_config = self._get_default_config()['database']['write_behind']
+        write_behind_config.update(self.config['database'].get('write_behind', {}))
+        return write_behind_config
+    
+    def get_cache_config(self) -> Dict[str, Any]:
+        """Get database cache configuration"""
+        cache_config = self._get_default_config()['database']['cache']
+        cache_config.update(self.config['database'].get('cache', {}))
+        return cache_config
+    
+    def get_performance_config(self) -> Dict[str, Any]:
+        """Get SQLite performance profile configuration (preset plus optional pragma overrides)"""
+        performance_config = self._get_default_config()['database']['performance']
+        performance_config.update(self.config['database'].get('performance', {}))
+        return performance_config
+    
+    def get_write_retry_config(self) -> Dict[str, Any]:
+        """Get retry settings for write transactions blocked by another process"""
+        write_retry_config = self._get_default_config()['database']['write_retry']
+        write_retry_config.update(self.config['database'].get('write_retry', {}))
+        return write_retry_config
+    
+    def get_slow_query_config(self) -> Dict[str, Any]:
+        """Get slow query log configuration"""
+        slow_query_config = self._get_default_config()['database']['slow_query']
+        slow_query_config.update(self.config['database'].get('slow_query', {}))
+        return slow_query_config
+    
+    def get_backup_config(self) -> Dict[str, Any]:
+        """Get backup configuration"""
+        backup_config = self._get_default_config()['database']['backup']
+        backup_config.update(self.config['database'].get('backup', {}))
+        return backup_config
+    
     def get_server_port(self) -> int:
         """Get server port"""
         return self.config['server']['port']
@@ -167,6 +286,20 @@ class ConfigManager:
         """Get server host"""
         return self.config['server']['host']
     
+    def get_server_workers(self) -> int:
+        """Get number of SSE server worker processes"""
+        return max(1, int(self.config['server'].get('workers', 1)))
+    
+    def get_graceful_shutdown_timeout(self) -> int:
+        """Get seconds the SSE server waits for in-flight requests on shutdown"""
+        return int(self.config['server'].get('graceful_shutdown_timeout', 30))
+    
+    def get_metrics_config(self) -> Dict[str, Any]:
+        """Get tool metrics configuration"""
+        metrics_config = self._get_default_config()['metrics']
+        metrics_config.update(self.config.get('metrics', {}))
+        return metrics_config
+    
     def get_timezone_offset(self) -> int:
         """Get timezone offset"""
         return self.config['system']['timezone_offset']
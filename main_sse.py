@@ -7,10 +7,12 @@ from fastmcp import FastMCP
 from typing import List, Dict, Any, Optional, Union
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse
 import uvicorn
 
 # Import configuration manager and initialize immediately
@@ -29,16 +31,12 @@ from tools import (
     PredictionTools, DatabaseTools
 )
 
-# Define CORS middleware
-cors_middleware = [
-    Middleware(
-        CORSMiddleware,
-        allow_origins=["*"],  # Allow all origins, recommend specifying specific domains in production
-        allow_credentials=True,
-        allow_methods=["*"],  # Allow all HTTP methods
-        allow_headers=["*"],  # Allow all request headers
-    ),
-]
+# Asynchronous database access (blocking tool work runs on a dedicated executor)
+from Database.async_database import get_async_database
+from Database.backup import get_backup_manager, schedule_backups_on_open
+
+# Per-tool latency, row and error metrics
+from metrics import get_metrics, instrument_tool
 
 # Create FastMCP server instance
 mcp = FastMCP("Personal Profile Data Management System")
@@ -54,230 +52,478 @@ methodology_tools = MethodologyTools()
 focus_tools = FocusTools()
 prediction_tools = PredictionTools()
 database_tools = DatabaseTools()
+async_db = get_async_database()
 
 # ============ Persona Related Operations ============
 
 @mcp.tool()
-def get_persona() -> Dict[str, Any]:
+@instrument_tool
+async def get_persona() -> Dict[str, Any]:
     """Get current user's core profile information. This information is used for AI personalized interaction. There is only one user profile in the system with fixed ID 1."""
-    return persona_tools.get_persona()
+    return await async_db.run(persona_tools.get_persona)
 
 @mcp.tool()
-def save_persona(name: str = None, gender: str = None, personality: str = None, 
-                avatar_url: str = None, bio: str = None, privacy_level: str = None) -> Dict[str, Any]:
+@instrument_tool
+async def save_persona(name: str = None, gender: str = None, personality: str = None, 
+                      avatar_url: str = None, bio: str = None, privacy_level: str = None) -> Dict[str, Any]:
     """Save (update) current user's core profile information. Since ID is fixed as 1, this operation is mainly used to update existing profile. Only provide fields that need to be modified."""
-    return persona_tools.save_persona(name, gender, personality, avatar_url, bio, privacy_level)
+    return await async_db.run(persona_tools.save_persona, name, gender, personality, avatar_url, bio, privacy_level)
 
 # ============ Memory Tools ============
 
 @mcp.tool()
-def manage_memories(action: str, id: int = None, content: str = None, memory_type: str = None,
-                   importance: int = None, related_people: str = None, location: str = None,
-                   memory_date: str = None, keywords: List[str] = None, source_app: str = 'unknown',
-                   reference_urls: List[str] = None, privacy_level: str = 'public',
-                   filter: Dict[str, Any] = None, sort_by: str = 'created_time', 
-                   sort_order: str = 'desc', limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-    """Memory data management tool. Supports query and save operations.
+@instrument_tool
+async def manage_memories(action: str, id: int = None, content: str = None, memory_type: str = None,
+                         importance: int = None, related_people: str = None, location: str = None,
+                         memory_date: str = None, keywords: List[str] = None, source_app: str = 'unknown',
+                         reference_urls: List[str] = None, privacy_level: str = 'public',
+                         filter: Dict[str, Any] = None, sort_by: str = 'created_time', 
+                         sort_order: str = 'desc', limit: int = 20, offset: int = 0,
+                         records: List[Dict[str, Any]] = None, cursor: str = None,
+                         count_mode: str = 'exact', response_format: str = 'both',
+                         max_tokens: int = None, max_chars: int = None,
+                         fields: List[str] = None) -> Dict[str, Any]:
+    """Memory data management tool. Supports query, save and save_many operations.
     
     Parameter description:
-    - action: Operation type, 'query' (query) or 'save' (save)
+    - action: Operation type, 'query' (query), 'save' (save) or 'save_many' (batch save)
     
     Query operation (action='query') uses parameters:
-    - filter: Query condition dictionary
+    - filter: Query condition dictionary; content_match / text_match run an indexed full-text search
+      (use sort_by='relevance' to rank results by BM25; relevance_fallback=True in the response means
+      no term was long enough to score and results are sorted by created_time)
     - sort_by, sort_order, limit, offset: Sorting and pagination parameters
+    - cursor: next_cursor returned by the previous query; continues after its last record
+      (faster than offset for deep pages, must be used with the same filter and sorting)
+    - count_mode: 'exact' (default) counts all matches, 'estimate' stops counting at 1000
+      (total_count_exact tells whether total_count is exact), 'none' skips counting
+    - response_format: 'both' (default, content + raw_data), 'markdown' (content only),
+      'raw' (raw_data only) or 'compact' (one dense line per record, smallest payload)
+    - max_tokens / max_chars: Size budget of the response; records stop once it is reached
+      (a single oversized record is shortened) and next_cursor continues with the rest; when not
+      even a shortened record fits, no records come back and budget_too_small is set.
+      Tokens are estimated: about 1 per CJK character and 1 per 4 other characters
+    - fields: Fields to return, e.g. ['content', 'importance'] (id is always included); smaller
+      responses and less work than returning every field
     
     Save operation (action='save') uses parameters:
     - id: Record ID, None means create new record, value means update existing record
     - content, memory_type, importance etc: Memory data fields
+    
+    Batch save operation (action='save_many') uses parameters:
+    - records: List of memory field dictionaries, saved in one transaction; include id to update a record
     """
     if action == "query":
-        return memory_tools.query_memories(filter, sort_by, sort_order, limit, offset)
+        return await async_db.run(memory_tools.query_memories, filter, sort_by, sort_order, limit, offset, cursor, count_mode,
+                                 response_format, max_tokens, max_chars, fields)
     elif action == "save":
-        return memory_tools.save_memory(id, content, memory_type, importance, related_people, 
-                                       location, memory_date, keywords, source_app, 
-                                       reference_urls, privacy_level)
+        return await async_db.run(memory_tools.save_memory, id, content, memory_type, importance, related_people, 
+                                 location, memory_date, keywords, source_app, 
+                                 reference_urls, privacy_level)
+    elif action == "save_many":
+        return await async_db.run(memory_tools.save_memories, records)
     else:
         return {
             "operation": "error",
             "timestamp": datetime.now().isoformat(),
-            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save'"
+            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save', 'save_many'"
         }
 
 # ============ Viewpoint Tools ============
 
 @mcp.tool()
-def manage_viewpoints(action: str, id: int = None, content: str = None, source_people: str = None,
-                     keywords: List[str] = None, source_app: str = 'unknown',
-                     related_event: str = None, reference_urls: List[str] = None,
-                     privacy_level: str = 'public', filter: Dict[str, Any] = None, 
-                     sort_by: str = 'created_time', sort_order: str = 'desc', 
-                     limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-    """Viewpoint data management tool. Supports query and save operations."""
+@instrument_tool
+async def manage_viewpoints(action: str, id: int = None, content: str = None, source_people: str = None,
+                           keywords: List[str] = None, source_app: str = 'unknown',
+                           related_event: str = None, reference_urls: List[str] = None,
+                           privacy_level: str = 'public', filter: Dict[str, Any] = None, 
+                           sort_by: str = 'created_time', sort_order: str = 'desc', 
+                           limit: int = 20, offset: int = 0,
+                           records: List[Dict[str, Any]] = None, cursor: str = None,
+                           count_mode: str = 'exact', response_format: str = 'both',
+                           max_tokens: int = None, max_chars: int = None,
+                           fields: List[str] = None) -> Dict[str, Any]:
+    """Viewpoint data management tool. Supports query, save and save_many operations.
+    
+    save_many takes records, a list of field dictionaries saved in one transaction (include id to update a record).
+    query accepts cursor, the next_cursor of the previous page, to continue paging, and
+    count_mode ('exact', 'estimate' or 'none') to make total_count cheaper, and response_format
+    ('both', 'markdown', 'raw' or 'compact') to shrink the payload. max_tokens or max_chars cap the
+    response size; next_cursor then continues with the records that did not fit. fields (e.g.
+    ['content', 'keywords']) limits the returned fields."""
     if action == "query":
-        return viewpoint_tools.query_viewpoints(filter, sort_by, sort_order, limit, offset)
+        return await async_db.run(viewpoint_tools.query_viewpoints, filter, sort_by, sort_order, limit, offset, cursor, count_mode,
+                                 response_format, max_tokens, max_chars, fields)
     elif action == "save":
-        return viewpoint_tools.save_viewpoint(id, content, source_people, keywords, 
-                                             source_app, related_event, reference_urls, privacy_level)
+        return await async_db.run(viewpoint_tools.save_viewpoint, id, content, source_people, keywords, 
+                                 source_app, related_event, reference_urls, privacy_level)
+    elif action == "save_many":
+        return await async_db.run(viewpoint_tools.save_viewpoints, records)
     else:
         return {
             "operation": "error",
             "timestamp": datetime.now().isoformat(),
-            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save'"
+            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save', 'save_many'"
         }
 
 # ============ Insight Tools ============
 
 @mcp.tool()
-def manage_insights(action: str, id: int = None, content: str = None, source_people: str = None,
-                   keywords: List[str] = None, source_app: str = 'unknown',
-                   reference_urls: List[str] = None, privacy_level: str = 'public',
-                   filter: Dict[str, Any] = None, sort_by: str = 'created_time', 
-                   sort_order: str = 'desc', limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-    """Insight data management tool. Supports query and save operations."""
+@instrument_tool
+async def manage_insights(action: str, id: int = None, content: str = None, source_people: str = None,
+                         keywords: List[str] = None, source_app: str = 'unknown',
+                         reference_urls: List[str] = None, privacy_level: str = 'public',
+                         filter: Dict[str, Any] = None, sort_by: str = 'created_time', 
+                         sort_order: str = 'desc', limit: int = 20, offset: int = 0,
+                         records: List[Dict[str, Any]] = None, cursor: str = None,
+                         count_mode: str = 'exact', response_format: str = 'both',
+                         max_tokens: int = None, max_chars: int = None,
+                         fields: List[str] = None) -> Dict[str, Any]:
+    """Insight data management tool. Supports query, save and save_many operations.
+    
+    save_many takes records, a list of field dictionaries saved in one transaction (include id to update a record).
+    query accepts cursor, the next_cursor of the previous page, to continue paging, and
+    count_mode ('exact', 'estimate' or 'none') to make total_count cheaper, and response_format
+    ('both', 'markdown', 'raw' or 'compact') to shrink the payload. max_tokens or max_chars cap the
+    response size; next_cursor then continues with the records that did not fit. fields (e.g.
+    ['content', 'keywords']) limits the returned fields."""
     if action == "query":
-        return insight_tools.query_insights(filter, sort_by, sort_order, limit, offset)
+        return await async_db.run(insight_tools.query_insights, filter, sort_by, sort_order, limit, offset, cursor, count_mode,
+                                 response_format, max_tokens, max_chars, fields)
     elif action == "save":
-        return insight_tools.save_insight(id, content, source_people, keywords, 
-                                         source_app, reference_urls, privacy_level)
+        return await async_db.run(insight_tools.save_insight, id, content, source_people, keywords, 
+                                 source_app, reference_urls, privacy_level)
+    elif action == "save_many":
+        return await async_db.run(insight_tools.save_insights, records)
     else:
         return {
             "operation": "error",
             "timestamp": datetime.now().isoformat(),
-            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save'"
+            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save', 'save_many'"
         }
 
 # ============ Goal Tools ============
 
 @mcp.tool()
-def manage_goals(action: str, id: int = None, content: str = None, type: str = None, 
-                deadline: str = None, status: str = 'planning', keywords: List[str] = None, 
-                source_app: str = 'unknown', privacy_level: str = 'public',
-                filter: Dict[str, Any] = None, sort_by: str = 'deadline', 
-                sort_order: str = 'asc', limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-    """Goal data management tool. Supports query and save operations."""
+@instrument_tool
+async def manage_goals(action: str, id: int = None, content: str = None, type: str = None, 
+                      deadline: str = None, status: str = 'planning', keywords: List[str] = None, 
+                      source_app: str = 'unknown', privacy_level: str = 'public',
+                      filter: Dict[str, Any] = None, sort_by: str = 'deadline', 
+                      sort_order: str = 'asc', limit: int = 20, offset: int = 0,
+                      records: List[Dict[str, Any]] = None, cursor: str = None,
+                      count_mode: str = 'exact', response_format: str = 'both',
+                      max_tokens: int = None, max_chars: int = None,
+                      fields: List[str] = None) -> Dict[str, Any]:
+    """Goal data management tool. Supports query, save and save_many operations.
+    
+    save_many takes records, a list of field dictionaries saved in one transaction (include id to update a record).
+    query accepts cursor, the next_cursor of the previous page, to continue paging, and
+    count_mode ('exact', 'estimate' or 'none') to make total_count cheaper, and response_format
+    ('both', 'markdown', 'raw' or 'compact') to shrink the payload. max_tokens or max_chars cap the
+    response size; next_cursor then continues with the records that did not fit. fields (e.g.
+    ['content', 'keywords']) limits the returned fields."""
     if action == "query":
-        return goal_tools.query_goals(filter, sort_by, sort_order, limit, offset)
+        return await async_db.run(goal_tools.query_goals, filter, sort_by, sort_order, limit, offset, cursor, count_mode,
+                                 response_format, max_tokens, max_chars, fields)
     elif action == "save":
-        return goal_tools.save_goal(id, content, type, deadline, status, keywords, 
-                                   source_app, privacy_level)
+        return await async_db.run(goal_tools.save_goal, id, content, type, deadline, status, keywords, 
+                                 source_app, privacy_level)
+    elif action == "save_many":
+        return await async_db.run(goal_tools.save_goals, records)
     else:
         return {
             "operation": "error",
             "timestamp": datetime.now().isoformat(),
-            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save'"
+            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save', 'save_many'"
         }
 
 # ============ Preference Tools ============
 
 @mcp.tool()
-def manage_preferences(action: str, id: int = None, content: str = None, context: str = None,
-                      keywords: List[str] = None, source_app: str = 'unknown',
-                      privacy_level: str = 'public', filter: Dict[str, Any] = None, 
-                      sort_by: str = 'created_time', sort_order: str = 'desc', 
-                      limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-    """Preference data management tool. Supports query and save operations."""
+@instrument_tool
+async def manage_preferences(action: str, id: int = None, content: str = None, context: str = None,
+                            keywords: List[str] = None, source_app: str = 'unknown',
+                            privacy_level: str = 'public', filter: Dict[str, Any] = None, 
+                            sort_by: str = 'created_time', sort_order: str = 'desc', 
+                            limit: int = 20, offset: int = 0,
+                            records: List[Dict[str, Any]] = None, cursor: str = None,
+                            count_mode: str = 'exact', response_format: str = 'both',
+                            max_tokens: int = None, max_chars: int = None,
+                            fields: List[str] = None) -> Dict[str, Any]:
+    """Preference data management tool. Supports query, save and save_many operations.
+    
+    save_many takes records, a list of field dictionaries saved in one transaction (include id to update a record).
+    query accepts cursor, the next_cursor of the previous page, to continue paging, and
+    count_mode ('exact', 'estimate' or 'none') to make total_count cheaper, and response_format
+    ('both', 'markdown', 'raw' or 'compact') to shrink the payload. max_tokens or max_chars cap the
+    response size; next_cursor then continues with the records that did not fit. fields (e.g.
+    ['content', 'keywords']) limits the returned fields."""
     if action == "query":
-        return preference_tools.query_preferences(filter, sort_by, sort_order, limit, offset)
+        return await async_db.run(preference_tools.query_preferences, filter, sort_by, sort_order, limit, offset, cursor, count_mode,
+                                 response_format, max_tokens, max_chars, fields)
     elif action == "save":
-        return preference_tools.save_preference(id, content, context, keywords, 
-                                               source_app, privacy_level)
+        return await async_db.run(preference_tools.save_preference, id, content, context, keywords, 
+                                 source_app, privacy_level)
+    elif action == "save_many":
+        return await async_db.run(preference_tools.save_preferences, records)
     else:
         return {
             "operation": "error",
             "timestamp": datetime.now().isoformat(),
-            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save'"
+            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save', 'save_many'"
         }
 
 # ============ Methodology Tools ============
 
 @mcp.tool()
-def manage_methodologies(action: str, id: int = None, content: str = None, type: str = None,
-                        effectiveness: str = 'experimental', use_cases: str = None,
-                        keywords: List[str] = None, source_app: str = 'unknown',
-                        reference_urls: List[str] = None, privacy_level: str = 'public',
-                        filter: Dict[str, Any] = None, sort_by: str = 'created_time', 
-                        sort_order: str = 'desc', limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-    """Methodology data management tool. Supports query and save operations."""
+@instrument_tool
+async def manage_methodologies(action: str, id: int = None, content: str = None, type: str = None,
+                              effectiveness: str = 'experimental', use_cases: str = None,
+                              keywords: List[str] = None, source_app: str = 'unknown',
+                              reference_urls: List[str] = None, privacy_level: str = 'public',
+                              filter: Dict[str, Any] = None, sort_by: str = 'created_time', 
+                              sort_order: str = 'desc', limit: int = 20, offset: int = 0,
+                              records: List[Dict[str, Any]] = None, cursor: str = None,
+                              count_mode: str = 'exact', response_format: str = 'both',
+                              max_tokens: int = None, max_chars: int = None,
+                              fields: List[str] = None) -> Dict[str, Any]:
+    """Methodology data management tool. Supports query, save and save_many operations.
+    
+    save_many takes records, a list of field dictionaries saved in one transaction (include id to update a record).
+    query accepts cursor, the next_cursor of the previous page, to continue paging, and
+    count_mode ('exact', 'estimate' or 'none') to make total_count cheaper, and response_format
+    ('both', 'markdown', 'raw' or 'compact') to shrink the payload. max_tokens or max_chars cap the
+    response size; next_cursor then continues with the records that did not fit. fields (e.g.
+    ['content', 'keywords']) limits the returned fields."""
     if action == "query":
-        return methodology_tools.query_methodologies(filter, sort_by, sort_order, limit, offset)
+        return await async_db.run(methodology_tools.query_methodologies, filter, sort_by, sort_order, limit, offset, cursor, count_mode,
+                                 response_format, max_tokens, max_chars, fields)
     elif action == "save":
-        return methodology_tools.save_methodology(id, content, type, effectiveness, use_cases, 
-                                                 keywords, source_app, reference_urls, privacy_level)
+        return await async_db.run(methodology_tools.save_methodology, id, content, type, effectiveness, use_cases, 
+                                 keywords, source_app, reference_urls, privacy_level)
+    elif action == "save_many":
+        return await async_db.run(methodology_tools.save_methodologies, records)
     else:
         return {
             "operation": "error",
             "timestamp": datetime.now().isoformat(),
-            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save'"
+            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save', 'save_many'"
         }
 
 # ============ Focus Tools ============
 
 @mcp.tool()
-def manage_focuses(action: str, id: int = None, content: str = None, priority: int = None, 
-                  status: str = 'active', context: str = None, keywords: List[str] = None, 
-                  source_app: str = 'unknown', deadline: str = None, privacy_level: str = 'public',
-                  filter: Dict[str, Any] = None, sort_by: str = 'priority', 
-                  sort_order: str = 'desc', limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-    """Focus data management tool. Supports query and save operations."""
+@instrument_tool
+async def manage_focuses(action: str, id: int = None, content: str = None, priority: int = None, 
+                        status: str = 'active', context: str = None, keywords: List[str] = None, 
+                        source_app: str = 'unknown', deadline: str = None, privacy_level: str = 'public',
+                        filter: Dict[str, Any] = None, sort_by: str = 'priority', 
+                        sort_order: str = 'desc', limit: int = 20, offset: int = 0,
+                        records: List[Dict[str, Any]] = None, cursor: str = None,
+                        count_mode: str = 'exact', response_format: str = 'both',
+                        max_tokens: int = None, max_chars: int = None,
+                        fields: List[str] = None) -> Dict[str, Any]:
+    """Focus data management tool. Supports query, save and save_many operations.
+    
+    save_many takes records, a list of field dictionaries saved in one transaction (include id to update a record).
+    query accepts cursor, the next_cursor of the previous page, to continue paging, and
+    count_mode ('exact', 'estimate' or 'none') to make total_count cheaper, and response_format
+    ('both', 'markdown', 'raw' or 'compact') to shrink the payload. max_tokens or max_chars cap the
+    response size; next_cursor then continues with the records that did not fit. fields (e.g.
+    ['content', 'keywords']) limits the returned fields."""
     if action == "query":
-        return focus_tools.query_focuses(filter, sort_by, sort_order, limit, offset)
+        return await async_db.run(focus_tools.query_focuses, filter, sort_by, sort_order, limit, offset, cursor, count_mode,
+                                 response_format, max_tokens, max_chars, fields)
     elif action == "save":
-        return focus_tools.save_focus(id, content, priority, status, context, keywords, 
-                                     source_app, deadline, privacy_level)
+        return await async_db.run(focus_tools.save_focus, id, content, priority, status, context, keywords, 
+                                 source_app, deadline, privacy_level)
+    elif action == "save_many":
+        return await async_db.run(focus_tools.save_focuses, records)
     else:
         return {
             "operation": "error",
             "timestamp": datetime.now().isoformat(),
-            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save'"
+            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save', 'save_many'"
         }
 
 # ============ Prediction Tools ============
 
 @mcp.tool()
-def manage_predictions(action: str, id: int = None, content: str = None, timeframe: str = None, 
-                      basis: str = None, verification_status: str = 'pending', 
-                      keywords: List[str] = None, source_app: str = 'unknown', 
-                      reference_urls: List[str] = None, privacy_level: str = 'public',
-                      filter: Dict[str, Any] = None, sort_by: str = 'created_time', 
-                      sort_order: str = 'desc', limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-    """Prediction data management tool. Supports query and save operations."""
+@instrument_tool
+async def manage_predictions(action: str, id: int = None, content: str = None, timeframe: str = None, 
+                            basis: str = None, verification_status: str = 'pending', 
+                            keywords: List[str] = None, source_app: str = 'unknown', 
+                            reference_urls: List[str] = None, privacy_level: str = 'public',
+                            filter: Dict[str, Any] = None, sort_by: str = 'created_time', 
+                            sort_order: str = 'desc', limit: int = 20, offset: int = 0,
+                            records: List[Dict[str, Any]] = None, cursor: str = None,
+                            count_mode: str = 'exact', response_format: str = 'both',
+                            max_tokens: int = None, max_chars: int = None,
+                            fields: List[str] = None) -> Dict[str, Any]:
+    """Prediction data management tool. Supports query, save and save_many operations.
+    
+    save_many takes records, a list of field dictionaries saved in one transaction (include id to update a record).
+    query accepts cursor, the next_cursor of the previous page, to continue paging, and
+    count_mode ('exact', 'estimate' or 'none') to make total_count cheaper, and response_format
+    ('both', 'markdown', 'raw' or 'compact') to shrink the payload. max_tokens or max_chars cap the
+    response size; next_cursor then continues with the records that did not fit. fields (e.g.
+    ['content', 'keywords']) limits the returned fields."""
     if action == "query":
-        return prediction_tools.query_predictions(filter, sort_by, sort_order, limit, offset)
+        return await async_db.run(prediction_tools.query_predictions, filter, sort_by, sort_order, limit, offset, cursor, count_mode,
+                                 response_format, max_tokens, max_chars, fields)
     elif action == "save":
-        return prediction_tools.save_prediction(id, content, timeframe, basis, verification_status, 
-                                               keywords, source_app, reference_urls, privacy_level)
+        return await async_db.run(prediction_tools.save_prediction, id, content, timeframe, basis, verification_status, 
+                                 keywords, source_app, reference_urls, privacy_level)
+    elif action == "save_many":
+        return await async_db.run(prediction_tools.save_predictions, records)
     else:
         return {
             "operation": "error",
             "timestamp": datetime.now().isoformat(),
-            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save'"
+            "error": f"Invalid operation type: {action}, supported operations: 'query', 'save', 'save_many'"
         }
 
 # ============ Database Tools ============
 
 @mcp.tool()
-def execute_custom_sql(sql: str, params: List[str] = None, fetch_results: bool = True) -> Dict[str, Any]:
+@instrument_tool
+async def execute_custom_sql(sql: str, params: List[str] = None, fetch_results: bool = True) -> Dict[str, Any]:
     """Execute custom SQL statement"""
-    return database_tools.execute_custom_sql(sql, params, fetch_results)
+    return await async_db.run(database_tools.execute_custom_sql, sql, params, fetch_results)
 
 @mcp.tool()
-def get_table_schema(table_name: str = None) -> Dict[str, Any]:
+@instrument_tool
+async def get_table_schema(table_name: str = None) -> Dict[str, Any]:
     """Get table structure information"""
-    return database_tools.get_table_schema(table_name)
+    return await async_db.run(database_tools.get_table_schema, table_name)
+
+@mcp.tool()
+@instrument_tool
+async def export_data(file_name: str = None, tables: List[str] = None) -> Dict[str, Any]:
+    """Export the data bank (or the given tables) to an NDJSON file on the server.
+    
+    The file is written to the exports folder next to the database. file_name is a bare
+    file name (no directories) and defaults to a timestamped name; a name ending in .gz is
+    gzip-compressed."""
+    return await async_db.run(database_tools.export_data, file_name, tables)
+
+@mcp.tool()
+@instrument_tool
+async def import_data(file_name: str, on_conflict: str = 'update') -> Dict[str, Any]:
+    """Import an NDJSON file created by export_data, given by its file name in the exports
+    folder. Record ids are kept; on_conflict decides whether existing records with the same id
+    are overwritten ('update') or kept ('skip')."""
+    return await async_db.run(database_tools.import_data, file_name, on_conflict)
+
+@mcp.tool()
+@instrument_tool
+async def manage_backups(action: str, label: str = None) -> Dict[str, Any]:
+    """Database backup tool. Supports create and list operations.
+    
+    action='create' takes an online snapshot (optional label is added to the file name) while
+    the server keeps serving; action='list' returns existing snapshots, newest first."""
+    if action == "create":
+        return await async_db.run(database_tools.create_backup, label)
+    elif action == "list":
+        return await async_db.run(database_tools.list_backups)
+    else:
+        return {
+            "operation": "error",
+            "timestamp": datetime.now().isoformat(),
+            "error": f"Invalid operation type: {action}, supported operations: 'create', 'list'"
+        }
+
+@mcp.tool()
+@instrument_tool
+async def get_slow_queries(limit: int = 50, full_scan_only: bool = False, clear: bool = False) -> Dict[str, Any]:
+    """Get statements slower than the configured threshold (newest first) with parameters, duration,
+    row count and EXPLAIN QUERY PLAN output. full_scan_only keeps statements that scanned a whole
+    table; clear empties the in-memory log after reading."""
+    return await async_db.run(database_tools.get_slow_queries, limit, full_scan_only, clear)
+
+@mcp.tool()
+@instrument_tool
+async def get_database_stats() -> Dict[str, Any]:
+    """Get database connection pool and cache statistics (including cache hit rates) and the effective SQLite performance settings"""
+    return await async_db.run(database_tools.get_database_stats)
 
 # ============ Start Server ============
 
+def create_app(stateless: bool = False):
+    """
+    Create the HTTP application with CORS middleware
+    
+    Args:
+        stateless: Serve the stateless streamable HTTP transport at /mcp instead of SSE at /sse.
+                   An SSE session lives in the process that accepted GET /sse, so with several
+                   workers its POST /messages requests would reach workers that do not know it.
+                   The /metrics route is only added without it: metrics are kept per process,
+                   and scrapes spread over several workers would see counters jump between them.
+    """
+    # Define CORS middleware
+    cors_middleware = [
+        Middleware(
+            CORSMiddleware,
+            allow_origins=["*"],  # Allow all origins, recommend specifying specific domains in production
+            allow_credentials=True,
+            allow_methods=["*"],  # Allow all HTTP methods
+            allow_headers=["*"],  # Allow all request headers
+        ),
+    ]
+    if stateless:
+        return mcp.http_app(transport="http", stateless_http=True, middleware=cors_middleware)
+    
+    http_app = mcp.http_app(transport="sse", middleware=cors_middleware)
+    
+    async def metrics_endpoint(request):
+        """Prometheus scrape endpoint"""
+        return PlainTextResponse(get_metrics().render_prometheus(), media_type="text/plain; version=0.0.4")
+    
+    http_app.add_route("/metrics", metrics_endpoint, methods=["GET"])
+    return http_app
+
+def create_worker_app():
+    """uvicorn factory run once in every worker process of a multi-worker server"""
+    return create_app(stateless=True)
+
 if __name__ == "__main__":
     print("Starting Personal Profile Data Management System - FastMCP SSE Mode")
-
-    # Create HTTP application with CORS middleware
-    http_app = mcp.http_app(transport="sse", middleware=cors_middleware)
     
     # Get server configuration from config file
     host = config_manager.get_server_host()
     port = config_manager.get_server_port()
+    workers = config_manager.get_server_workers()
+    graceful_shutdown_timeout = config_manager.get_graceful_shutdown_timeout()
+    if workers > 1 and getattr(sys, 'frozen', False):
+        # Worker processes re-import this module by name, which packaged executables cannot do
+        print("Multiple workers are not supported in the packaged executable, starting 1 worker")
+        workers = 1
+    
+    # Scheduled snapshots run once, not per worker (only when database.backup.enabled is set): the
+    # supervisor of several workers never opens the database and starts them right away, a single
+    # server process starts them with its first database use
+    if workers > 1:
+        get_backup_manager().start_scheduler()
+    else:
+        schedule_backups_on_open()
+    
     print("\n\n")
-    print(f"Server will start at {host}:{port}/sse")
+    if workers > 1:
+        print(f"Server will start at {host}:{port}/mcp (stateless streamable HTTP) with {workers} workers")
+        print("/metrics is only served with 1 worker (every worker counts its own calls)")
+    else:
+        print(f"Server will start at {host}:{port}/sse with 1 worker")
     print("\n\n")
-    # Start server using uvicorn
-    uvicorn.run(http_app, host=host, port=port) 
\ No newline at end of file
+    # Start server using uvicorn. On shutdown each worker stops accepting connections, waits for
+    # in-flight requests, then commits pending writes and closes its database connections (atexit).
+    if workers > 1:
+        # Every worker process imports this module and opens its own database connections;
+        # WAL lets them read concurrently, commits of one worker invalidate the caches of the others.
+        # Requests are spread over the workers, so no transport state may be kept between them.
+        uvicorn.run("main_sse:create_worker_app", factory=True, app_dir=str(Path(__file__).parent),
+                    host=host, port=port, workers=workers,
+                    timeout_graceful_shutdown=graceful_shutdown_timeout)
+    else:
+        uvicorn.run(create_app(), host=host, port=port,
+                    timeout_graceful_shutdown=graceful_shutdown_timeout)
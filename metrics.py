@@ -0,0 +1,283 @@
+"""
+Tool Metrics Module
+
+Per-tool latency histograms (total, database, template rendering and serialization time),
+call, error and row counters, exported in the Prometheus text format.
+
+Each instrumented tool call gets a CallMetrics accumulator in a context variable. The
+accumulator follows the call onto the database executor thread (AsyncProfileDatabase.run
+copies the context), so the database and rendering layers report time with track() without
+knowing which tool they serve. Metrics are kept per process, so the SSE server only exposes
+them when it runs a single worker.
+"""
+
+import contextvars
+import functools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    # The encoder FastMCP applies to tool results
+    from pydantic_core import to_json as _to_json
+
+    def encode_result(result: Any) -> bytes:
+        """Encode a tool result the way the MCP transport does"""
+        return _to_json(result, fallback=str)
+except ImportError:
+    def encode_result(result: Any) -> bytes:
+        """Encode a tool result as JSON"""
+        return json.dumps(result, ensure_ascii=False, default=str).encode('utf-8')
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ('total', 'db', 'render', 'serialization')
+
+
+class Histogram:
+    """Cumulative-bucket histogram"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Add one observation"""
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class CallMetrics:
+    """Time and rows accumulated by one tool call"""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.rows = 0
+        self._active: Dict[str, int] = {}
+
+    def add(self, phase: str, seconds: float):
+        """Add time spent in a phase"""
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+
+_current_call: contextvars.ContextVar[Optional[CallMetrics]] = contextvars.ContextVar('userbank_call_metrics', default=None)
+
+
+@contextmanager
+def track(phase: str) -> Iterator[None]:
+    """
+    Attribute the time spent in the block to a phase of the current tool call
+
+    Nested blocks of the same phase (a read inside a write transaction) are counted once.
+    Outside of an instrumented call this does nothing.
+    """
+    call = _current_call.get()
+    if call is None or call._active.get(phase):
+        yield
+        return
+
+    call._active[phase] = 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        call._active[phase] = 0
+        call.add(phase, time.perf_counter() - start)
+
+
+def record_rows(count: int):
+    """Add rows returned or written by the current tool call"""
+    call = _current_call.get()
+    if call is not None:
+        call.rows += count
+
+
+def is_error_result(result: Any) -> bool:
+    """Check whether a tool result dictionary reports a failure"""
+    if not isinstance(result, dict):
+        return False
+    return result.get('success') is False or result.get('operation') == 'error' or 'error' in result
+
+
+class MetricsRegistry:
+    """Thread-safe per-tool metrics store"""
+
+    def __init__(self, enabled: bool = True, serialization_sample_rate: float = 0.1):
+        """
+        Initialize registry
+
+        Args:
+            enabled: Record metrics for instrumented tools
+            serialization_sample_rate: Share of calls whose result is encoded once more, on a
+                                       background thread, to time serialization
+        """
+        self.enabled = enabled
+        self.serialization_sample_rate = min(1.0, max(0.0, float(serialization_sample_rate)))
+        self._sample_interval = round(1 / self.serialization_sample_rate) if self.serialization_sample_rate else 0
+        self._lock = threading.Lock()
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._sampler: Optional[ThreadPoolExecutor] = None
+        self.started = time.time()
+
+    def _tool(self, name: str) -> Dict[str, Any]:
+        """Get the metrics entry of a tool (caller holds the lock)"""
+        entry = self._tools.get(name)
+        if entry is None:
+            entry = {
+                "calls": 0,
+                "errors": 0,
+                "rows": 0,
+                "response_bytes": 0,
+                "histograms": {phase: Histogram() for phase in PHASES}
+            }
+            self._tools[name] = entry
+        return entry
+
+    def _should_sample(self, name: str) -> bool:
+        """Decide whether this call's serialization is timed"""
+        if not self._sample_interval:
+            return False
+        with self._lock:
+            return self._tool(name)["calls"] % self._sample_interval == 0
+
+    def _sample_serialization(self, name: str, result: Any):
+        """Time encoding a tool result off the event loop, without delaying the response"""
+        def measure():
+            start = time.perf_counter()
+            size = len(encode_result(result))
+            seconds = time.perf_counter() - start
+            with self._lock:
+                entry = self._tool(name)
+                entry["response_bytes"] += size
+                entry["histograms"]["serialization"].observe(seconds)
+
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="userbank-metrics")
+        self._sampler.submit(measure)
+
+    def record(self, name: str, call: CallMetrics, total: float, error: bool):
+        """Store the measurements of a finished tool call"""
+        with self._lock:
+            entry = self._tool(name)
+            entry["calls"] += 1
+            entry["rows"] += call.rows
+            if error:
+                entry["errors"] += 1
+            histograms = entry["histograms"]
+            histograms["total"].observe(total)
+            for phase in ('db', 'render'):
+                histograms[phase].observe(call.durations.get(phase, 0.0))
+
+    def instrument(self, func: Callable) -> Callable:
+        """Decorator recording latency, rows and errors of an async tool function"""
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return await func(*args, **kwargs)
+
+            call = CallMetrics()
+            token = _current_call.set(call)
+            start = time.perf_counter()
+            error = True
+            try:
+                result = await func(*args, **kwargs)
+                error = is_error_result(result)
+                if self._should_sample(name):
+                    self._sample_serialization(name, result)
+                return result
+            finally:
+                _current_call.reset(token)
+                self.record(name, call, time.perf_counter() - start, error)
+
+        return wrapper
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get a JSON-friendly snapshot (calls, errors, rows and mean phase times in ms per tool)"""
+        with self._lock:
+            return {
+                name: {
+                    "calls": entry["calls"],
+                    "errors": entry["errors"],
+                    "rows": entry["rows"],
+                    **{
+                        f"{phase}_ms_mean": round(histogram.total / histogram.count * 1000, 3) if histogram.count else 0.0
+                        for phase, histogram in entry["histograms"].items()
+                    }
+                }
+                for name, entry in self._tools.items()
+            }
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            tools = sorted(self._tools.items())
+            for metric, key, help_text in (
+                ("userbank_tool_calls_total", "calls", "Tool calls"),
+                ("userbank_tool_errors_total", "errors", "Tool calls that failed or returned an error result"),
+                ("userbank_tool_rows_total", "rows", "Rows returned or written by tool calls"),
+                ("userbank_tool_response_bytes_total", "response_bytes", "Encoded size of sampled tool responses"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, entry in tools:
+                    lines.append(f'{metric}{{tool="{name}"}} {entry[key]}')
+
+            metric = "userbank_tool_duration_seconds"
+            lines.append(f"# HELP {metric} Tool call latency by phase (total, db, render, serialization)")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, entry in tools:
+                for phase, histogram in entry["histograms"].items():
+                    labels = f'tool="{name}",phase="{phase}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{{labels}}} {histogram.total:.6f}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+
+        lines.append("# HELP userbank_process_start_time_seconds Start time of this server process")
+        lines.append("# TYPE userbank_process_start_time_seconds gauge")
+        lines.append(f"userbank_process_start_time_seconds {self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+_metrics_registry = None
+
+def get_metrics() -> MetricsRegistry:
+    """Get metrics registry configured from config.json (singleton pattern)"""
+    global _metrics_registry
+    if _metrics_registry is None:
+        metrics_config = {}
+        try:
+            from config_manager import get_config_manager
+            metrics_config = get_config_manager().get_metrics_config()
+        except ImportError:
+            pass
+        _metrics_registry = MetricsRegistry(
+            enabled=metrics_config.get('enabled', True),
+            serialization_sample_rate=metrics_config.get('serialization_sample_rate', 0.1)
+        )
+    return _metrics_registry
+
+
+def instrument_tool(func: Callable) -> Callable:
+    """Decorator for @mcp.tool() functions, recording into the global registry"""
+    return get_metrics().instrument(func)
@@ -0,0 +1,44 @@
+"""
+Shared pytest fixtures
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config_manager
+from Database.database import ProfileDatabase
+
+
+@pytest.fixture(autouse=True, scope='session')
+def isolated_config(tmp_path_factory):
+    """Keep the tests from creating config.json next to the sources"""
+    config_path = tmp_path_factory.mktemp('config') / 'config.json'
+    config_manager._config_manager = config_manager.ConfigManager(str(config_path))
+    yield
+    config_manager._config_manager = None
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    """Scratch database file"""
+    return str(tmp_path / 'profile_data.db')
+
+
+@pytest.fixture
+def make_db(db_path):
+    """Factory opening ProfileDatabase instances (on db_path by default), closed after the test"""
+    opened = []
+
+    def make(**kwargs) -> ProfileDatabase:
+        kwargs.setdefault('db_path', db_path)
+        db = ProfileDatabase(**kwargs)
+        opened.append(db)
+        return db
+
+    yield make
+    for db in opened:
+        db.close()
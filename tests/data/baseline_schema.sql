@@ -0,0 +1,211 @@
+BEGIN TRANSACTION;
+CREATE TABLE category (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    first_level TEXT NOT NULL,
+                    second_level TEXT NOT NULL,
+                    description TEXT,
+                    is_active BOOLEAN DEFAULT true,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP
+                );
+INSERT INTO "category" VALUES(1,'Technology','Programming Development','Software development related technologies',1,'public','2026-10-17T07:19:37.506453+08:00','2026-10-17T07:19:37.506453+08:00');
+INSERT INTO "category" VALUES(2,'Technology','System Architecture','System design and architecture',1,'public','2026-10-17T07:19:37.506531+08:00','2026-10-17T07:19:37.506531+08:00');
+INSERT INTO "category" VALUES(3,'Life','Interpersonal Relations','Interpersonal communication and relationship management',1,'public','2026-10-17T07:19:37.506550+08:00','2026-10-17T07:19:37.506550+08:00');
+INSERT INTO "category" VALUES(4,'Life','Health Management','Physical and mental health',1,'public','2026-10-17T07:19:37.506564+08:00','2026-10-17T07:19:37.506564+08:00');
+INSERT INTO "category" VALUES(5,'Business','Investment Finance','Investment and financial management',1,'public','2026-10-17T07:19:37.506575+08:00','2026-10-17T07:19:37.506575+08:00');
+INSERT INTO "category" VALUES(6,'Business','Entrepreneurship Management','Entrepreneurship and enterprise management',1,'public','2026-10-17T07:19:37.506586+08:00','2026-10-17T07:19:37.506586+08:00');
+INSERT INTO "category" VALUES(7,'Learning','Knowledge Management','Knowledge acquisition and management',1,'public','2026-10-17T07:19:37.506597+08:00','2026-10-17T07:19:37.506597+08:00');
+INSERT INTO "category" VALUES(8,'Learning','Skill Development','Personal skill development',1,'public','2026-10-17T07:19:37.506607+08:00','2026-10-17T07:19:37.506607+08:00');
+CREATE TABLE focus (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    priority INTEGER CHECK(priority >= 1 AND priority <= 10),
+                    status TEXT CHECK(status IN ('active', 'paused', 'completed')),
+                    context TEXT,
+                    keywords TEXT,
+                    source_app TEXT DEFAULT 'unknown',
+                    category_id INTEGER,
+                    deadline DATE,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP,
+                    FOREIGN KEY (category_id) REFERENCES category(id)
+                );
+CREATE TABLE goal (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    type TEXT CHECK(type IN ('long_term', 'short_term', 'plan', 'todo')),
+                    deadline DATE,
+                    status TEXT CHECK(status IN ('planning', 'in_progress', 'completed', 'abandoned')),
+                    keywords TEXT,
+                    source_app TEXT DEFAULT 'unknown',
+                    category_id INTEGER,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP,
+                    FOREIGN KEY (category_id) REFERENCES category(id)
+                );
+CREATE TABLE insight (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    source_people TEXT,
+                    keywords TEXT,
+                    source_app TEXT DEFAULT 'unknown',
+                    category_id INTEGER,
+                    reference_urls TEXT,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP,
+                    FOREIGN KEY (category_id) REFERENCES category(id)
+                );
+CREATE TABLE memory (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    memory_type TEXT CHECK(memory_type IN ('experience', 'event', 'learning', 'interaction', 'achievement', 'mistake')),
+                    importance INTEGER CHECK(importance >= 1 AND importance <= 10),
+                    related_people TEXT,
+                    location TEXT,
+                    memory_date DATE,
+                    keywords TEXT,
+                    source_app TEXT DEFAULT 'unknown',
+                    reference_urls TEXT,
+                    category_id INTEGER,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP,
+                    FOREIGN KEY (category_id) REFERENCES category(id)
+                );
+INSERT INTO "memory" VALUES(1,'每周复盘项目进度','event',7,NULL,NULL,NULL,'["复盘", "Work"]','unknown',NULL,NULL,'public','2026-10-17T07:19:37.509810+08:00','2026-10-17T07:19:37.509810+08:00');
+INSERT INTO "memory" VALUES(2,'Learned SQLite full-text search','learning',NULL,NULL,NULL,NULL,'["sqlite"]','unknown',NULL,NULL,'public','2026-10-17T07:19:37.511455+08:00','2026-10-17T07:19:37.511455+08:00');
+CREATE TABLE methodology (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    type TEXT,
+                    effectiveness TEXT CHECK(effectiveness IN ('proven', 'experimental', 'theoretical')),
+                    use_cases TEXT,
+                    keywords TEXT,
+                    source_app TEXT DEFAULT 'unknown',
+                    reference_urls TEXT,
+                    category_id INTEGER,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP,
+                    FOREIGN KEY (category_id) REFERENCES category(id)
+                );
+CREATE TABLE persona (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    gender TEXT,
+                    personality TEXT,
+                    avatar_url TEXT,
+                    bio TEXT,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP
+                );
+INSERT INTO "persona" VALUES(1,'User','Not Set','To be improved',NULL,'Personal profile to be improved','private','2026-10-17T07:19:37.506238+08:00','2026-10-17T07:19:37.506238+08:00');
+CREATE TABLE prediction (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    timeframe TEXT,
+                    basis TEXT,
+                    verification_status TEXT CHECK(verification_status IN ('pending', 'correct', 'incorrect', 'partial')),
+                    keywords TEXT,
+                    source_app TEXT DEFAULT 'unknown',
+                    reference_urls TEXT,
+                    category_id INTEGER,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP,
+                    FOREIGN KEY (category_id) REFERENCES category(id)
+                );
+CREATE TABLE preference (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    context TEXT,
+                    keywords TEXT,
+                    source_app TEXT DEFAULT 'unknown',
+                    category_id INTEGER,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP,
+                    FOREIGN KEY (category_id) REFERENCES category(id)
+                );
+CREATE TABLE relations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source_table TEXT NOT NULL,
+                    source_id INTEGER NOT NULL,
+                    target_table TEXT NOT NULL,
+                    target_id INTEGER NOT NULL,
+                    relation_type TEXT NOT NULL,
+                    strength TEXT CHECK(strength IN ('strong', 'medium', 'weak')),
+                    note TEXT,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP
+                );
+CREATE TABLE viewpoint (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    source_people TEXT,
+                    keywords TEXT,
+                    source_app TEXT DEFAULT 'unknown',
+                    related_event TEXT,
+                    reference_urls TEXT,
+                    category_id INTEGER,
+                    privacy_level TEXT CHECK(privacy_level IN ('public', 'private')) DEFAULT 'public',
+                    created_time TIMESTAMP,
+                    updated_time TIMESTAMP,
+                    FOREIGN KEY (category_id) REFERENCES category(id)
+                );
+INSERT INTO "viewpoint" VALUES(1,'Small commits are easier to review',NULL,'["work"]','unknown',NULL,NULL,NULL,'public','2026-10-17T07:19:37.512562+08:00','2026-10-17T07:19:37.512562+08:00');
+CREATE UNIQUE INDEX idx_persona_id ON persona(id);
+CREATE INDEX idx_persona_privacy ON persona(privacy_level);
+CREATE INDEX idx_category_levels ON category(first_level, second_level);
+CREATE INDEX idx_category_active ON category(is_active);
+CREATE INDEX idx_category_privacy ON category(privacy_level);
+CREATE INDEX idx_relations_source ON relations(source_table, source_id);
+CREATE INDEX idx_relations_target ON relations(target_table, target_id);
+CREATE INDEX idx_relations_type ON relations(relation_type);
+CREATE INDEX idx_relations_privacy ON relations(privacy_level);
+CREATE INDEX idx_viewpoint_source_people ON viewpoint(source_people);
+CREATE INDEX idx_viewpoint_source_app ON viewpoint(source_app);
+CREATE INDEX idx_viewpoint_category ON viewpoint(category_id);
+CREATE INDEX idx_viewpoint_privacy ON viewpoint(privacy_level);
+CREATE INDEX idx_insight_source_people ON insight(source_people);
+CREATE INDEX idx_insight_source_app ON insight(source_app);
+CREATE INDEX idx_insight_category ON insight(category_id);
+CREATE INDEX idx_insight_time ON insight(created_time);
+CREATE INDEX idx_insight_privacy ON insight(privacy_level);
+CREATE INDEX idx_focus_priority ON focus(priority);
+CREATE INDEX idx_focus_status ON focus(status);
+CREATE INDEX idx_focus_deadline ON focus(deadline);
+CREATE INDEX idx_focus_category ON focus(category_id);
+CREATE INDEX idx_focus_privacy ON focus(privacy_level);
+CREATE INDEX idx_goal_type ON goal(type);
+CREATE INDEX idx_goal_status ON goal(status);
+CREATE INDEX idx_goal_deadline ON goal(deadline);
+CREATE INDEX idx_goal_category ON goal(category_id);
+CREATE INDEX idx_goal_privacy ON goal(privacy_level);
+CREATE INDEX idx_preference_category ON preference(category_id);
+CREATE INDEX idx_preference_privacy ON preference(privacy_level);
+CREATE INDEX idx_methodology_type ON methodology(type);
+CREATE INDEX idx_methodology_effectiveness ON methodology(effectiveness);
+CREATE INDEX idx_methodology_category ON methodology(category_id);
+CREATE INDEX idx_methodology_privacy ON methodology(privacy_level);
+CREATE INDEX idx_prediction_timeframe ON prediction(timeframe);
+CREATE INDEX idx_prediction_verification ON prediction(verification_status);
+CREATE INDEX idx_prediction_category ON prediction(category_id);
+CREATE INDEX idx_prediction_privacy ON prediction(privacy_level);
+CREATE INDEX idx_memory_type ON memory(memory_type);
+CREATE INDEX idx_memory_importance ON memory(importance);
+CREATE INDEX idx_memory_date ON memory(memory_date);
+CREATE INDEX idx_memory_category ON memory(category_id);
+CREATE INDEX idx_memory_privacy ON memory(privacy_level);
+DELETE FROM "sqlite_sequence";
+INSERT INTO "sqlite_sequence" VALUES('persona',1);
+INSERT INTO "sqlite_sequence" VALUES('category',8);
+INSERT INTO "sqlite_sequence" VALUES('memory',2);
+INSERT INTO "sqlite_sequence" VALUES('viewpoint',1);
+COMMIT;
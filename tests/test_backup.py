@@ -0,0 +1,41 @@
+"""
+Tests for hot backups
+"""
+
+import sqlite3
+
+import config_manager
+from Database.backup import BackupManager
+from Database.database import get_open_database
+
+
+def test_backup_without_open_database_reads_the_file(make_db, db_path, tmp_path, monkeypatch):
+    db = make_db()
+    db.insert_record('memory', content='before the backup')
+    db.close()
+    # As in the multi-worker supervisor: the database is configured but not open here
+    monkeypatch.setattr(config_manager.get_config_manager(), 'get_database_path', lambda: db_path)
+
+    manager = BackupManager(directory=str(tmp_path / 'backups'))
+    result = manager.create_backup()
+
+    assert get_open_database() is None
+    connection = sqlite3.connect(result['path'])
+    try:
+        contents = [row[0] for row in connection.execute("SELECT content FROM memory")]
+    finally:
+        connection.close()
+    assert contents == ['before the backup']
+
+
+def test_backup_flushes_write_behind_queue(make_db, tmp_path):
+    db = make_db(write_behind={'enabled': True, 'ack_mode': 'enqueue', 'flush_interval_ms': 60000})
+    db.insert_record('memory', content='queued')
+
+    result = BackupManager(database=db, directory=str(tmp_path / 'backups')).create_backup()
+
+    connection = sqlite3.connect(result['path'])
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM memory WHERE content = 'queued'").fetchone()[0] == 1
+    finally:
+        connection.close()
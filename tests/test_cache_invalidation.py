@@ -0,0 +1,97 @@
+"""
+Tests for invalidation of the record and query result caches
+"""
+
+import subprocess
+import sys
+
+
+def commit_in_other_process(db_path: str, sql: str):
+    """Run a write in a separate Python process with its own SQLite connection"""
+    script = (
+        "import sqlite3, sys\n"
+        "connection = sqlite3.connect(sys.argv[1])\n"
+        "connection.execute(sys.argv[2])\n"
+        "connection.commit()\n"
+        "connection.close()\n"
+    )
+    subprocess.run([sys.executable, "-c", script, db_path, sql], check=True, timeout=30)
+
+
+def test_record_cache_sees_update_records(make_db):
+    db = make_db()
+    first = db.insert_record('memory', content='first')
+    second = db.insert_record('memory', content='second')
+    assert db.get_record('memory', first)['content'] == 'first'
+    assert db.get_record('memory', second)['content'] == 'second'
+
+    assert db.update_records('memory', [(first, {'content': 'first updated'}),
+                                        (second, {'importance': 9})]) == [True, True]
+
+    assert db.get_record('memory', first)['content'] == 'first updated'
+    assert db.get_record('memory', second)['importance'] == 9
+
+
+def test_record_cache_sees_custom_sql_write(make_db):
+    db = make_db()
+    record_id = db.insert_record('memory', content='before')
+    assert db.get_persona()['name'] == 'User'
+    assert db.get_record('memory', record_id)['content'] == 'before'
+
+    assert db.execute_custom_sql("UPDATE memory SET content = ? WHERE id = ?", ['after', record_id])['success']
+    assert db.execute_custom_sql("UPDATE persona SET name = ? WHERE id = 1", ['Renamed'])['success']
+
+    assert db.get_record('memory', record_id)['content'] == 'after'
+    assert db.get_persona()['name'] == 'Renamed'
+
+
+def test_record_cache_sees_commit_of_other_process(make_db, db_path):
+    db = make_db()
+    record_id = db.insert_record('memory', content='before')
+    assert db.get_record('memory', record_id)['content'] == 'before'
+
+    commit_in_other_process(db_path, f"UPDATE memory SET content = 'after' WHERE id = {record_id}")
+
+    assert db.get_record('memory', record_id)['content'] == 'after'
+
+
+def test_query_cache_sees_update_records(make_db):
+    db = make_db()
+    ids = db.insert_records('memory', [{'content': 'draft', 'importance': 1} for _ in range(3)])
+    assert db.query_page('memory', {'importance_gte': 5})['total_count'] == 0
+    assert db.query_page('memory', {'content_match': 'draft'})['total_count'] == 3
+
+    db.update_records('memory', [(ids[0], {'importance': 7}), (ids[1], {'content': 'final'})])
+
+    assert [record['id'] for record in db.query_page('memory', {'importance_gte': 5})['records']] == [ids[0]]
+    assert db.query_page('memory', {'content_match': 'draft'})['total_count'] == 2
+
+
+def test_query_cache_sees_custom_sql_write(make_db):
+    db = make_db()
+    db.insert_record('memory', content='kept')
+    db.insert_record('viewpoint', content='removed')
+    assert db.query_page('memory')['total_count'] == 1
+    assert db.get_row_count('viewpoint') == 1
+
+    assert db.execute_custom_sql("INSERT INTO memory (content) VALUES (?)", ['added'])['success']
+    assert db.execute_custom_sql("DELETE FROM viewpoint")['success']
+
+    assert {record['content'] for record in db.query_page('memory')['records']} == {'kept', 'added'}
+    assert db.get_row_count('viewpoint') == 0
+    assert db.query_page('viewpoint')['records'] == []
+
+
+def test_query_cache_sees_commit_of_other_process(make_db, db_path):
+    db = make_db()
+    db.insert_record('memory', content='local')
+    assert db.query_page('memory')['total_count'] == 1
+    assert db.get_row_count('memory') == 1
+
+    commit_in_other_process(db_path, "INSERT INTO memory (content) VALUES ('external')")
+
+    page = db.query_page('memory')
+    assert page['total_count'] == 2
+    assert {record['content'] for record in page['records']} == {'local', 'external'}
+    assert db.get_row_count('memory') == 2
+    assert db.query_page('memory', {'content_match': 'external'})['total_count'] == 1
@@ -0,0 +1,86 @@
+"""
+Tests for keyset cursor pagination
+"""
+
+import pytest
+
+
+def collect_pages(db, table_name, filter_conditions=None, page_size=3, **kwargs):
+    """IDs of all pages, following next_cursor until the last page"""
+    ids = []
+    cursor = None
+    while True:
+        page = db.query_page(table_name, filter_conditions, limit=page_size, cursor=cursor, **kwargs)
+        ids.extend(record['id'] for record in page['records'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def offset_pages(db, table_name, filter_conditions=None, page_size=3, **kwargs):
+    """IDs of all pages read with limit/offset"""
+    ids = []
+    offset = 0
+    while True:
+        page = db.query_page(table_name, filter_conditions, limit=page_size, offset=offset, **kwargs)
+        if not page['records']:
+            return ids
+        ids.extend(record['id'] for record in page['records'])
+        offset += page_size
+
+
+@pytest.fixture
+def db(make_db):
+    db = make_db()
+    # Repeated and missing importance values, identical texts for tied relevance scores
+    importances = [5, None, 5, 8, None, 1, 5, None, 8, 3, None, 5, 1]
+    for index, importance in enumerate(importances):
+        db.insert_record('memory', content=f'weekly review note {index % 3}', importance=importance)
+    return db
+
+
+@pytest.mark.parametrize('sort_order', ['asc', 'desc'])
+def test_null_sort_values_page_without_duplicates_or_gaps(db, sort_order):
+    ids = collect_pages(db, 'memory', sort_by='importance', sort_order=sort_order)
+
+    assert len(ids) == len(set(ids)) == 13
+    assert ids == offset_pages(db, 'memory', sort_by='importance', sort_order=sort_order)
+
+
+@pytest.mark.parametrize('sort_order', ['asc', 'desc'])
+def test_relevance_sort_pages_without_duplicates_or_gaps(db, sort_order):
+    db.insert_record('memory', content='weekly review weekly review')
+    db.insert_record('memory', content='unrelated')
+    filter_conditions = {'content_match': 'weekly review'}
+
+    ids = collect_pages(db, 'memory', filter_conditions, sort_by='relevance', sort_order=sort_order)
+
+    assert len(ids) == len(set(ids)) == 14
+    assert ids == offset_pages(db, 'memory', filter_conditions, sort_by='relevance', sort_order=sort_order)
+
+
+@pytest.mark.parametrize('page_size', [1, 4, 13, 20])
+def test_page_size_does_not_change_order(db, page_size):
+    expected = offset_pages(db, 'memory', page_size=50, sort_by='importance')
+    assert collect_pages(db, 'memory', page_size=page_size, sort_by='importance') == expected
+
+
+def test_rows_inserted_between_pages_are_not_repeated(db):
+    first = db.query_page('memory', limit=5, sort_by='importance', sort_order='asc')
+    db.insert_record('memory', content='late note', importance=None)
+
+    ids = [record['id'] for record in first['records']]
+    cursor = first['next_cursor']
+    while cursor:
+        page = db.query_page('memory', limit=5, sort_by='importance', sort_order='asc', cursor=cursor)
+        ids.extend(record['id'] for record in page['records'])
+        cursor = page['next_cursor']
+
+    assert len(ids) == len(set(ids))
+    assert set(range(1, 14)) <= set(ids)
+
+
+def test_cursor_rejects_other_sort_order(db):
+    page = db.query_page('memory', limit=3, sort_by='importance')
+    with pytest.raises(ValueError):
+        db.query_page('memory', limit=3, sort_by='created_time', cursor=page['next_cursor'])
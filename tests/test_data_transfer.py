@@ -0,0 +1,56 @@
+"""
+Tests for NDJSON export/import through the MCP-facing DatabaseTools
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from Database.data_transfer import exports_directory, resolve_export_file
+from tools.database_tools import DatabaseTools
+
+
+@pytest.mark.parametrize('file_name', [
+    '../outside.ndjson', '..', 'sub/dir.ndjson', 'sub\\dir.ndjson', '/tmp/absolute.ndjson',
+    'C:evil.ndjson', ''
+])
+def test_rejects_names_outside_exports_directory(make_db, file_name):
+    db = make_db()
+    with pytest.raises(ValueError):
+        resolve_export_file(db, file_name)
+
+    tools = DatabaseTools(database=db)
+    assert tools.import_data(file_name)['success'] is False
+    if file_name:
+        assert tools.export_data(file_name)['success'] is False
+
+
+def test_rejects_symlink_leading_out(make_db, tmp_path):
+    db = make_db()
+    directory = exports_directory(db)
+    directory.mkdir()
+    os.symlink(tmp_path / 'elsewhere.ndjson', directory / 'link.ndjson')
+
+    with pytest.raises(ValueError):
+        resolve_export_file(db, 'link.ndjson')
+
+
+def test_export_import_round_trip_by_file_name(make_db, db_path, tmp_path):
+    db = make_db()
+    db.insert_record('memory', content='exported memory', keywords=['export'])
+    tools = DatabaseTools(database=db)
+
+    result = tools.export_data('snapshot.ndjson', ['memory'])
+    assert result['success'] is True
+    assert Path(result['path']) == Path(db_path).parent / 'exports' / 'snapshot.ndjson'
+
+    (tmp_path / 'other').mkdir()
+    target = make_db(db_path=str(tmp_path / 'other' / 'target.db'))
+    exports_directory(target).mkdir()
+    shutil.copy(result['path'], exports_directory(target))
+    result = DatabaseTools(database=target).import_data('snapshot.ndjson')
+    assert result['success'] is True
+    records, total = target.query_records('memory', {'keywords_contain_any': ['export']})
+    assert total == 1 and records[0]['content'] == 'exported memory'
@@ -0,0 +1,78 @@
+"""
+Tests for cross-process cache invalidation through PRAGMA data_version
+"""
+
+import threading
+import time
+
+
+def test_cached_reads_do_not_wait_for_open_write_transaction(make_db):
+    db = make_db()
+    record_id = db.insert_record('memory', content='cached memory')
+    db.get_record('memory', record_id)
+
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold_transaction():
+        with db.transaction():
+            db.insert_record('memory', content='uncommitted memory')
+            entered.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=hold_transaction)
+    writer.start()
+    assert entered.wait(5)
+    try:
+        start = time.perf_counter()
+        assert db.get_record('memory', record_id)['content'] == 'cached memory'
+        assert db.get_persona()['id'] == 1
+        assert db.get_row_count('memory') == 1
+        assert db.query_page('memory')['total_count'] == 1
+        elapsed = time.perf_counter() - start
+    finally:
+        release.set()
+        writer.join()
+
+    assert elapsed < 0.5
+    assert db.get_row_count('memory') == 2
+
+
+def test_own_commits_are_not_external(make_db):
+    db = make_db()
+    for index in range(5):
+        db.insert_record('memory', content=f'memory {index}')
+        db.get_row_count('memory')
+    with db.transaction():
+        db.insert_record('memory', content='in transaction')
+    db.get_row_count('memory')
+
+    assert db.external_invalidations == 0
+
+
+def test_commit_of_other_connection_invalidates_caches(make_db):
+    db = make_db()
+    other = make_db()
+    record_id = db.insert_record('memory', content='before')
+    assert db.get_record('memory', record_id)['content'] == 'before'
+    assert db.get_row_count('memory') == 1
+
+    other.update_record('memory', record_id, content='after')
+    other.insert_record('memory', content='second')
+
+    assert db.get_record('memory', record_id)['content'] == 'after'
+    assert db.get_row_count('memory') == 2
+    assert db.external_invalidations >= 1
+
+
+def test_commit_of_other_connection_during_local_write_is_detected(make_db):
+    db = make_db()
+    other = make_db()
+    record_id = db.insert_record('memory', content='before')
+    db.get_record('memory', record_id)
+
+    # The other commit lands between two local commits without a read in between
+    other.update_record('memory', record_id, content='after')
+    db.insert_record('viewpoint', content='local write')
+
+    assert db.get_record('memory', record_id)['content'] == 'after'
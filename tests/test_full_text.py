@@ -0,0 +1,127 @@
+"""
+Tests for FTS5 full-text filters, including two-character terms
+"""
+
+import sqlite3
+
+import pytest
+
+CONTENTS = [
+    '每周复盘一次',
+    '复盘',
+    '项目需要复盘',
+    '周末去上海',
+    'Weekly Review',
+    '上海复盘会议',
+]
+
+
+@pytest.fixture
+def db(make_db):
+    db = make_db()
+    for content in CONTENTS:
+        db.insert_record('memory', content=content)
+    return db
+
+
+def like_ids(db, term):
+    """IDs the unindexed LIKE filter finds"""
+    with db._connections.read() as cursor:
+        cursor.execute("SELECT id FROM memory WHERE content LIKE ?", (f"%{term}%",))
+        return {row[0] for row in cursor.fetchall()}
+
+
+def page_ids(db, filter_conditions, **kwargs):
+    return {record['id'] for record in db.query_page('memory', filter_conditions, **kwargs)['records']}
+
+
+@pytest.mark.parametrize('term', ['复盘', '上海', '一次', 're', 'RE', '会议', '无关'])
+def test_two_character_terms_find_same_rows_as_like(db, term):
+    expected = like_ids(db, term)
+    assert page_ids(db, {'content_contains': term}) == expected
+    assert page_ids(db, {'content_match': term}) == expected
+    assert page_ids(db, {'text_match': term}) == expected
+
+
+def test_two_character_terms_use_the_index(db):
+    tokens = db._expand_short_term('memory', '复盘')
+    assert tokens and all(token.startswith('复盘') for token in tokens)
+    assert db._expand_short_term('memory', '复') is None
+
+    with db._connections.read() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN SELECT id FROM memory WHERE id IN "
+                       "(SELECT rowid FROM memory_fts WHERE memory_fts MATCH ?)", (f'"{tokens[0]}"',))
+        plan = ' '.join(row[3] for row in cursor.fetchall())
+    assert 'VIRTUAL TABLE INDEX' in plan
+
+
+def test_index_follows_updates_and_deletes(db):
+    record_id = db.insert_record('memory', content='新的复盘')
+    assert record_id in page_ids(db, {'content_match': '复盘'})
+
+    db.update_record('memory', record_id, content='已修改')
+    assert record_id not in page_ids(db, {'content_match': '复盘'})
+    assert record_id in page_ids(db, {'content_contains': '修改'})
+
+    db.delete_record('memory', record_id)
+    assert record_id not in page_ids(db, {'content_contains': '修改'})
+
+
+def test_common_pairs_fall_back_to_like(make_db, monkeypatch):
+    db = make_db()
+    monkeypatch.setattr('Database.database.MAX_SHORT_TERM_EXPANSIONS', 2)
+    for content in ('ab1', 'ab2', 'ab3', 'xab'):
+        db.insert_record('memory', content=content)
+
+    assert db._expand_short_term('memory', 'ab') is None
+    assert len(page_ids(db, {'content_match': 'ab'})) == 4
+
+
+def test_relevance_ranks_two_character_terms(db):
+    page = db.query_page('memory', {'content_match': '复盘'}, sort_by='relevance')
+    assert page['relevance_fallback'] is False
+    assert {record['id'] for record in page['records']} == like_ids(db, '复盘')
+
+
+def test_relevance_without_indexed_term_is_flagged(db):
+    page = db.query_page('memory', {'content_match': '复'}, sort_by='relevance')
+    assert page['relevance_fallback'] is True
+    assert {record['id'] for record in page['records']} == like_ids(db, '复')
+
+    assert db.query_page('memory', {'content_match': '复'})['relevance_fallback'] is False
+
+
+def test_migrates_index_without_end_markers(make_db, db_path):
+    db = make_db()
+    db.insert_record('memory', content='复盘')
+    db.close()
+
+    # Index layout before schema version 5
+    connection = sqlite3.connect(db_path)
+    connection.executescript("""
+        DROP TABLE memory_fts_vocab;
+        DROP TABLE memory_fts;
+        CREATE VIRTUAL TABLE memory_fts USING fts5(content, content='memory', content_rowid='id', tokenize='trigram');
+        INSERT INTO memory_fts(memory_fts) VALUES ('rebuild');
+        PRAGMA user_version = 4;
+    """)
+    connection.close()
+
+    db = make_db()
+    assert db.schema_version == 5
+    assert len(page_ids(db, {'content_match': '复盘'})) == 1
+
+
+def test_insert_or_replace_through_custom_sql_updates_index(db):
+    record_id = db.insert_record('memory', content='街角的咖啡馆')
+    assert record_id in page_ids(db, {'content_contains': '啡馆'})
+
+    result = db.execute_custom_sql("INSERT OR REPLACE INTO memory (id, content) VALUES (?, ?)",
+                                   [record_id, 'replaced'])
+    assert result['success'] is True
+
+    assert record_id not in page_ids(db, {'content_contains': '啡馆'})
+    assert record_id not in page_ids(db, {'content_match': '咖啡馆'})
+    assert record_id in page_ids(db, {'content_match': 'replaced'})
+    # Raises when the index holds text the table no longer has
+    db.connection.execute("INSERT INTO memory_fts(memory_fts, rank) VALUES ('integrity-check', 1)")
@@ -0,0 +1,151 @@
+"""
+Tests for group-commit write-behind mode
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+
+def committed_contents(db_path: str) -> set:
+    """Memory contents visible to a fresh connection, i.e. committed to the database file"""
+    connection = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in connection.execute("SELECT content FROM memory")}
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def enqueue_db(make_db):
+    """Write-behind database that only commits on flush"""
+    return make_db(write_behind={'enabled': True, 'ack_mode': 'enqueue',
+                                 'flush_interval_ms': 60000, 'max_batch_rows': 10000})
+
+
+def test_failed_write_rolls_back_only_its_savepoint(enqueue_db, db_path):
+    db = enqueue_db
+    db.insert_record('memory', content='before')
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.insert_record('memory', content='rolled back')
+            raise RuntimeError("abort transaction")
+    with pytest.raises(sqlite3.IntegrityError):
+        db.insert_records('memory', [{'content': 'batch ok'}, {'content': 'batch bad', 'privacy_level': 'bogus'}])
+    db.insert_record('memory', content='after')
+
+    # The shared transaction holds the successful writes only
+    assert {row[0] for row in db.connection.execute("SELECT content FROM memory")} == {'before', 'after'}
+    assert committed_contents(db_path) == set()
+
+    committer = db._connections.group_committer
+    commits = committer.commits
+    db.flush()
+    assert committer.commits == commits + 1
+    assert committed_contents(db_path) == {'before', 'after'}
+
+
+def test_enqueue_ack_is_durable_after_flush_or_close(enqueue_db, make_db, db_path):
+    enqueue_db.insert_record('memory', content='first')
+    assert committed_contents(db_path) == set()
+
+    enqueue_db.flush()
+    assert committed_contents(db_path) == {'first'}
+
+    enqueue_db.insert_record('memory', content='second')
+    start = time.perf_counter()
+    enqueue_db.close()
+    # The committer thread stops without waiting out the flush interval
+    assert time.perf_counter() - start < 5
+    assert committed_contents(db_path) == {'first', 'second'}
+
+
+def test_commit_ack_is_durable_on_return(make_db, db_path):
+    db = make_db(write_behind={'enabled': True, 'ack_mode': 'commit', 'flush_interval_ms': 20})
+
+    db.insert_record('memory', content='single')
+    assert committed_contents(db_path) == {'single'}
+
+    db.insert_records('memory', [{'content': 'bulk 1'}, {'content': 'bulk 2'}])
+    assert committed_contents(db_path) == {'single', 'bulk 1', 'bulk 2'}
+
+
+def test_concurrent_commit_acks_share_commits(make_db, db_path):
+    db = make_db(write_behind={'enabled': True, 'ack_mode': 'commit', 'flush_interval_ms': 50})
+    committer = db._connections.group_committer
+    commits = committer.commits
+    start = threading.Barrier(8)
+    durable = []
+
+    def write(thread_index: int):
+        start.wait()
+        for index in range(5):
+            content = f'thread {thread_index} write {index}'
+            db.insert_record('memory', content=content)
+            # Acknowledged writes are already committed
+            durable.append(content in committed_contents(db_path))
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(durable) == 40 and all(durable)
+    assert committer.commits - commits < 40
+
+
+def test_write_racing_close_is_never_acknowledged_uncommitted(make_db, db_path):
+    make_db().close()  # Schema first, its migration write would wait out the flush interval
+    db = make_db(write_behind={'enabled': True, 'ack_mode': 'commit', 'flush_interval_ms': 60000})
+    committer = db._connections.group_committer
+    flush = committer.flush
+    outcome = {}
+
+    def write():
+        try:
+            db.insert_record('memory', content='racing write')
+            outcome['acknowledged'] = True
+        except Exception as e:
+            outcome['error'] = e
+
+    def flush_then_write():
+        # A write arriving right after the final flush of close()
+        flush()
+        if 'thread' not in outcome:
+            outcome['thread'] = threading.Thread(target=write)
+            outcome['thread'].start()
+            outcome['thread'].join(0.5)
+
+    committer.flush = flush_then_write
+    db.close()
+    outcome['thread'].join(5)
+
+    assert outcome.get('acknowledged') or 'error' in outcome
+    if outcome.get('acknowledged'):
+        assert committed_contents(db_path) == {'racing write'}
+    else:
+        assert committed_contents(db_path) == set()
+
+
+def test_pending_commit_ack_is_committed_by_close(make_db, db_path):
+    make_db().close()  # Schema first, its migration write would wait out the flush interval
+    db = make_db(write_behind={'enabled': True, 'ack_mode': 'commit', 'flush_interval_ms': 60000})
+    committer = db._connections.group_committer
+    acknowledged = threading.Event()
+
+    writer = threading.Thread(target=lambda: db.insert_record('memory', content='pending') and acknowledged.set())
+    writer.start()
+    deadline = time.monotonic() + 5
+    while committer.get_stats()['pending_writes'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not acknowledged.is_set()
+
+    db.close()
+    writer.join(5)
+
+    assert acknowledged.is_set()
+    assert committed_contents(db_path) == {'pending'}
@@ -0,0 +1,44 @@
+"""
+Tests for the record_keyword inverted index
+"""
+
+import json
+
+
+def indexed_keywords(db, table_name: str, record_id: int) -> set:
+    """Keywords the index holds for a record"""
+    with db._connections.read() as cursor:
+        cursor.execute("SELECT keyword FROM record_keyword WHERE table_name = ? AND record_id = ?",
+                       (table_name, record_id))
+        return {row[0] for row in cursor.fetchall()}
+
+
+def matching_ids(db, keywords: list) -> set:
+    records, _ = db.query_records('memory', {'keywords_contain_any': keywords})
+    return {record['id'] for record in records}
+
+
+def test_index_follows_inserts_updates_and_deletes(make_db):
+    db = make_db()
+    record_id = db.insert_record('memory', content='note', keywords=['Python', ' work '])
+    assert indexed_keywords(db, 'memory', record_id) == {'python', 'work'}
+
+    db.update_record('memory', record_id, keywords=['阅读'])
+    assert indexed_keywords(db, 'memory', record_id) == {'阅读'}
+
+    db.delete_record('memory', record_id)
+    assert indexed_keywords(db, 'memory', record_id) == set()
+
+
+def test_insert_or_replace_through_custom_sql_updates_index(make_db):
+    db = make_db()
+    record_id = db.insert_record('memory', content='note', keywords=['old'])
+    assert matching_ids(db, ['old']) == {record_id}
+
+    result = db.execute_custom_sql("INSERT OR REPLACE INTO memory (id, content, keywords) VALUES (?, ?, ?)",
+                                   [record_id, 'replaced', json.dumps(['new'])])
+    assert result['success'] is True
+
+    assert indexed_keywords(db, 'memory', record_id) == {'new'}
+    assert matching_ids(db, ['old']) == set()
+    assert matching_ids(db, ['new']) == {record_id}
@@ -0,0 +1,64 @@
+"""
+Tests for per-tool metrics
+"""
+
+import asyncio
+import threading
+
+import metrics
+from metrics import MetricsRegistry
+
+
+def wait_for_samples(registry: MetricsRegistry):
+    """Block until the serialization samples submitted so far are recorded"""
+    if registry._sampler is not None:
+        registry._sampler.submit(lambda: None).result(timeout=5)
+
+
+def test_serialization_is_sampled_off_the_calling_thread(monkeypatch):
+    registry = MetricsRegistry(serialization_sample_rate=1.0)
+    encoded_on = []
+
+    def encode(result):
+        encoded_on.append(threading.current_thread())
+        return b'{"rows": []}'
+
+    monkeypatch.setattr(metrics, 'encode_result', encode)
+
+    @registry.instrument
+    async def query_tool():
+        return {"rows": []}
+
+    caller = threading.current_thread()
+    for _ in range(3):
+        assert asyncio.run(query_tool()) == {"rows": []}
+    wait_for_samples(registry)
+
+    assert len(encoded_on) == 3 and caller not in encoded_on
+    entry = registry._tools['query_tool']
+    assert entry["calls"] == 3
+    assert entry["response_bytes"] == 3 * len(b'{"rows": []}')
+    assert entry["histograms"]["serialization"].count == 3
+    assert 'userbank_tool_duration_seconds_count{tool="query_tool",phase="serialization"} 3' \
+        in registry.render_prometheus()
+
+
+def test_sample_rate_limits_encoded_calls(monkeypatch):
+    registry = MetricsRegistry(serialization_sample_rate=0.25)
+    encoded = []
+    monkeypatch.setattr(metrics, 'encode_result', lambda result: encoded.append(result) or b'{}')
+
+    @registry.instrument
+    async def tool():
+        return {}
+
+    for _ in range(8):
+        asyncio.run(tool())
+    wait_for_samples(registry)
+
+    assert len(encoded) == 2
+    assert registry._tools['tool']["histograms"]["total"].count == 8
+
+
+def test_encode_result_matches_tool_serializer():
+    assert metrics.encode_result({"text": "复盘", "count": 1}) == '{"text":"复盘","count":1}'.encode('utf-8')
@@ -0,0 +1,84 @@
+"""
+Tests for PRAGMA user_version schema migrations
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from Database.migrations import SCHEMA_VERSION
+
+# Dump of a database created by the original, unversioned schema (user_version 0)
+BASELINE_SQL = Path(__file__).parent / 'data' / 'baseline_schema.sql'
+
+
+@pytest.fixture
+def baseline_db(db_path) -> str:
+    connection = sqlite3.connect(db_path)
+    connection.executescript(BASELINE_SQL.read_text(encoding='utf-8'))
+    connection.close()
+    return db_path
+
+
+def schema_objects(db_path: str) -> dict:
+    connection = sqlite3.connect(db_path)
+    try:
+        return dict(connection.execute("SELECT name, type FROM sqlite_master").fetchall())
+    finally:
+        connection.close()
+
+
+def test_baseline_database_is_migrated_to_current_version(baseline_db, make_db):
+    assert SCHEMA_VERSION >= 4
+    db = make_db()
+
+    assert db.schema_version == SCHEMA_VERSION
+    with db._connections.read() as cursor:
+        assert cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        # Default data is not inserted twice
+        assert cursor.execute("SELECT COUNT(*) FROM persona").fetchone()[0] == 1
+        assert cursor.execute("SELECT COUNT(*) FROM category").fetchone()[0] == 8
+
+    objects = schema_objects(baseline_db)
+    assert objects['memory_fts'] == 'table'
+    assert objects['record_keyword'] == 'table'
+    assert objects['idx_memory_created'] == 'index'
+
+
+def test_existing_rows_are_indexed(baseline_db, make_db):
+    db = make_db()
+
+    assert db.get_record('memory', 1)['keywords'] == ['复盘', 'Work']
+    records, total = db.query_records('memory', {'text_match': 'full-text'})
+    assert total == 1 and records[0]['id'] == 2
+    records, total = db.query_records('memory', {'content_match': '复盘'})
+    assert total == 1 and records[0]['id'] == 1
+    _, total = db.query_records('viewpoint', {'keywords_contain_any': ['WORK']})
+    assert total == 1
+    _, total = db.query_records('memory', {'keywords_contain_all': ['work', '复盘']})
+    assert total == 1
+
+
+def test_current_database_is_not_migrated_again(baseline_db, make_db, capsys):
+    make_db().close()
+    capsys.readouterr()
+
+    db = make_db()
+    assert db.schema_version == SCHEMA_VERSION
+    assert 'Applied schema migration' not in capsys.readouterr().err
+
+
+def test_migration_resumes_from_stored_version(baseline_db, make_db, capsys):
+    make_db().close()
+    connection = sqlite3.connect(baseline_db)
+    connection.executescript("DROP INDEX idx_memory_created; PRAGMA user_version = 3;")
+    connection.close()
+    capsys.readouterr()
+
+    db = make_db()
+    applied = [line for line in capsys.readouterr().err.splitlines() if 'Applied schema migration' in line]
+    assert applied[0].startswith('Applied schema migration 4:')
+    assert len(applied) == SCHEMA_VERSION - 3
+    assert schema_objects(baseline_db)['idx_memory_created'] == 'index'
+    assert db.get_record('memory', 1)['content'] == '每周复盘项目进度'
@@ -0,0 +1,84 @@
+"""
+Tests for max_tokens / max_chars response budgets of the query tools
+"""
+
+import json
+
+import pytest
+
+from tools.base import estimate_tokens
+from tools.memory_tools import MemoryTools
+
+
+def response_text(response: dict) -> str:
+    """Everything a budgeted response sends: rendered content and raw records"""
+    text = response.get('content', '')
+    for record in response.get('raw_data', []):
+        text += json.dumps(record, ensure_ascii=False, default=str)
+    return text
+
+
+@pytest.fixture
+def tools(make_db):
+    db = make_db()
+    for index in range(30):
+        db.insert_record('memory', content=f'第{index}次周会复盘：整理项目进度、风险和下周的工作计划。' * 3,
+                         importance=index % 10 + 1)
+    return MemoryTools(database=db)
+
+
+def test_estimate_tokens_by_script():
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('abcdefgh') == 2
+    assert estimate_tokens('abcde') == 2
+    assert estimate_tokens('周会复盘') == 4
+    assert estimate_tokens('周会 review。') == 3 + 2
+
+
+@pytest.mark.parametrize('response_format', ['markdown', 'raw', 'compact', 'both'])
+def test_cjk_results_stay_within_max_tokens(tools, response_format):
+    response = tools.query_memories(max_tokens=600, response_format=response_format)
+
+    assert response['next_cursor'] is not None
+    assert response['raw_data' if response_format == 'raw' else 'content']
+    assert estimate_tokens(response_text(response)) <= 600
+
+
+def test_both_budgets_apply(tools):
+    by_tokens = tools.query_memories(max_tokens=400, response_format='markdown')
+    by_chars = tools.query_memories(max_chars=2000, response_format='markdown')
+    both = tools.query_memories(max_tokens=400, max_chars=2000, response_format='markdown')
+
+    assert len(both['content']) <= 2000 and estimate_tokens(both['content']) <= 400
+    assert both['next_cursor'] in (by_tokens['next_cursor'], by_chars['next_cursor'])
+
+
+def test_oversized_record_is_shortened_to_the_token_budget(tools):
+    response = tools.query_memories(max_tokens=120, response_format='raw', limit=1)
+
+    assert response['truncated'] is True
+    assert response['raw_data'][0]['content'].endswith('…')
+    assert estimate_tokens(response_text(response)) <= 120
+
+
+@pytest.mark.parametrize('response_format', ['markdown', 'raw', 'compact', 'both'])
+def test_budget_below_page_overhead_returns_no_records(tools, response_format):
+    response = tools.query_memories(max_tokens=20, response_format=response_format)
+
+    assert response['budget_too_small'] is True
+    assert response.get('raw_data', []) == []
+    assert 'content' not in response
+    assert response['next_cursor'] is None
+
+
+def test_cursor_does_not_skip_record_that_did_not_fit(tools):
+    first = tools.query_memories(limit=2, response_format='raw')
+    expected_next = tools.query_memories(limit=1, response_format='raw', cursor=first['next_cursor'])
+
+    too_small = tools.query_memories(max_chars=50, response_format='raw', cursor=first['next_cursor'])
+    assert too_small['budget_too_small'] is True and too_small['raw_data'] == []
+    assert too_small['next_cursor'] == first['next_cursor']
+
+    retried = tools.query_memories(max_chars=5000, response_format='raw', cursor=too_small['next_cursor'])
+    assert retried['raw_data'][0] == expected_next['raw_data'][0]
+    assert 'budget_too_small' not in retried
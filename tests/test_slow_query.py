@@ -0,0 +1,25 @@
+"""
+Tests for the slow query log
+"""
+
+import time
+
+
+def test_page_query_duration_excludes_row_processing(make_db, monkeypatch):
+    db = make_db(slow_query={"threshold_ms": 0, "explain": False})
+    for i in range(3):
+        db.insert_record('memory', content=f'note {i}')
+
+    decode = db._decode_record
+
+    def slow_decode(row):
+        time.sleep(0.1)
+        return decode(row)
+
+    monkeypatch.setattr(db, '_decode_record', slow_decode)
+    db.slow_queries.clear()
+    assert len(db.query_page('memory', {}, count_mode='none')['records']) == 3
+
+    entry = next(entry for entry in db.slow_queries.get_entries() if 'FROM memory' in entry['sql'])
+    assert entry['rows'] == 3
+    assert entry['duration_ms'] < 100
@@ -0,0 +1,99 @@
+"""
+Tests for the multi-worker server mode of main_sse.py
+"""
+
+import asyncio
+import json
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from config_manager import ConfigManager
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+pytestmark = [pytest.mark.slow, pytest.mark.integration]
+
+fastmcp = pytest.importorskip("fastmcp")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Server did not listen on port {port}")
+
+
+@pytest.fixture
+def server(tmp_path):
+    """main_sse.py with 2 workers, run from a copy of the sources so config.json stays in tmp_path"""
+    app_dir = tmp_path / "app"
+    shutil.copytree(PROJECT_DIR, app_dir, ignore=shutil.ignore_patterns(
+        '.git', 'tests', 'benchmarks', '__pycache__', 'config.json', '*.db', '*.db-*', 'exports', 'backups'))
+
+    port = free_port()
+    config = ConfigManager(str(tmp_path / "defaults.json")).config
+    config["database"]["path"] = str(tmp_path)
+    config["server"].update({"host": "127.0.0.1", "port": port, "workers": 2, "graceful_shutdown_timeout": 5})
+    (app_dir / "config.json").write_text(json.dumps(config), encoding="utf-8")
+
+    process = subprocess.Popen([sys.executable, str(app_dir / "main_sse.py")], cwd=app_dir,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port, process)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def call_tool(url: str, name: str, arguments: dict = None) -> dict:
+    """Call a tool over a new client connection, so calls are spread over the workers"""
+    async with fastmcp.Client(f"{url}/mcp") as client:
+        result = await client.call_tool(name, arguments or {})
+        return result.data if result.data is not None else result.structured_content
+
+
+def test_two_workers_complete_tool_calls(server):
+    async def scenario():
+        saved = await call_tool(server, "save_persona", {"name": "Worker Test"})
+        # Several fresh connections reach both workers; each sees the committed write
+        personas = [await call_tool(server, "get_persona") for _ in range(8)]
+        return saved, personas
+
+    saved, personas = asyncio.run(scenario())
+
+    assert saved["operation"] == "updated"
+    assert all(persona["raw_data"]["name"] == "Worker Test" for persona in personas)
+
+
+def test_metrics_are_not_served_by_several_workers(server):
+    # Every worker counts its own calls, scrapes would jump between them
+    try:
+        urllib.request.urlopen(f"{server}/metrics", timeout=10)
+        status = 200
+    except urllib.error.HTTPError as e:
+        status = e.code
+    assert status == 404
@@ -2,12 +2,13 @@
 Base tool classes and common functions
 """
 
-from typing import Any, Dict, List
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
-from Database.database import get_database
-
-# Get database instance
-db = get_database()
+from Database.database import ProfileDatabase, get_database
+from metrics import record_rows, track
 
 # Define mapping of all table names and English descriptions
 TABLE_DESCRIPTIONS = {
@@ -27,46 +28,177 @@ TABLE_DESCRIPTIONS = {
     'memory': 'Memories'
 }
 
-def generate_prompt_content(template: str, data: Any) -> str:
-    """Generate template-based prompt content"""
-    if isinstance(data, list):
-        if not data:
-            return template.replace("{{#each raw_data}}", "").replace("{{/each}}", "").replace("{{#if (eq raw_data.length 0)}}", "").replace("{{/if}}", "No records found matching the criteria.")
-        
-        content_parts = []
-        for item in data:
-            item_content = template
-            # Simple template replacement
-            for key, value in item.items():
-                if value is not None:
-                    item_content = item_content.replace(f"{{{{this.{key}}}}}", str(value))
-                else:
-                    item_content = item_content.replace(f"{{{{this.{key}}}}}", "")
-            content_parts.append(item_content)
-        
-        # Replace loop markers
-        result = template.replace("{{#each raw_data}}", "").replace("{{/each}}", "\n".join(content_parts))
-        result = result.replace("{{#if (eq raw_data.length 0)}}", "").replace("{{/if}}", "")
-        result = result.replace("{{total_count}}", str(len(data)))
-        result = result.replace("{{raw_data.length}}", str(len(data)))
-        
-        return result
-    elif isinstance(data, dict):
-        result = template
-        for key, value in data.items():
-            if value is not None:
-                result = result.replace(f"{{{{{key}}}}}", str(value))
+# Template tags: {{#each raw_data}}...{{/each}}, {{#if (eq raw_data.length 0)}}...{{/if}},
+# {{this.field}} inside a loop and {{name}} outside of it
+_TEMPLATE_TAG = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+
+class CompiledTemplate:
+    """Prompt template parsed once into literal, field and block segments"""
+    
+    def __init__(self, template: str):
+        self.template = template
+        self.segments = self._parse(template)
+    
+    @staticmethod
+    def _parse(template: str) -> List[Tuple[str, Any]]:
+        """Parse template into nested (kind, value) segments"""
+        root: List[Tuple[str, Any]] = []
+        stack = [root]
+        position = 0
+        
+        for match in _TEMPLATE_TAG.finditer(template):
+            if match.start() > position:
+                stack[-1].append(('text', template[position:match.start()]))
+            position = match.end()
+            tag = match.group(1)
+            
+            if tag == '#each raw_data':
+                block: List[Tuple[str, Any]] = []
+                stack[-1].append(('each', block))
+                stack.append(block)
+            elif tag == '#if (eq raw_data.length 0)':
+                block = []
+                stack[-1].append(('if_empty', block))
+                stack.append(block)
+            elif tag in ('/each', '/if') and len(stack) > 1:
+                stack.pop()
+            elif tag.startswith('this.'):
+                stack[-1].append(('field', tag[len('this.'):]))
             else:
-                result = result.replace(f"{{{{{key}}}}}", "")
-        return result
-    else:
-        return template
+                stack[-1].append(('var', (tag, match.group(0))))
+        
+        if position < len(template):
+            stack[-1].append(('text', template[position:]))
+        return root
+    
+    def render(self, data: Any, context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Render template into a single string
+        
+        Args:
+            data: Record list (for {{#each raw_data}} templates) or dictionary (for {{name}} templates)
+            context: Extra top-level variables, e.g. total_count
+        """
+        variables: Dict[str, Any] = dict(data) if isinstance(data, dict) else {}
+        records = data if isinstance(data, list) else []
+        if isinstance(data, list):
+            variables['raw_data.length'] = len(records)
+            variables['total_count'] = len(records)
+        if context:
+            variables.update(context)
+        
+        parts: List[str] = []
+        self._render_segments(self.segments, records, variables, None, parts)
+        return ''.join(parts)
+    
+    def render_item(self, record: Dict[str, Any]) -> str:
+        """Render the {{#each raw_data}} block for a single record"""
+        parts: List[str] = []
+        for kind, value in self.segments:
+            if kind == 'each':
+                self._render_segments(value, [record], {}, record, parts)
+        return ''.join(parts)
+    
+    def _render_segments(self, segments: List[Tuple[str, Any]], records: List[Dict[str, Any]],
+                         variables: Dict[str, Any], item: Optional[Dict[str, Any]], parts: List[str]):
+        """Append rendered segments to parts"""
+        append = parts.append
+        for kind, value in segments:
+            if kind == 'text':
+                append(value)
+            elif kind == 'field':
+                field_value = item.get(value) if item is not None else None
+                if field_value is not None:
+                    append(str(field_value))
+            elif kind == 'var':
+                name, raw_tag = value
+                if name in variables:
+                    if variables[name] is not None:
+                        append(str(variables[name]))
+                else:
+                    # Unknown variables are left for later substitution
+                    append(raw_tag)
+            elif kind == 'each':
+                for record in records:
+                    self._render_segments(value, records, variables, record, parts)
+            elif kind == 'if_empty':
+                if not records:
+                    self._render_segments(value, records, variables, item, parts)
+
+# Supported response formats of query tools
+RESPONSE_FORMATS = ('markdown', 'raw', 'compact', 'both')
+
+# Token estimate behind max_tokens: CJK, kana, hangul and full-width characters count as about
+# one token each, other text as about CHARS_PER_TOKEN characters per token
+CHARS_PER_TOKEN = 4
+_WIDE_CHARS = re.compile('[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\ufe30-\ufe4f\uff00-\uffef]')
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text, counted by script"""
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + -(-(len(text) - wide) // CHARS_PER_TOKEN)
+
+def _format_compact_value(value: Any) -> str:
+    """Format a field value for compact rendering"""
+    if isinstance(value, list):
+        return ', '.join(str(item) for item in value)
+    return str(value)
+
+def format_compact_line(record: Dict[str, Any]) -> str:
+    """Render one record as a single line with only non-empty fields"""
+    details = '; '.join(f"{key}={_format_compact_value(value)}" for key, value in record.items()
+                        if key not in ('id', 'content') and value not in (None, '', []))
+    line = f"- #{record.get('id')} {record.get('content') or ''}"
+    return f"{line} | {details}" if details else line
+
+def generate_compact_content(records: List[Dict[str, Any]], title: str, total_text: str) -> str:
+    """Render records densely, one line per record with only non-empty fields"""
+    lines = [f"{title} (showing {len(records)} of {total_text} records)"]
+    lines.extend(format_compact_line(record) for record in records)
+    if not records:
+        lines.append("No records found matching the criteria.")
+    return '\n'.join(lines)
+
+@lru_cache(maxsize=256)
+def project_template(template: str, fields: Tuple[str, ...]) -> str:
+    """Drop the lines of the {{#each raw_data}} block that render fields outside the projection"""
+    kept_fields = set(fields) | {'id'}
+    lines = []
+    in_each = False
+    for line in template.split('\n'):
+        if '{{#each raw_data}}' in line:
+            in_each = True
+        elif '{{/each}}' in line:
+            in_each = False
+        elif in_each:
+            used_fields = re.findall(r"\{\{\s*this\.(\w+)\s*\}\}", line)
+            if any(field not in kept_fields for field in used_fields):
+                continue
+        lines.append(line)
+    return '\n'.join(lines)
+
+@lru_cache(maxsize=128)
+def compile_template(template: str) -> CompiledTemplate:
+    """Compile a prompt template (cached, each tool template is parsed only once)"""
+    return CompiledTemplate(template)
+
+def generate_prompt_content(template: str, data: Any, context: Optional[Dict[str, Any]] = None) -> str:
+    """Generate template-based prompt content"""
+    with track('render'):
+        return compile_template(template).render(data, context)
 
 class BaseTools:
     """Base tool class"""
     
-    def __init__(self):
-        self.db = db
+    def __init__(self, database: Optional[ProfileDatabase] = None):
+        self._database = database
+    
+    @property
+    def db(self) -> ProfileDatabase:
+        """Database instance, opened on first use so importing tools stays cheap"""
+        if self._database is None:
+            self._database = get_database()
+        return self._database
         
     def _create_success_response(self, record_id: int, operation: str) -> Dict[str, Any]:
         """Create success response"""
@@ -96,13 +228,190 @@ class BaseTools:
                     
         return filter_conditions
         
-    def _generate_query_response(self, records: List[Dict], total_count: int, template: str) -> Dict[str, Any]:
-        """Generate query response"""
-        content = generate_prompt_content(template, records)
-        content = content.replace("{{total_count}}", str(total_count))
+    def _query_table(self, table_name: str, filter: Optional[Dict[str, Any]], allowed_filters: List[str],
+                     template: str, sort_by: str, sort_order: str, limit: int, offset: int,
+                     cursor: Optional[str] = None, count_mode: str = 'exact', response_format: str = 'both',
+                     max_tokens: Optional[int] = None, max_chars: Optional[int] = None,
+                     fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run a query action and build its response
         
-        return {
-            "content": content,
-            "raw_data": records,
-            "total_count": total_count
-        } 
\ No newline at end of file
+        fields limits the returned columns; the template lines of other fields are dropped.
+        
+        With max_tokens or max_chars, records are added until their rendered size reaches the
+        budget (a first record too large for it is shortened); next_cursor then continues with
+        the first record that did not fit. When not even a shortened record fits, no records
+        are returned and budget_too_small is set.
+        """
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Invalid response format: {response_format}, supported formats: {list(RESPONSE_FORMATS)}")
+        
+        filter_conditions = self._build_filter_conditions(filter or {}, allowed_filters)
+        if fields:
+            template = project_template(template, tuple(fields))
+        
+        budget = None
+        record_size = None
+        if max_tokens is not None or max_chars is not None:
+            budget, record_size = self._get_record_budget(max_chars, max_tokens, template, response_format)
+        
+        page = self.db.query_page(table_name, filter_conditions, sort_by, sort_order, limit, offset,
+                                  cursor, count_mode, budget, record_size, fields)
+        response = self._generate_page_response(page, template, response_format)
+        if budget is not None:
+            response["truncated"] = page["truncated"]
+        if page["budget_too_small"]:
+            # An empty page rendering would only repeat the header that did not fit
+            response.pop("content", None)
+            response["budget_too_small"] = True
+            response["note"] = ("max_tokens/max_chars is too small for a single record; "
+                                "retry with a larger budget (next_cursor stays at the same position)")
+        if page["relevance_fallback"]:
+            # Tell the caller the results are not ranked
+            response["relevance_fallback"] = True
+        return response
+    
+    def _get_record_budget(self, max_chars: Optional[int], max_tokens: Optional[int], template: str,
+                           response_format: str) -> Tuple[int, Callable[[Dict[str, Any]], int]]:
+        """
+        Get the budget left for records and a function estimating each record's rendered size
+        
+        Sizes are characters for max_chars and estimate_tokens() for max_tokens. With both,
+        a size is the larger of characters * max_tokens and tokens * max_chars against a budget
+        of max_chars * max_tokens, so records fitting it fit both limits.
+        """
+        compiled = compile_template(template)
+        overhead_text = ''
+        if response_format == 'raw':
+            record_text = lambda record: json.dumps(record, ensure_ascii=False, default=str)
+        elif response_format == 'compact':
+            title = template.lstrip().split('\n', 1)[0].lstrip('# ').strip()
+            overhead_text = f"{title} (showing 00 of 0000 records)"
+            record_text = lambda record: '\n' + format_compact_line(record)
+        else:
+            # Page header and summary are rendered once, around the records
+            overhead_text = compiled.render([])
+            if response_format == 'markdown':
+                record_text = compiled.render_item
+            else:
+                record_text = lambda record: (compiled.render_item(record)
+                                              + json.dumps(record, ensure_ascii=False, default=str))
+        
+        if max_tokens is None:
+            size, budget = len, int(max_chars)
+        elif max_chars is None:
+            size, budget = estimate_tokens, int(max_tokens)
+        else:
+            max_chars, max_tokens = int(max_chars), int(max_tokens)
+            size = lambda text: max(len(text) * max_tokens, estimate_tokens(text) * max_chars)
+            budget = max_chars * max_tokens
+        # Below zero when the page header alone exceeds the budget, then no record fits
+        return budget - size(overhead_text), lambda record: size(record_text(record))
+    
+    def _save_many(self, table_name: str, records: List[Dict[str, Any]], allowed_fields: List[str],
+                   required_fields: List[str], defaults: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Save a batch of records in one transaction
+        
+        Records without an id are created (defaults fill missing fields), records with an id
+        update only the fields they contain.
+        """
+        try:
+            if not records:
+                return self._create_error_response("save_many requires a non-empty records list")
+            
+            inserts = []
+            insert_positions = []
+            updates = []
+            update_positions = []
+            results: List[Dict[str, Any]] = [{} for _ in records]
+            
+            for position, record in enumerate(records):
+                if not isinstance(record, dict):
+                    return self._create_error_response(f"Record {position} must be an object")
+                
+                unknown_fields = [key for key in record if key != 'id' and key not in allowed_fields]
+                if unknown_fields:
+                    return self._create_error_response(f"Record {position} has unsupported fields: {unknown_fields}")
+                
+                fields = {key: value for key, value in record.items() if key != 'id' and value is not None}
+                record_id = record.get('id')
+                
+                if record_id is None:
+                    if any(fields.get(field) in (None, '') for field in required_fields):
+                        return self._create_error_response(
+                            f"Record {position}: creating {table_name} record requires {', '.join(required_fields)}")
+                    inserts.append({**defaults, **fields})
+                    insert_positions.append(position)
+                elif fields:
+                    updates.append((record_id, fields))
+                    update_positions.append(position)
+                else:
+                    results[position] = {"id": record_id, "operation": "no_change"}
+            
+            with self.db.transaction():
+                new_ids = self.db.insert_records(table_name, inserts)
+                updated = self.db.update_records(table_name, updates)
+            
+            record_rows(len(inserts) + len(updates))
+            for position, record_id in zip(insert_positions, new_ids):
+                results[position] = {"id": record_id, "operation": "created"}
+            for position, (record_id, _), success in zip(update_positions, updates, updated):
+                results[position] = {"id": record_id, "operation": "updated" if success else "not_found"}
+            
+            return {
+                "ids": [result["id"] for result in results],
+                "results": results,
+                "operation": "save_many",
+                "created": len(new_ids),
+                "updated": sum(1 for success in updated if success),
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            return self._create_error_response(str(e))
+        
+    def _generate_query_response(self, records: List[Dict], total_count: int, template: str,
+                                 next_cursor: str = None, total_count_exact: bool = True,
+                                 response_format: str = 'both') -> Dict[str, Any]:
+        """
+        Generate query response
+        
+        response_format selects the payload: 'markdown' (content only), 'raw' (raw_data only),
+        'compact' (one line per record as content) or 'both'. next_cursor fetches the
+        following page and is None on the last page.
+        """
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Invalid response format: {response_format}, supported formats: {list(RESPONSE_FORMATS)}")
+        
+        if total_count is None:
+            total_text = "unknown"
+        elif not total_count_exact:
+            total_text = f"{total_count}+"
+        else:
+            total_text = str(total_count)
+        
+        record_rows(len(records))
+        response: Dict[str, Any] = {}
+        with track('render'):
+            if response_format in ('markdown', 'both'):
+                response["content"] = generate_prompt_content(template, records, {"total_count": total_text})
+            elif response_format == 'compact':
+                title = template.lstrip().split('\n', 1)[0].lstrip('# ').strip()
+                response["content"] = generate_compact_content(records, title, total_text)
+        if response_format in ('raw', 'both'):
+            response["raw_data"] = records
+        
+        response.update({
+            "total_count": total_count,
+            "total_count_exact": total_count_exact,
+            "next_cursor": next_cursor
+        })
+        return response
+    
+    def _generate_page_response(self, page: Dict[str, Any], template: str,
+                                response_format: str = 'both') -> Dict[str, Any]:
+        """Generate query response from a ProfileDatabase.query_page result"""
+        return self._generate_query_response(page['records'], page['total_count'], template,
+                                             page['next_cursor'], page['total_count_exact'],
+                                             response_format) 
\ No newline at end of file
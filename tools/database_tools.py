@@ -4,6 +4,9 @@ Database tools
 
 from typing import Dict, Any, Optional, List
 from .base import BaseTools, TABLE_DESCRIPTIONS
+from metrics import get_metrics, record_rows
+from Database import data_transfer
+from Database.backup import get_backup_manager
 
 class DatabaseTools(BaseTools):
     """Database tools class"""
@@ -13,6 +16,8 @@ class DatabaseTools(BaseTools):
         """Execute custom SQL statement"""
         try:
             result = self.db.execute_custom_sql(sql, params, fetch_results)
+            # Rows returned by a SELECT, rows changed by a write
+            record_rows(result.get("count", max(result.get("rowcount", 0), 0)))
             return result
         except Exception as e:
             return {
@@ -41,4 +46,88 @@ class DatabaseTools(BaseTools):
             return {
                 "success": False,
                 "message": f"Failed to get table schema: {str(e)}"
+            }
+    
+    def export_data(self, file_name: Optional[str] = None, tables: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Export tables as a streaming NDJSON file in the exports directory"""
+        try:
+            output_path = data_transfer.resolve_export_file(self.db, file_name) if file_name else None
+            return data_transfer.export_data(self.db, output_path, tables)
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to export data: {str(e)}"
+            }
+    
+    def import_data(self, file_name: str, on_conflict: str = 'update') -> Dict[str, Any]:
+        """Import an NDJSON export from the exports directory in batched transactions"""
+        try:
+            input_path = data_transfer.resolve_export_file(self.db, file_name)
+            return data_transfer.import_data(self.db, input_path, on_conflict)
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to import data: {str(e)}"
+            }
+    
+    def create_backup(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """Create an online snapshot of the database"""
+        try:
+            return {
+                "success": True,
+                "operation": "create",
+                "backup": get_backup_manager().create_backup(label)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to create backup: {str(e)}"
+            }
+    
+    def list_backups(self) -> Dict[str, Any]:
+        """List database snapshots, newest first"""
+        try:
+            backup_manager = get_backup_manager()
+            backups = backup_manager.list_backups()
+            return {
+                "success": True,
+                "operation": "list",
+                "backups": backups,
+                "count": len(backups),
+                "settings": backup_manager.get_stats()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to list backups: {str(e)}"
+            }
+    
+    def get_slow_queries(self, limit: int = 50, full_scan_only: bool = False, clear: bool = False) -> Dict[str, Any]:
+        """Get recorded slow statements with their query plans, newest first"""
+        try:
+            entries = self.db.slow_queries.get_entries(limit, full_scan_only)
+            if clear:
+                self.db.slow_queries.clear()
+            return {
+                "success": True,
+                "entries": entries,
+                "count": len(entries),
+                "settings": self.db.slow_queries.get_stats()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to get slow queries: {str(e)}"
+            }
+    
+    def get_database_stats(self) -> Dict[str, Any]:
+        """Get connection pool, cache and per-tool metrics statistics"""
+        try:
+            stats = self.db.get_stats()
+            stats["tool_metrics"] = get_metrics().get_stats()
+            return stats
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to get database statistics: {str(e)}"
             } 
\ No newline at end of file
@@ -10,18 +10,18 @@ class FocusTools(BaseTools):
     
     def query_focuses(self, filter: Optional[Dict[str, Any]] = None, 
                      sort_by: str = 'priority', sort_order: str = 'desc', 
-                     limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+                     limit: int = 20, offset: int = 0,
+                     cursor: Optional[str] = None, count_mode: str = 'exact',
+                     response_format: str = 'both', max_tokens: Optional[int] = None,
+                     max_chars: Optional[int] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Query focus data"""
         try:
             allowed_filters = [
-                'ids', 'content_contains', 'priority_gte', 'status_is', 'status_in',
+                'ids', 'content_contains', 'content_match', 'text_match', 'priority_gte', 'status_is', 'status_in',
                 'context_contains', 'keywords_contain_any', 'source_app_is',
                 'deadline_from', 'deadline_to', 'privacy_level_is'
             ]
             
-            filter_conditions = self._build_filter_conditions(filter or {}, allowed_filters)
-            records, total_count = self.db.query_records('focus', filter_conditions, sort_by, sort_order, limit, offset)
-            
             template = """# User Focus Data
 
 The following are user focus records retrieved based on your query criteria:
@@ -49,7 +49,8 @@ No focus records found matching the criteria.
 - Total {{total_count}} related records found.
 - Currently displaying {{raw_data.length}} records."""
             
-            return self._generate_query_response(records, total_count, template)
+            return self._query_table('focus', filter, allowed_filters, template, sort_by, sort_order, limit, offset,
+                                     cursor, count_mode, response_format, max_tokens, max_chars, fields)
             
         except Exception as e:
             return self._create_error_response(str(e))
@@ -113,4 +114,11 @@ No focus records found matching the criteria.
                     return self._create_error_response("Update failed", id)
                     
         except Exception as e:
-            return self._create_error_response(str(e)) 
\ No newline at end of file
+            return self._create_error_response(str(e))
+    
+    def save_focuses(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Save a batch of focus records in one transaction (records with id are updated)"""
+        return self._save_many('focus', records,
+                               allowed_fields=['content', 'priority', 'status', 'context', 'keywords', 'source_app', 'deadline', 'privacy_level'],
+                               required_fields=['content', 'priority'],
+                               defaults={'status': 'active', 'source_app': 'unknown', 'privacy_level': 'public'})
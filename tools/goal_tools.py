@@ -10,17 +10,17 @@ class GoalTools(BaseTools):
     
     def query_goals(self, filter: Optional[Dict[str, Any]] = None, 
                    sort_by: str = 'deadline', sort_order: str = 'asc', 
-                   limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+                   limit: int = 20, offset: int = 0,
+                   cursor: Optional[str] = None, count_mode: str = 'exact',
+                   response_format: str = 'both', max_tokens: Optional[int] = None,
+                   max_chars: Optional[int] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Query goal data"""
         try:
             allowed_filters = [
-                'ids', 'content_contains', 'type_is', 'type_in', 'deadline_from', 'deadline_to',
+                'ids', 'content_contains', 'content_match', 'text_match', 'type_is', 'type_in', 'deadline_from', 'deadline_to',
                 'status_is', 'status_in', 'keywords_contain_any', 'source_app_is', 'privacy_level_is'
             ]
             
-            filter_conditions = self._build_filter_conditions(filter or {}, allowed_filters)
-            records, total_count = self.db.query_records('goal', filter_conditions, sort_by, sort_order, limit, offset)
-            
             template = """# User Goal Data
 
 The following are user goal records retrieved based on your query criteria:
@@ -47,7 +47,8 @@ No goal records found matching the criteria.
 - Total {{total_count}} related records found.
 - Currently displaying {{raw_data.length}} records."""
             
-            return self._generate_query_response(records, total_count, template)
+            return self._query_table('goal', filter, allowed_filters, template, sort_by, sort_order, limit, offset,
+                                     cursor, count_mode, response_format, max_tokens, max_chars, fields)
             
         except Exception as e:
             return self._create_error_response(str(e))
@@ -101,4 +102,11 @@ No goal records found matching the criteria.
                     return self._create_error_response("Update failed", id)
                     
         except Exception as e:
-            return self._create_error_response(str(e)) 
\ No newline at end of file
+            return self._create_error_response(str(e))
+    
+    def save_goals(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Save a batch of goal records in one transaction (records with id are updated)"""
+        return self._save_many('goal', records,
+                               allowed_fields=['content', 'type', 'deadline', 'status', 'keywords', 'source_app', 'privacy_level'],
+                               required_fields=['content', 'type'],
+                               defaults={'status': 'planning', 'keywords': [], 'source_app': 'unknown', 'privacy_level': 'public'})
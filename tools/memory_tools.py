@@ -10,20 +10,20 @@ class MemoryTools(BaseTools):
     
     def query_memories(self, filter: Optional[Dict[str, Any]] = None, 
                       sort_by: str = 'created_time', sort_order: str = 'desc', 
-                      limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+                      limit: int = 20, offset: int = 0,
+                      cursor: Optional[str] = None, count_mode: str = 'exact',
+                      response_format: str = 'both', max_tokens: Optional[int] = None,
+                      max_chars: Optional[int] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Query memory data"""
         try:
             allowed_filters = [
-                'ids', 'content_contains', 'memory_type_in', 'importance_gte', 
+                'ids', 'content_contains', 'content_match', 'text_match', 'memory_type_in', 'importance_gte', 
                 'importance_lte', 'related_people_contains', 'location_contains',
                 'memory_date_from', 'memory_date_to', 'keywords_contain_any',
                 'keywords_contain_all', 'source_app_is', 'privacy_level_is',
                 'created_time_from', 'created_time_to'
             ]
             
-            filter_conditions = self._build_filter_conditions(filter or {}, allowed_filters)
-            records, total_count = self.db.query_records('memory', filter_conditions, sort_by, sort_order, limit, offset)
-            
             # Generate prompt content
             template = """# User Memory Data
 
@@ -54,7 +54,8 @@ No memory records found matching the criteria.
 - Total {{total_count}} related records found.
 - Currently displaying {{raw_data.length}} records."""
             
-            return self._generate_query_response(records, total_count, template)
+            return self._query_table('memory', filter, allowed_filters, template, sort_by, sort_order, limit, offset,
+                                     cursor, count_mode, response_format, max_tokens, max_chars, fields)
             
         except Exception as e:
             return self._create_error_response(str(e))
@@ -119,4 +120,11 @@ No memory records found matching the criteria.
                     return self._create_error_response("Update failed", id)
                     
         except Exception as e:
-            return self._create_error_response(str(e)) 
\ No newline at end of file
+            return self._create_error_response(str(e))
+    
+    def save_memories(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Save a batch of memory records in one transaction (records with id are updated)"""
+        return self._save_many('memory', records,
+                               allowed_fields=['content', 'memory_type', 'importance', 'related_people', 'location', 'memory_date', 'keywords', 'source_app', 'reference_urls', 'privacy_level'],
+                               required_fields=['content', 'memory_type', 'importance'],
+                               defaults={'keywords': [], 'reference_urls': [], 'source_app': 'unknown', 'privacy_level': 'public'})
@@ -10,17 +10,17 @@ class MethodologyTools(BaseTools):
     
     def query_methodologies(self, filter: Optional[Dict[str, Any]] = None, 
                            sort_by: str = 'created_time', sort_order: str = 'desc', 
-                           limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+                           limit: int = 20, offset: int = 0,
+                           cursor: Optional[str] = None, count_mode: str = 'exact',
+                           response_format: str = 'both', max_tokens: Optional[int] = None,
+                           max_chars: Optional[int] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Query methodology data"""
         try:
             allowed_filters = [
-                'ids', 'content_contains', 'type_is', 'type_contains', 'effectiveness_is',
+                'ids', 'content_contains', 'content_match', 'text_match', 'type_is', 'type_contains', 'effectiveness_is',
                 'use_cases_contains', 'keywords_contain_any', 'source_app_is', 'privacy_level_is'
             ]
             
-            filter_conditions = self._build_filter_conditions(filter or {}, allowed_filters)
-            records, total_count = self.db.query_records('methodology', filter_conditions, sort_by, sort_order, limit, offset)
-            
             template = """# User Methodology Data
 
 The following are user methodology records retrieved based on your query criteria:
@@ -48,7 +48,8 @@ No methodology records found matching the criteria.
 - Total {{total_count}} related records found.
 - Currently displaying {{raw_data.length}} records."""
             
-            return self._generate_query_response(records, total_count, template)
+            return self._query_table('methodology', filter, allowed_filters, template, sort_by, sort_order, limit, offset,
+                                     cursor, count_mode, response_format, max_tokens, max_chars, fields)
             
         except Exception as e:
             return self._create_error_response(str(e))
@@ -106,4 +107,11 @@ No methodology records found matching the criteria.
                     return self._create_error_response("Update failed", id)
                     
         except Exception as e:
-            return self._create_error_response(str(e)) 
\ No newline at end of file
+            return self._create_error_response(str(e))
+    
+    def save_methodologies(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Save a batch of methodology records in one transaction (records with id are updated)"""
+        return self._save_many('methodology', records,
+                               allowed_fields=['content', 'type', 'effectiveness', 'use_cases', 'keywords', 'source_app', 'reference_urls', 'privacy_level'],
+                               required_fields=['content'],
+                               defaults={'effectiveness': 'experimental', 'keywords': [], 'reference_urls': [], 'source_app': 'unknown', 'privacy_level': 'public'})
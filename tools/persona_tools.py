@@ -24,16 +24,16 @@ class PersonaTools(BaseTools):
 The following is the current user's personal persona data. Please refer to this information when interacting with the user to provide more personalized and relevant responses.
 
 ## Basic Information
-- **User Name**: {name}
-- **Gender**: {gender} (This may affect language style and addressing)
-- **Personality Traits**: {personality} (For example: {personality}, please adjust communication style accordingly)
-- **Personal Bio**: {bio}
-- **Avatar URL**: {avatar_url}
+- **User Name**: {{name}}
+- **Gender**: {{gender}} (This may affect language style and addressing)
+- **Personality Traits**: {{personality}} (For example: {{personality}}, please adjust communication style accordingly)
+- **Personal Bio**: {{bio}}
+- **Avatar URL**: {{avatar_url}}
 
 ## System Information
-- **Privacy Level**: {privacy_level}
-- **Profile Created Time**: {created_time}
-- **Profile Last Updated Time**: {updated_time}
+- **Privacy Level**: {{privacy_level}}
+- **Profile Created Time**: {{created_time}}
+- **Profile Last Updated Time**: {{updated_time}}
 
 **How to use this information:**
 - **Personalized addressing and tone**: Use appropriate addressing based on name and gender.